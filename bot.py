@@ -3,10 +3,8 @@ import discord
 from discord.ext import commands
 import os
 import asyncio  # Importamos asyncio para manejar el bucle de eventos
-from pathlib import Path  # Importamos pathlib para manejar rutas de forma robusta
 
 from webserver import keep_alive
-keep_alive()
 
 from database.database import _setup
 _setup()  # Aseguramos que la base de datos esté configurada antes de iniciar el bot
@@ -16,42 +14,59 @@ intents.guilds = True
 intents.message_content = True # Necesario para leer el contenido de los mensajes
 intents.members = True  # Necesario para detectar cuando un miembro se une
 intents.voice_states = True # Necesario para detectar cambios en el estado de voz (conexión/desconexión)
-bot = commands.Bot(command_prefix="!", intents=intents)
+# El árbol instrumentado mide latencia y errores de cada comando de barra (GET /metrics)
+from utils.metrics import InstrumentedTree
+from utils.users import user_store
+
+class Bot(commands.Bot):
+    async def close(self):
+        # Los guardados agrupados (GroupCommitter) que queden en la ventana se escriben antes de salir
+        await user_store.flush()
+        await super().close()
+
+bot = Bot(command_prefix="!", intents=intents, tree_cls=InstrumentedTree)
+
+# Router central de mensajes: un solo listener que reparte cada mensaje a los cogs que
+# se han apuntado a su canal (ver utils/message_router.py). Los comandos con prefijo
+# siguen funcionando porque esto es un listener más, no reemplaza on_message.
+from utils.message_router import message_router
+bot.add_listener(message_router.dispatch, "on_message")
+
+from utils.tree_sync import sync_if_changed
 
 @bot.event
 async def on_ready():
     print(f'✅ Bot conectado como {bot.user}')
-    await bot.tree.sync() # Sincroniza los comandos de barra
-    print('🔁 Comandos de barra sincronizados.')
+    # Sincroniza los comandos de barra solo si cambiaron (ver utils/tree_sync.py); !sync fuerza
+    if await sync_if_changed(bot):
+        print('🔁 Comandos de barra sincronizados.')
+    else:
+        print('🔁 Comandos de barra sin cambios, no hace falta sincronizar.')
     print('------')
 
-# --- Función asíncrona para cargar Cogs ---
-async def load_cogs():
-    """Busca y carga todos los Cogs en la carpeta 'commands'."""
-    # Usamos pathlib para encontrar todos los archivos .py de forma recursiva
-    # rglob('*.py') busca en 'commands' y todas sus subcarpetas
-    for filepath in Path('./commands').rglob('*.py'):
-        # Ignoramos el archivo __init__.py
-        if filepath.name == '__init__.py':
-            continue
-
-        # Convertimos la ruta del archivo a un formato de módulo importable
-        # Ejemplo: commands/utils/ping.py -> commands.utils.ping
-        module_path = '.'.join(filepath.parts[:-1] + (filepath.stem,))
-        
-        try:
-            # Ahora SÍ podemos usar await porque estamos en una función async
-            await bot.load_extension(module_path)
-            print(f'📦 Cargado: {module_path}')
-        except Exception as e:
-            print(f'❌ No se pudo cargar el cog {module_path} debido a: {e}')
+# --- Carga de Cogs ---
+# utils/cog_loader.py busca los cogs en 'commands', los carga y
+# guarda los tiempos de cada uno (cascada impresa al arrancar y con !startup)
+from utils.cog_loader import load_cogs, waterfall
 
 # --- Función principal asíncrona ---
 async def main():
+    # Logs de discord.py en INFO (antes lo hacía radio.py al importarse)
+    discord.utils.setup_logging(level=discord.utils.logging.INFO)
     async with bot:
-        await load_cogs()  # Cargamos los cogs antes de iniciar el bot
-        DISCORD_TOKEN = os.environ.get("DISCORD_TOKEN")
-        await bot.start(DISCORD_TOKEN)
+        # El webserver va en este mismo loop (aiohttp) y arranca primero para que el hosting
+        # vea el puerto abierto mientras se cargan los cogs
+        runner = await keep_alive(bot)
+        try:
+            DISCORD_TOKEN = os.environ.get("DISCORD_TOKEN")
+            # El login (petición HTTP) va a la vez que la carga de cogs; después se conecta al gateway.
+            # Equivale a bot.start(), que es login() + connect()
+            await asyncio.gather(bot.login(DISCORD_TOKEN), load_cogs(bot))
+            print(waterfall(bot.startup_timings, bot.startup_total))
+            await bot.connect()
+        finally:
+            await user_store.flush()
+            await runner.cleanup()
 
 # --- Punto de entrada del script ---
 # Ejecutamos la función main usando asyncio.run()
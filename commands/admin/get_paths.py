@@ -1,7 +1,7 @@
 # comando para ver los path
 
-from utils.cookies_path import COOKIES_PATH
-from utils.ffmpeg_path import FFMPEG_PATH
+from utils.cookies_path import get_cookies_path
+from utils.ffmpeg_path import get_ffmpeg_path
 from utils.data import PATH_USERS, PATH_TRABAJOS
 import discord
 from discord.ext import commands
@@ -14,8 +14,12 @@ class GetPath(commands.Cog):
     @commands.command(name="getpath")
     #@commands.is_owner()
     async def getpath(self, ctx):
-        await ctx.send(f"🍪 Path de cookies: {COOKIES_PATH}")
-        await ctx.send(f"🎥 Path de FFmpeg: {FFMPEG_PATH}")
+        try:
+            cookies = get_cookies_path()
+        except (OSError, ValueError) as e:
+            cookies = f"❌ {e}"
+        await ctx.send(f"🍪 Path de cookies: {cookies}")
+        await ctx.send(f"🎥 Path de FFmpeg: {get_ffmpeg_path()}")
         await ctx.send(f"👤 Path de usuarios: {PATH_USERS}")
         await ctx.send(f"💼 Path de trabajos: {PATH_TRABAJOS}")
 async def setup(bot):
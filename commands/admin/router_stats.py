@@ -0,0 +1,17 @@
+# Estadísticas del router de mensajes (utils/message_router.py)
+import discord
+from discord.ext import commands
+
+from utils.message_router import message_router
+
+class RouterStats(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Este comando solo lo puede usar el dueño del bot
+    @commands.command(name="router")
+    @commands.is_owner()
+    async def router(self, ctx):
+        await ctx.send("📬 Router de mensajes:\n```\n" + "\n".join(message_router.report()) + "\n```")
+async def setup(bot):
+    await bot.add_cog(RouterStats(bot))
@@ -0,0 +1,24 @@
+# Cascada de tiempos de carga de los cogs (utils/cog_loader.py)
+import discord
+from discord.ext import commands
+
+from utils.cog_loader import waterfall
+
+class Startup(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Este comando solo lo puede usar el dueño del bot
+    @commands.command(name="startup")
+    @commands.is_owner()
+    async def startup(self, ctx):
+        timings = getattr(self.bot, "startup_timings", None)
+        if not timings:
+            await ctx.send("No hay tiempos de arranque registrados.")
+            return
+        text = waterfall(timings, self.bot.startup_total)
+        # Los mensajes de Discord tienen un límite de 2000 caracteres
+        for i in range(0, len(text), 1900):
+            await ctx.send(f"```\n{text[i:i + 1900]}\n```")
+async def setup(bot):
+    await bot.add_cog(Startup(bot))
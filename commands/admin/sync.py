@@ -2,6 +2,8 @@
 import discord
 from discord.ext import commands
 
+from utils.tree_sync import sync_tree
+
 class Sync(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -13,13 +15,13 @@ class Sync(commands.Cog):
     
         if scope == "global":
             await ctx.send("🌍 Sincronizando globalmente...")
-            await self.bot.tree.sync()
+            await sync_tree(self.bot)  # fuerza la sincronización y guarda el hash
             await ctx.send("✅ Sincronización global completa.")
         else:
             guild = ctx.guild
             await ctx.send("🔧 Sincronizando en este servidor...")
             self.bot.tree.copy_global_to(guild=guild)
-            await self.bot.tree.sync(guild=guild)
+            await sync_tree(self.bot, guild)
             await ctx.send("✅ Sincronizado en este servidor.")
 async def setup(bot):
     await bot.add_cog(Sync(bot))
@@ -2,13 +2,23 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import re
-from database.alianzas_repo import add_point, get_alianza_role, get_points, get_position,get_ranking, get_alianza_channel, get_cazador_role
+from database.alianzas_repo import add_point, get_alianza_role, get_points, get_position,get_ranking, get_alianza_channel, get_alianza_channels, get_cazador_role
+from utils.message_router import message_router
 import aiohttp
 import asyncio
 
 class Alianzas(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+
+    # Solo recibimos los mensajes de los canales de alianzas (ver utils/message_router.py);
+    # /setalianzachannel actualiza el canal en el router al cambiarlo
+    async def cog_load(self):
+        message_router.register("alianzas", self.on_alianza_message, get_alianza_channels())
+
+    async def cog_unload(self):
+        message_router.unregister("alianzas")
+
     def alianza_configurada(self,guild_id):
         canal = get_alianza_channel(guild_id)
         rol_cazador = get_cazador_role(guild_id)
@@ -78,11 +88,7 @@ class Alianzas(commands.Cog):
         return embed
     
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-
-        if message.author.bot:
-            return
+    async def on_alianza_message(self, message: discord.Message):
 
         if not message.guild:
             return
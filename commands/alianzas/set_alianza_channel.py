@@ -2,7 +2,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from database.alianzas_repo import set_alianza_channel
+from database.alianzas_repo import get_alianza_channel, set_alianza_channel
+from utils.message_router import message_router
 
 
 
@@ -28,6 +29,7 @@ class SetAlianzaChannel(commands.Cog):
 
         print("🔧 Configurando canal de alianzas...")
         try:
+            old_channel = get_alianza_channel(interaction.guild.id)
             set_alianza_channel(interaction.guild.id, channel.id)
         except Exception as e:
             print(f"❌ Error al configurar el canal de alianzas: {e}")
@@ -37,6 +39,10 @@ class SetAlianzaChannel(commands.Cog):
             )
             return
 
+        if old_channel:
+            message_router.unwatch("alianzas", old_channel)
+        message_router.watch("alianzas", channel.id)
+
         await interaction.response.send_message(
             f"✅ Canal de alianzas configurado en {channel.mention}",
             ephemeral=True  # solo lo ve el admin
@@ -1,38 +1,20 @@
 
+import asyncio
 import discord
 import random
 from discord.ext import commands
 from discord import app_commands
 
-from utils.data import load_data, PATH_USERS, save_data
+from utils.users import TransferError
+from utils.escrow import Escrow
+from utils.leaderboard import leaderboard
+from utils.cards import Shoe, card_str, card_value, hand_total, BLACKJACK_PAYOUTS
+from utils.live_message import LiveMessage
 
 
 
-def create_deck() -> list:
-    suits = ["♠", "♥", "♦", "♣"]
-    ranks = ["A"] + [str(n) for n in range(2, 11)] + ["J", "Q", "K"]
-    return [f"{r}{s}" for s in suits for r in ranks]
-
-def card_value(card: str) -> int:
-    rank = card[:-1]
-    if rank in ("J", "Q", "K"):
-        return 10
-    return 11 if rank == "A" else int(rank)
-
-def hand_value(cards: list) -> tuple:
-    total = sum(card_value(card) for card in cards)
-    aces = sum(1 for card in cards if card.startswith('A'))
-    
-    # Ajustar el valor de los Ases de 11 a 1 si nos pasamos de 21
-    while total > 21 and aces:
-        total -= 10
-        aces -= 1
-        
-    is_soft = any(card.startswith('A') for card in cards) and total <= 21
-    return total, is_soft
-
-def card_display(card: str) -> str:
-    return f"`{card}`"
+def card_display(card: int) -> str:
+    return f"`{card_str(card)}`"
 
 
 
@@ -53,26 +35,23 @@ class BlackJack(commands.Cog):
                 return await interaction.response.send_message("🔸 La apuesta debe ser un número entero mayor que 0.", ephemeral=True)
 
             user_id = str(interaction.user.id) # <-- Ahora podemos usar interaction.user directamente
-            data_users = await load_data(PATH_USERS)
 
-            if user_id not in data_users:
-                return await interaction.response.send_message("❌ No tienes perfil. Usa /jugar para registrarte primero.", ephemeral=True)
-            
-            user_money = int(data_users[user_id].get("dinero", 0))
-            if user_money < apuesta:
-                return await interaction.response.send_message("❌ No tienes suficiente dinero para esa apuesta.", ephemeral=True)
+            # La apuesta queda retenida hasta el final de la partida (ver utils/escrow.py)
+            try:
+                escrow = await Escrow.open(user_id, apuesta, "blackjack")
+            except TransferError as e:
+                return await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            leaderboard.update(user_id, await escrow.store.get(user_id))
 
-            deck = create_deck()
-            random.shuffle(deck)
+            # Mano suelta: una baraja nueva por partida, con las mismas cartas enteras que la mesa
+            deck = random.sample(range(52), 52)
             player_hand = [deck.pop(), deck.pop()]
             dealer_hand = [deck.pop(), deck.pop()]
 
-            data_users[user_id]['dinero'] = user_money - apuesta
-            await save_data(data_users, PATH_USERS)
-
             # Pasamos interaction.user a la vista
-            view = BlackjackView(self.bot, interaction.user, player_hand, dealer_hand, deck, apuesta)
+            view = BlackjackView(self.bot, interaction.user, player_hand, dealer_hand, deck, escrow)
             await interaction.response.send_message(embed=view.build_embed(), view=view)
+            view.message = await interaction.original_response()
 
         except Exception as e:
             print(f"Error en el comando blackjack: {e}")
@@ -80,20 +59,57 @@ class BlackJack(commands.Cog):
                 await interaction.response.send_message(f"Ocurrió un error: `{type(e).__name__}: {e}`", ephemeral=True)
             else:
                 await interaction.followup.send(f"Ocurrió un error: `{type(e).__name__}: {e}`", ephemeral=True)
+    @app_commands.command(name="blackjack-mesa", description="Abre o únete a la mesa de blackjack de este canal.")
+    @app_commands.describe(apuesta="Cantidad que apuestas en esta ronda.")
+    async def blackjack_mesa(self, interaction: discord.Interaction, apuesta: int):
+        if apuesta <= 0:
+            return await interaction.response.send_message("🔸 La apuesta debe ser un número entero mayor que 0.", ephemeral=True)
+
+        channel_id = interaction.channel_id
+        table = _tables.get(channel_id)
+        if table is not None and table.phase == "apuestas":
+            error = await table.join(interaction.user, apuesta)
+            if error:
+                return await interaction.response.send_message(f"❌ {error}", ephemeral=True)
+            return await interaction.response.send_message(f"🪑 Te sentaste en la mesa con ${apuesta:,}.", ephemeral=True)
+        if table is not None:
+            return await interaction.response.send_message("⏳ Ya hay una ronda en juego en este canal; espera a que termine.", ephemeral=True)
+
+        table = _tables[channel_id] = BlackjackTable(channel_id, interaction.user.id)
+        error = await table.join(interaction.user, apuesta)
+        if error:
+            # Durante el join otros pudieron sentarse y retener su apuesta: se les devuelve
+            await table.abandon()
+            return await interaction.response.send_message(f"❌ {error}", ephemeral=True)
+        # La cuenta atrás no depende de que la respuesta de abajo salga bien
+        table.start_timer(BETTING_SECONDS, table.start)
+        view = TableView(table)
+        await interaction.response.send_message(embed=table.build_embed(), view=view)
+        table.live.message = await interaction.original_response()
+
+
 class BlackjackView(discord.ui.View):
-    def __init__(self, bot: commands.Bot, author: discord.Member, player_hand: list, dealer_hand: list, deck: list, bet: int):
+    # Si la partida se abandona, al agotarse el tiempo el jugador se planta y se liquida normal:
+    # ya vio las dos manos, así que devolver la apuesta le dejaría "escapar" de una mala mano.
+    # Solo se devuelve si las cartas nunca llegaron a mostrarse (falló el mensaje inicial).
+    def __init__(self, bot: commands.Bot, author: discord.Member, player_hand: list, dealer_hand: list, deck: list, escrow: Escrow):
         super().__init__(timeout=180)
         self.bot = bot
         self.author = author
         self.player_hand = player_hand
         self.dealer_hand = dealer_hand
         self.deck = deck
-        self.bet = bet
+        self.escrow = escrow
         self.ended = False
+        self.message = None
+
+    @property
+    def bet(self) -> int:
+        return self.escrow.amount
 
     def build_embed(self, reveal_dealer: bool = False, note: str = "") -> discord.Embed:
         """Construye el embed del estado del juego."""
-        dealer_val, _ = hand_value(self.dealer_hand)
+        dealer_val, _ = hand_total(self.dealer_hand)
         if reveal_dealer:
             dealer_display = " ".join(map(card_display, self.dealer_hand))
             dealer_line = f"{dealer_display} — **{dealer_val}**"
@@ -101,7 +117,7 @@ class BlackjackView(discord.ui.View):
             dealer_display = f"{card_display(self.dealer_hand[0])} 🂠"
             dealer_line = f"{dealer_display} — visible: **{card_value(self.dealer_hand[0])}**"
 
-        player_val, _ = hand_value(self.player_hand)
+        player_val, _ = hand_total(self.player_hand)
         player_display = " ".join(map(card_display, self.player_hand))
 
         embed = discord.Embed(
@@ -136,7 +152,7 @@ class BlackjackView(discord.ui.View):
     @discord.ui.button(label="Hit", style=discord.ButtonStyle.primary, custom_id="bj_hit")
     async def hit(self, interaction: discord.Interaction, button: discord.ui.Button):
         self.player_hand.append(self.deck.pop())
-        player_val, _ = hand_value(self.player_hand)
+        player_val, _ = hand_total(self.player_hand)
 
         if player_val > 21:
             self.ended = True
@@ -152,11 +168,15 @@ class BlackjackView(discord.ui.View):
 
     @discord.ui.button(label="Double Down", style=discord.ButtonStyle.success, custom_id="bj_double")
     async def double_down(self, interaction: discord.Interaction, button: discord.ui.Button):
-        # Lógica de doble apuesta (simplificada para el ejemplo)
-        # Aquí deberías volver a comprobar si el usuario tiene suficiente dinero
+        # Doblar retiene otra vez la apuesta; si no alcanza el saldo la partida sigue igual
+        try:
+            user = await self.escrow.top_up(self.escrow.amount)
+        except TransferError as e:
+            await interaction.response.send_message(f"❌ No puedes doblar: {e}", ephemeral=True)
+            return
+        leaderboard.update(user.user_id, user)
         self.player_hand.append(self.deck.pop())
-        player_val, _ = hand_value(self.player_hand)
-        self.bet *= 2
+        player_val, _ = hand_total(self.player_hand)
 
         if player_val > 21:
             self.ended = True
@@ -164,54 +184,356 @@ class BlackjackView(discord.ui.View):
         else:
             await self.resolve_dealer(interaction)
 
-    async def resolve_dealer(self, interaction: discord.Interaction):
-        """El dealer juega su mano."""
-        dealer_val, _ = hand_value(self.dealer_hand)
+    def _play_dealer(self) -> str:
+        """El dealer juega su mano. Devuelve el resultado para el jugador (ya plantado)."""
+        dealer_val, _ = hand_total(self.dealer_hand)
         while dealer_val < 17:
             self.dealer_hand.append(self.deck.pop())
-            dealer_val, _ = hand_value(self.dealer_hand)
-        
-        player_val, _ = hand_value(self.player_hand)
-        
-        if dealer_val > 21: self.ended = True; await self.end_game(interaction, result="dealer_bust")
-        elif player_val > dealer_val: self.ended = True; await self.end_game(interaction, result="win")
-        elif player_val < dealer_val: self.ended = True; await self.end_game(interaction, result="lose")
-        else: self.ended = True; await self.end_game(interaction, result="tie")
+            dealer_val, _ = hand_total(self.dealer_hand)
+
+        player_val, _ = hand_total(self.player_hand)
+
+        if dealer_val > 21:
+            return "dealer_bust"
+        if player_val > dealer_val:
+            return "win"
+        if player_val < dealer_val:
+            return "lose"
+        return "tie"
+
+    async def resolve_dealer(self, interaction: discord.Interaction):
+        """El dealer juega su mano."""
+        result = self._play_dealer()
+        self.ended = True
+        await self.end_game(interaction, result=result)
 
     async def end_game(self, interaction: discord.Interaction, result: str):
-        """Finaliza el juego, calcula pagos y guarda los datos."""
-        user_id = str(self.author.id)
-        data_users = await load_data(PATH_USERS)
-        current_money = data_users[user_id].get('dinero', 0)
-        
+        """Finaliza el juego y liquida la apuesta retenida con un solo pago."""
+        note = await self._settle(result)
+        await self._update_message(interaction, note=note, disable_all=True)
+
+    async def _settle(self, result: str) -> str:
+        """Paga según `result` y devuelve el texto del resultado."""
         note = ""
+        payout = self.bet * BLACKJACK_PAYOUTS[result]
         if result == "bust":
             note = f"💥 Te pasaste de 21. Pierdes ${self.bet}."
         elif result == "dealer_bust":
             note = f"🏆 El dealer se pasó. Ganas ${self.bet}."
-            data_users[user_id]['dinero'] = current_money + (self.bet * 2)
         elif result == "win":
-            note = f"🏆 Ganaste con {hand_value(self.player_hand)[0]} vs {hand_value(self.dealer_hand)[0]}. Ganas ${self.bet}."
-            data_users[user_id]['dinero'] = current_money + (self.bet * 2)
+            note = f"🏆 Ganaste con {hand_total(self.player_hand)[0]} vs {hand_total(self.dealer_hand)[0]}. Ganas ${self.bet}."
         elif result == "lose":
-            note = f"❌ Perdiste con {hand_value(self.player_hand)[0]} vs {hand_value(self.dealer_hand)[0]}. Pierdes ${self.bet}."
+            note = f"❌ Perdiste con {hand_total(self.player_hand)[0]} vs {hand_total(self.dealer_hand)[0]}. Pierdes ${self.bet}."
         elif result == "tie":
             note = f"🤝 Empate. Recuperas tu apuesta de ${self.bet}."
-            data_users[user_id]['dinero'] = current_money + self.bet
 
-        await save_data(data_users, PATH_USERS)
-        await self._update_message(interaction, note=note, disable_all=True)
+        user = await self.escrow.settle(payout)
+        if user is not None:
+            leaderboard.update(user.user_id, user)
+        return note
 
     async def on_timeout(self):
-        """Desactiva los botones si el tiempo se agota."""
+        """Desactiva los botones y liquida la partida abandonada."""
         for child in self.children:
             child.disabled = True
+        if self.escrow.settled:
+            embed, content = None, "⏲️ Tiempo agotado."
+        elif self.message is None:
+            user = await self.escrow.refund()
+            if user is not None:
+                leaderboard.update(user.user_id, user)
+            return
+        else:
+            # Plantado automático: se juega y se paga igual que con el botón Stand
+            self.ended = True
+            note = await self._settle(self._play_dealer())
+            embed, content = self.build_embed(reveal_dealer=True, note=note), "⏲️ Tiempo agotado: te plantaste automáticamente."
+        if self.message is None:
+            return
         try:
-            await self.message.edit(content="⏲️ Tiempo agotado.", view=self)
+            if embed is None:
+                await self.message.edit(content=content, view=self)
+            else:
+                await self.message.edit(content=content, embed=embed, view=self)
         except discord.NotFound:
             pass
 
 
+# --- MESA MULTIJUGADOR ---
+# Varias personas juegan contra el mismo dealer con un zapato compartido por canal.
+# Los clics solo cambian el estado; el mensaje se edita como mucho una vez cada
+# RENDER_INTERVAL segundos, y una vez al cerrar la ronda con todos los resultados.
+MAX_SEATS = 5
+BETTING_SECONDS = 20
+ROUND_SECONDS = 60
+RENDER_INTERVAL = 1.5
+
+_shoes: dict[int, Shoe] = {}               # channel_id -> zapato (se conserva entre rondas)
+_tables: dict[int, "BlackjackTable"] = {}  # channel_id -> mesa abierta
+
+
+class Seat:
+    __slots__ = ("member", "escrow", "hand", "status")
+
+    def __init__(self, member: discord.abc.User, escrow: Escrow):
+        self.member = member
+        self.escrow = escrow
+        self.hand: list[int] = []
+        self.status = "jugando"  # jugando | plantado | pasado | doblado
+
+
+class BlackjackTable:
+    def __init__(self, channel_id: int, owner_id: int):
+        self.channel_id = channel_id
+        self.owner_id = owner_id
+        self.shoe = _shoes.setdefault(channel_id, Shoe())
+        self.seats: dict[int, Seat] = {}
+        self.dealer: list[int] = []
+        self.phase = "apuestas"  # apuestas | juego | fin
+        self.results: dict[int, str] = {}
+        self.view: "TableView | None" = None
+        self.lock = asyncio.Lock()
+        # El mensaje lo pone el comando (original_response); aquí solo se edita
+        self.live = LiveMessage(self._message_args, RENDER_INTERVAL, active=lambda: self.phase != "fin")
+        self._timer: asyncio.Task | None = None
+
+    # --- Apuestas ---
+    async def join(self, member: discord.abc.User, apuesta: int) -> str | None:
+        """Sienta al jugador reteniendo su apuesta. Devuelve un mensaje de error o None."""
+        async with self.lock:
+            if self.phase != "apuestas":
+                return "La ronda ya empezó; espera a la siguiente mesa."
+            if member.id in self.seats:
+                return "Ya estás sentado en esta mesa."
+            if len(self.seats) >= MAX_SEATS:
+                return f"La mesa está llena ({MAX_SEATS} jugadores)."
+            try:
+                escrow = await Escrow.open(member.id, apuesta, "blackjack_mesa")
+            except TransferError as e:
+                return str(e)
+            self.seats[member.id] = Seat(member, escrow)
+            leaderboard.update(str(member.id), await escrow.store.get(member.id))
+            full = len(self.seats) >= MAX_SEATS
+        if full:
+            await self.start()
+        else:
+            self.live.request()
+        return None
+
+    def start_timer(self, seconds: float, action):
+        current = asyncio.current_task()
+        if self._timer is not None and self._timer is not current and not self._timer.done():
+            self._timer.cancel()
+
+        async def _run():
+            await asyncio.sleep(seconds)
+            await action()
+
+        self._timer = asyncio.create_task(_run())
+
+    async def start(self):
+        async with self.lock:
+            if self.phase != "apuestas":
+                return
+            self.phase = "juego"
+            if self.shoe.needs_shuffle:
+                self.shoe.shuffle()
+            for _ in range(2):
+                for seat in self.seats.values():
+                    seat.hand.append(self.shoe.draw())
+                self.dealer.append(self.shoe.draw())
+            for seat in self.seats.values():
+                if hand_total(seat.hand)[0] == 21:
+                    seat.status = "plantado"
+            self.start_timer(ROUND_SECONDS, self.resolve)
+            all_done = self._all_done()
+        if all_done:
+            await self.resolve()
+        else:
+            self.live.request()
+
+    # --- Juego ---
+    def _all_done(self) -> bool:
+        return all(seat.status != "jugando" for seat in self.seats.values())
+
+    async def act(self, user_id: int, action: str) -> str | None:
+        async with self.lock:
+            seat = self.seats.get(user_id)
+            if self.phase != "juego":
+                return "La ronda no está en juego."
+            if seat is None:
+                return "No estás sentado en esta mesa."
+            if seat.status != "jugando":
+                return "Ya terminaste tu mano."
+
+            if action == "hit":
+                seat.hand.append(self.shoe.draw())
+                if hand_total(seat.hand)[0] > 21:
+                    seat.status = "pasado"
+            elif action == "stand":
+                seat.status = "plantado"
+            elif action == "double":
+                if len(seat.hand) != 2:
+                    return "Solo puedes doblar con las dos primeras cartas."
+                try:
+                    user = await seat.escrow.top_up(seat.escrow.amount)
+                except TransferError as e:
+                    return f"No puedes doblar: {e}"
+                leaderboard.update(user.user_id, user)
+                seat.hand.append(self.shoe.draw())
+                seat.status = "pasado" if hand_total(seat.hand)[0] > 21 else "doblado"
+            all_done = self._all_done()
+        if all_done:
+            await self.resolve()
+        else:
+            self.live.request()
+        return None
+
+    async def resolve(self):
+        """El dealer juega y se liquidan todas las apuestas (un pago por jugador)."""
+        async with self.lock:
+            if self.phase != "juego":
+                return
+            self.phase = "fin"
+            if self._timer is not None and self._timer is not asyncio.current_task():
+                self._timer.cancel()
+            for seat in self.seats.values():
+                if seat.status == "jugando":
+                    seat.status = "plantado"  # se acabó el tiempo
+
+            if any(seat.status != "pasado" for seat in self.seats.values()):
+                while hand_total(self.dealer)[0] < 17:
+                    self.dealer.append(self.shoe.draw())
+            dealer_val = hand_total(self.dealer)[0]
+
+            for user_id, seat in self.seats.items():
+                player_val = hand_total(seat.hand)[0]
+                bet = seat.escrow.amount
+                if seat.status == "pasado":
+                    outcome, result = "bust", f"💥 Se pasó (-${bet})"
+                elif dealer_val > 21:
+                    outcome, result = "dealer_bust", f"🏆 Gana ${bet}"
+                elif player_val > dealer_val:
+                    outcome, result = "win", f"🏆 Gana ${bet}"
+                elif player_val < dealer_val:
+                    outcome, result = "lose", f"❌ Pierde ${bet}"
+                else:
+                    outcome, result = "tie", "🤝 Empate"
+                user = await seat.escrow.settle(bet * BLACKJACK_PAYOUTS[outcome])
+                if user is not None:
+                    leaderboard.update(user.user_id, user)
+                self.results[user_id] = result
+            if _tables.get(self.channel_id) is self:
+                del _tables[self.channel_id]
+        if self.view is not None:
+            self.view.stop()
+        await self.live.flush()
+
+    async def abandon(self):
+        """La mesa se cerró sin empezar: se devuelven todas las apuestas."""
+        async with self.lock:
+            if self.phase != "apuestas":
+                return
+            self.phase = "fin"
+            for user_id, seat in self.seats.items():
+                await seat.escrow.refund()
+                self.results[user_id] = "↩️ Apuesta devuelta"
+            if _tables.get(self.channel_id) is self:
+                del _tables[self.channel_id]
+
+    # --- Mensaje ---
+    def build_embed(self) -> discord.Embed:
+        if self.phase == "apuestas":
+            title = f"🃏 Mesa de Blackjack — {len(self.seats)}/{MAX_SEATS} jugadores"
+            description = f"Únete con `/blackjack-mesa apuesta:<cantidad>`. Empieza en {BETTING_SECONDS}s o con ▶️."
+        elif self.phase == "juego":
+            title = "🃏 Mesa de Blackjack — en juego"
+            description = "Pide carta, plántate o dobla con los botones."
+        else:
+            title = "🃏 Mesa de Blackjack — resultados"
+            description = None
+        embed = discord.Embed(title=title, description=description, color=0x2F3136)
+
+        if self.dealer:
+            if self.phase == "fin":
+                dealer_line = f"{' '.join(f'`{card_str(c)}`' for c in self.dealer)} — **{hand_total(self.dealer)[0]}**"
+            else:
+                dealer_line = f"`{card_str(self.dealer[0])}` 🂠 — visible: **{card_value(self.dealer[0])}**"
+            embed.add_field(name="Dealer", value=dealer_line, inline=False)
+
+        for user_id, seat in self.seats.items():
+            cards = " ".join(f"`{card_str(c)}`" for c in seat.hand) or "—"
+            line = f"{cards} — **{hand_total(seat.hand)[0]}**" if seat.hand else "esperando cartas"
+            status = self.results.get(user_id) or seat.status
+            embed.add_field(
+                name=f"{seat.member.display_name} — ${seat.escrow.amount:,}",
+                value=f"{line}\n{status}",
+                inline=True
+            )
+        shoe = self.shoe
+        embed.set_footer(text=f"Zapato: {shoe.remaining()} cartas ({shoe.decks} barajas)"
+                              + (" — se rebaraja en la próxima ronda" if shoe.needs_shuffle else ""))
+        return embed
+
+    def _message_args(self) -> dict:
+        if self.view is not None:
+            self.view.refresh()
+        return {"embed": self.build_embed(), "view": self.view}
+
+
+class TableView(discord.ui.View):
+    def __init__(self, table: BlackjackTable):
+        super().__init__(timeout=BETTING_SECONDS + ROUND_SECONDS + 60)
+        self.table = table
+        table.view = self
+        self.refresh()
+
+    def refresh(self):
+        playing = self.table.phase == "juego"
+        self.start_button.disabled = self.table.phase != "apuestas"
+        for button in (self.hit, self.stand, self.double):
+            button.disabled = not playing
+        if self.table.phase == "fin":
+            for child in self.children:
+                child.disabled = True
+
+    async def _act(self, interaction: discord.Interaction, action: str):
+        error = await self.table.act(interaction.user.id, action)
+        if error:
+            await interaction.response.send_message(f"❌ {error}", ephemeral=True)
+        else:
+            # Sin editar aquí: la mesa se redibuja una vez para todos los cambios
+            await interaction.response.defer()
+
+    @discord.ui.button(label="Empezar", emoji="▶️", style=discord.ButtonStyle.success)
+    async def start_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.table.owner_id:
+            await interaction.response.send_message("Solo quien abrió la mesa puede empezar la ronda.", ephemeral=True)
+            return
+        await interaction.response.defer()
+        await self.table.start()
+
+    @discord.ui.button(label="Hit", style=discord.ButtonStyle.primary)
+    async def hit(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._act(interaction, "hit")
+
+    @discord.ui.button(label="Stand", style=discord.ButtonStyle.secondary)
+    async def stand(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._act(interaction, "stand")
+
+    @discord.ui.button(label="Double Down", style=discord.ButtonStyle.success)
+    async def double(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._act(interaction, "double")
+
+    async def on_timeout(self):
+        # Red de seguridad si algún temporizador no llegó a cerrar la mesa
+        if self.table.phase == "apuestas":
+            await self.table.abandon()
+            await self.table.live.flush()
+        elif self.table.phase == "juego":
+            await self.table.resolve()
+
+
 # --- FUNCIÓN DE CONFIGURACIÓN DEL COG ---
 async def setup(bot: commands.Bot):
     await bot.add_cog(BlackJack(bot))
\ No newline at end of file
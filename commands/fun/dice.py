@@ -1,7 +1,9 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import random
+from utils.dice import DiceError, parse, roll, probability_at_least
 class Dice(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -21,6 +23,35 @@ class Dice(commands.Cog):
         result = random.randint(1, 20)
         await interaction.response.send_message(f"🎲 Has lanzado un **d20** → **{result}**")
 
+    @app_commands.command(name="roll", description="Lanza dados con una expresión (4d6kh3+2, 10d10!, 2d20adv) 🎲")
+    @app_commands.describe(
+        expresion="Ej: 4d6kh3+2, 10d10! (explotan), 2d20adv / 2d20dis, d%",
+        objetivo="Muestra la probabilidad de sacar este valor o más"
+    )
+    async def roll(self, interaction: discord.Interaction, expresion: str, objetivo: int | None = None):
+        try:
+            expr = parse(expresion)
+        except DiceError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+
+        result = roll(expr)
+        text = f"🎲 **{expr}** → **{result.total:,}**\n" + "\n".join(result.details)[:1500]
+
+        if objetivo is not None:
+            # Las distribuciones grandes pueden tardar; se calculan fuera del loop y quedan cacheadas
+            await interaction.response.defer()
+            try:
+                chance, exact = await asyncio.to_thread(probability_at_least, expr, objetivo)
+            except DiceError as e:
+                await interaction.followup.send(f"{text}\n❌ {e}")
+                return
+            how = "exacta" if exact else "estimada"
+            text += f"\n📊 Probabilidad de sacar **{objetivo:,}** o más: **{chance * 100:.2f}%** ({how})"
+            await interaction.followup.send(text)
+            return
+        await interaction.response.send_message(text)
+
 
 
 async def setup(bot):
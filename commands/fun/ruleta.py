@@ -1,121 +1,184 @@
-
-# cogs/blackjack.py
+# cogs/ruleta.py
+import asyncio
 import discord
 import random
 from discord.ext import commands
 from discord import app_commands
 # Asumo que esta importación es correcta según tu estructura de proyecto
-from utils.data import load_data, PATH_USERS, save_data
+from utils.users import user_store
+from utils.leaderboard import leaderboard
+from utils.live_message import LiveMessage
+from utils.roulette import POCKETS, BETS, PAYOUTS, color as pocket_color, parse_bet, payout
+
+# Ronda por canal: las apuestas se juntan durante BETTING_SECONDS, se gira una sola vez
+# y se pagan todas juntas (un movimiento de ledger agrupado y un guardado del store).
+BETTING_SECONDS = 20
+MAX_BETS_PER_ROUND = 50
+RENDER_INTERVAL = 2.0
+COMMON_BETS = ("rojo", "negro", "par", "impar", "bajo", "alto", "docena1", "docena2", "docena3",
+               "columna1", "columna2", "columna3", "0")
+
+_rounds: dict[int, "RouletteRound"] = {}  # channel_id -> ronda abierta
+
+
+class RouletteRound:
+    def __init__(self, channel_id: int):
+        self.channel_id = channel_id
+        self.bets: list[tuple[discord.abc.User, str, int]] = []  # (jugador, apuesta, cantidad)
+        self.open = True
+        self.number: int | None = None
+        # Varias apuestas seguidas se juntan en una sola edición del mensaje
+        self.live = LiveMessage(lambda: {"embed": self.build_embed()}, RENDER_INTERVAL, active=lambda: self.open)
+        self._timer: asyncio.Task | None = None
+
+    async def place(self, member: discord.abc.User, choice: str, amount: int) -> str | None:
+        """Descuenta la apuesta y la anota en la ronda. Devuelve un mensaje de error o None."""
+        if not self.open:
+            return "La ruleta ya está girando; espera a la siguiente ronda."
+        if len(self.bets) >= MAX_BETS_PER_ROUND:
+            return f"Esta ronda ya tiene {MAX_BETS_PER_ROUND} apuestas."
+        async with user_store.locked(member.id):
+            user = await user_store.get(member.id)
+            if user is None:
+                return "No tienes perfil. Usa /jugar para registrarte primero."
+            if user.dinero < amount:
+                return f"No tienes suficiente dinero. Tu saldo: ${user.dinero:,}."
+            if not self.open:
+                return "La ruleta ya está girando; espera a la siguiente ronda."
+            # La apuesta se anota antes de esperar al ledger: si el giro llega durante esa espera,
+            # ya cuenta (el descuento en memoria de add_money ocurre antes de su primer await)
+            self.bets.append((member, choice, amount))
+            # La primera apuesta aceptada arranca la cuenta atrás, pase lo que pase con la
+            # respuesta de quien abrió la ronda
+            if self._timer is None:
+                self._timer = asyncio.create_task(self.spin_later())
+            await user_store.add_money(user, -amount, "ruleta:apuesta")
+        await user_store.save(wait=False)
+        leaderboard.update(user.user_id, user)
+        self.live.request()
+        return None
+
+    async def spin_later(self):
+        try:
+            await asyncio.sleep(BETTING_SECONDS)
+            await self.spin()
+        finally:
+            # Aunque el giro falle, el canal no se queda con una ronda cerrada para siempre
+            self.open = False
+            if _rounds.get(self.channel_id) is self:
+                del _rounds[self.channel_id]
+
+    async def spin(self):
+        """Un solo giro para todas las apuestas y un solo guardado con todos los premios."""
+        self.open = False
+        if _rounds.get(self.channel_id) is self:
+            del _rounds[self.channel_id]
+        self.number = random.randrange(POCKETS)
+
+        winners: dict[str, int] = {}
+        for member, choice, amount in self.bets:
+            won = amount * payout(choice, self.number)
+            if won:
+                winners[str(member.id)] = winners.get(str(member.id), 0) + won
+
+        moves = []
+        for user_id, won in winners.items():
+            user = await user_store.get(user_id)
+            if user is not None:
+                moves.append((user, won, "ruleta:premio"))
+        async with user_store.locked(*winners):
+            await user_store.add_money_many(moves)
+        await user_store.save()
+        for user, _, _ in moves:
+            leaderboard.update(user.user_id, user)
+        await self.live.flush()
+
+    # --- Mensaje ---
+    def build_embed(self) -> discord.Embed:
+        embed = discord.Embed(title="🎰 Ruleta", colour=discord.Colour.dark_gold())
+        if self.number is None:
+            embed.description = (f"Apuestas abiertas durante {BETTING_SECONDS}s con `/ruleta`.\n"
+                                 "Opciones: rojo, negro, par, impar, bajo (1-18), alto (19-36), "
+                                 "docena1-3, columna1-3 o un número 0-36.")
+        else:
+            number = self.number
+            if number == 0:
+                embed.description = "Salió **0** — 🟢"
+            else:
+                emoji = "🔴" if pocket_color(number) == "rojo" else "⚫"
+                embed.description = f"Salió **{number}** — {emoji} {pocket_color(number).capitalize()}"
+
+        lines = []
+        for member, choice, amount in self.bets:
+            line = f"{member.display_name}: **{choice}** ${amount:,}"
+            if self.number is not None:
+                won = amount * payout(choice, self.number)
+                line += f" → 🎉 +${won - amount:,}" if won else " → ❌"
+            lines.append(line)
+        text = "\n".join(lines) or "Sin apuestas todavía."
+        embed.add_field(name=f"Apuestas ({len(self.bets)})", value=text[:1024], inline=False)
+        return embed
+
+
 class Ruleta(commands.Cog):
     def __init__(self,bot: commands.Bot):
         self.bot = bot
 
-    @app_commands.command(name="ruleta", description="Juega una ruleta")
+    @app_commands.command(name="ruleta", description="Apuesta en la ruleta del canal")
     @app_commands.describe(
-        opcion="Eliga una opcion",
+        opcion="rojo, negro, par, impar, bajo, alto, docena1-3, columna1-3 o un número 0-36",
         apuesta="Elige una cantidad para apostar."
     )
     async def ruleta(self,interaction: discord.Interaction, opcion: str, apuesta: int):
         """
-        Ruleta simple: apostar a 'rojo', 'negro' o '0'.
-        La apuesta se descuenta al inicio (como en blackjack). Los pagos:
-        - rojo/negro: 1:1 (se añade apuesta*2 al ganar para devolver apuesta + ganancia)
-        - 0: paga 35:1 (se añade apuesta*36 al ganar)
+        Ruleta por rondas: la primera apuesta del canal abre la ronda y la ruleta gira a los
+        BETTING_SECONDS segundos. Pagos (incluyen la apuesta, ver utils/roulette.py):
+        - colores, par/impar, bajo/alto: 1:1
+        - docenas y columnas: 2:1
+        - número suelto (pleno): 35:1
         """
-        opcion_raw = str(opcion).strip().lower()
-        # Normalizar opciones aceptadas
-        if opcion_raw in ("rojo", "r", "red"):
-            choice = "rojo"
-        elif opcion_raw in ("negro", "n", "black", "blk"):
-            choice = "negro"
-        elif opcion_raw in ("0", "zero", "cero"):
-            choice = "0"
-        else:
-            await interaction.response.send_message("Opción inválida. Usa `rojo`, `negro` o `0`.", ephemeral=True)
+        choice = parse_bet(opcion)
+        if choice is None:
+            await interaction.response.send_message(
+                "Opción inválida. Usa rojo, negro, par, impar, bajo, alto, docena1-3, columna1-3 o un número 0-36.",
+                ephemeral=True
+            )
             return
 
         if apuesta is None or apuesta <= 0:
             await interaction.response.send_message("La apuesta debe ser un entero mayor que 0.", ephemeral=True)
             return
 
-        user_id = str(interaction.user.id)
-        data_users = await load_data(PATH_USERS)
-
-        if user_id not in data_users:
-            await interaction.response.send_message("❌ No tienes perfil. Usa /jugar para registrarte primero.", ephemeral=True)
+        channel_id = interaction.channel_id
+        round_ = _rounds.get(channel_id)
+        created = round_ is None
+        if created:
+            round_ = _rounds[channel_id] = RouletteRound(channel_id)
+
+        error = await round_.place(interaction.user, choice, apuesta)
+        if error:
+            if created and not round_.bets and _rounds.get(channel_id) is round_:
+                del _rounds[channel_id]
+            await interaction.response.send_message(f"❌ {error}", ephemeral=True)
             return
 
-        try:
-            dinero_actual = int(data_users[user_id].get("dinero", data_users[user_id].get("money", 0) or 0))
-        except Exception:
-            dinero_actual = 0
-
-        if dinero_actual < apuesta:
-            await interaction.response.send_message(f"❌ No tienes suficiente dinero. Tu saldo: ${dinero_actual:,}.", ephemeral=True)
-            return
-
-        # Deduct bet immediately
-        data_users[user_id]['dinero'] = dinero_actual - apuesta
-        await save_data(data_users, PATH_USERS)
-
-        # Ruleta: generar número 0-36 y determinar color
-        import random
-        number = random.randint(0, 36)
-        # Números rojos en ruleta europea
-        REDS = {1,3,5,7,9,12,14,16,18,19,21,23,25,27,30,32,34,36}
-        if number == 0:
-            color = "0"  # verde/zero
-        elif number in REDS:
-            color = "rojo"
-        else:
-            color = "negro"
-
-        # Determinar resultado y pago
-        won = False
-        amount_won = 0
-        if choice == "0":
-            if number == 0:
-                # paga 35:1  -> devolvemos apuesta + 35*apuesta = apuesta * 36
-                amount_won = apuesta * 36
-                won = True
-        else:
-            if color == choice:
-                # paga 1:1 -> devolvemos apuesta + ganancia = apuesta * 2
-                amount_won = apuesta * 2
-                won = True
-
-        # Actualizar dinero en archivo
-        latest = await load_data(PATH_USERS)
-        latest.setdefault(user_id, {})
-        latest[user_id]['dinero'] = int(latest[user_id].get('dinero', 0)) + (amount_won if won else 0)
-        await save_data(latest, PATH_USERS)
-
-        saldo_final = latest[user_id]['dinero']
-
-        # Preparar mensaje
-        from discord import Embed
-        if number == 0:
-            result_line = f"**0** — 🟢"
+        if created:
+            # El giro ya está programado (place); si esto falla la ronda sigue, solo sin mensaje
+            await interaction.response.send_message(embed=round_.build_embed())
+            round_.live.message = await interaction.original_response()
         else:
-            emoji = "🔴" if color == "rojo" else "⚫"
-            result_line = f"**{number}** — {emoji} {color.capitalize()}"
-
-        if won:
-            if choice == "0":
-                note = f"🎉 ¡Ha salido 0! Apuestas a **0** y ganas **${amount_won - apuesta:,}** (pago 35:1)."
-            else:
-                note = f"🎉 ¡Ganaste! Salió **{number} ({color})**. Ganancia: **${amount_won - apuesta:,}**."
-        else:
-            note = f"❌ Perdiste. Salió **{number} ({color})**. Perdida: **${apuesta:,}**."
-
-        embed = Embed(title="🎰 Ruleta", colour=discord.Colour.dark_gold())
-        embed.add_field(name="Resultado", value=result_line, inline=False)
-        embed.add_field(name="Apuesta", value=f"{choice} — ${apuesta:,}", inline=True)
-        embed.add_field(name="Resultado", value=note, inline=True)
-        embed.set_footer(text=f"Saldo actual: ${saldo_final:,} — Jugador: {interaction.user.display_name}")
-
-        await interaction.response.send_message(embed=embed, ephemeral=False)
+            await interaction.response.send_message(
+                f"🎲 Apostaste ${apuesta:,} a **{choice}** (paga x{PAYOUTS[choice]}).", ephemeral=True
+            )
+
+    @ruleta.autocomplete("opcion")
+    async def opcion_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        current = current.strip().lower()
+        options = [b for b in COMMON_BETS if b.startswith(current)]
+        if current.isdigit() and current in BETS and current not in options:
+            options.insert(0, current)
+        return [app_commands.Choice(name=f"{b} (x{PAYOUTS[b]})", value=b) for b in options[:25]]
 
 # --- FUNCIÓN DE CONFIGURACIÓN DEL COG ---
 async def setup(bot: commands.Bot):
-    await bot.add_cog(Ruleta(bot))
\ No newline at end of file
+    await bot.add_cog(Ruleta(bot))
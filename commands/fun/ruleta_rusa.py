@@ -4,6 +4,15 @@ from discord.ext import commands
 from discord import app_commands
 import random
 import asyncio
+from utils.message_router import message_router
+from utils.live_message import LiveMessage
+
+# Cada cambio (turno, click, muerte, recarga) va al registro del embed de la partida, y el
+# mensaje se edita como mucho una vez cada RENDER_INTERVAL segundos. Editar no notifica, así
+# que al jugador de turno se le menciona en un mensaje corto que se borra solo.
+RENDER_INTERVAL = 2.0
+LOG_LINES = 15
+PING_SECONDS = 5.0
 
 # --- CLASES DEL JUEGO (Sin cambios, ahora dentro del fichero del Cog) ---
 
@@ -54,6 +63,13 @@ class RussianRouletteGame:
         self.countdown_active = False
         self.initiator = initiator
         self.view_message: discord.Message | None = None
+        # Estado del narrador: el mensaje de la partida se edita, no se manda uno por turno
+        self.status = ""
+        self.log: list[str] = []
+        self.dead: list[discord.Member] = []
+        self.finished = False
+        self.live = LiveMessage(lambda: {"embed": self.build_embed()}, RENDER_INTERVAL,
+                                active=lambda: not self.finished, send=channel.send)
 
     def join_message_text(self, starting: bool = False) -> str:
         lines = ["**— RULETA RUSA —**", "Pulsa **Unirse** para entrar o **Abandonar** para salir."]
@@ -90,44 +106,74 @@ class RussianRouletteGame:
     async def run_game(self):
         self.started = True
         if len(self.players) < 2:
-            await self.channel.send("No hay suficientes jugadores. Juego cancelado.")
+            self.status = "No hay suficientes jugadores. Juego cancelado."
+            await self.live.flush()
             self.cleanup()
             return
 
-        await self.channel.send("Orden de juego:\n" + "\n".join(f"{i+1}. {p.mention}" for i, p in enumerate(self.players)))
+        self.narrate("Orden de juego: " + ", ".join(f"{i+1}. {p.display_name}" for i, p in enumerate(self.players)))
         self._place_bullet()
 
         while len(self.players) > 1:
             current_player = self.players[self.current_player_idx % len(self.players)]
-            warn_msg = await self.channel.send(f"🔫 **Turno de {current_player.mention}** — se prepara para disparar... (5s)")
+            self.status = f"🔫 **Turno de {current_player.display_name}** — se prepara para disparar... (5s)"
+            self.live.request()
+            await self.ping(current_player, f"🔫 {current_player.mention}, te toca disparar.")
             await self._wait_with_resets()
 
             chamber_has_bullet = self.chambers[self.current_chamber_index]
             if chamber_has_bullet:
-                await self.channel.send(f"💥 **{current_player.mention}** se ha disparado. Ha muerto.")
+                self.narrate(f"💥 **{current_player.display_name}** se ha disparado. Ha muerto.")
+                self.dead.append(current_player)
                 self.players = [p for p in self.players if p.id != current_player.id]
                 if len(self.players) <= 1:
-                    if self.players:
-                        await self.channel.send(f"🏆 **{self.players[0].mention}** es el último en pie. ¡Ganador!")
-                    else:
-                        await self.channel.send("No quedan jugadores. Fin del juego.")
-                    self.cleanup()
-                    return
+                    break
                 self._place_bullet()
                 if self.current_player_idx >= len(self.players):
                     self.current_player_idx = 0
-                await self.channel.send("🔄 Se recarga el arma y la partida continúa.")
+                self.narrate("🔄 Se recarga el arma y la partida continúa.")
             else:
-                await self.channel.send(f"🔒 **{current_player.mention}** ha disparado y *vive* (click).")
+                self.narrate(f"🔒 **{current_player.display_name}** ha disparado y *vive* (click).")
                 self.current_chamber_index = (self.current_chamber_index + 1) % 6
                 self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
 
+        self.finished = True
         if len(self.players) == 1:
-            await self.channel.send(f"🏆 **{self.players[0].mention}** es el último en pie. ¡Ganador!")
+            self.status = f"🏆 **{self.players[0].display_name}** es el último en pie. ¡Ganador!"
         else:
-            await self.channel.send("Juego terminado.")
+            self.status = "No quedan jugadores. Fin del juego."
+        await self.live.flush()
         self.cleanup()
 
+    # --- Narrador: un solo mensaje editado como mucho cada RENDER_INTERVAL segundos ---
+    def narrate(self, line: str):
+        self.log.append(line)
+        del self.log[:-LOG_LINES]
+        self.live.request()
+
+    async def ping(self, member: discord.Member, text: str):
+        """Menciona solo a `member` en un mensaje que se borra a los PING_SECONDS segundos."""
+        try:
+            await self.channel.send(text, delete_after=PING_SECONDS,
+                                    allowed_mentions=discord.AllowedMentions(users=[member]))
+        except discord.HTTPException:
+            pass
+
+    def build_embed(self) -> discord.Embed:
+        embed = discord.Embed(title="🔫 Ruleta rusa", description=self.status, colour=discord.Colour.dark_red())
+        alive = ", ".join(p.display_name for p in self.players) or "—"
+        embed.add_field(name=f"Vivos ({len(self.players)})", value=alive[:1024], inline=True)
+        if self.dead:
+            embed.add_field(name=f"Muertos ({len(self.dead)})",
+                            value=", ".join(p.display_name for p in self.dead)[:1024], inline=True)
+        if self.started and not self.finished:
+            embed.add_field(name="Recámara", value=f"{self.current_chamber_index + 1}/6", inline=True)
+        log = "\n".join(self.log)
+        if len(log) > 1024:
+            log = "…" + log[-1023:]
+        embed.add_field(name="Registro", value=log or "—", inline=False)
+        return embed
+
     async def _wait_with_resets(self):
         while True:
             self.reset_event.clear()
@@ -143,7 +189,13 @@ class RussianRouletteGame:
         except Exception:
             pass
 
+    async def on_message(self, message: discord.Message):
+        # El router solo nos llama con mensajes de este canal (ver RussianRoulette.ruleta_rusa)
+        if not self.started:
+            self.reset_countdown()
+
     def cleanup(self):
+        message_router.unwatch("ruleta_rusa", self.channel.id)
         try:
             del self.bot.games_by_channel[self.channel.id]
         except (KeyError, AttributeError):
@@ -160,6 +212,13 @@ class RussianRoulette(commands.Cog):
         if not hasattr(bot, 'games_by_channel'):
             bot.games_by_channel = {}
 
+    async def cog_load(self):
+        # Un único handler: el router solo lo llama en canales con partida y lo reparte a su juego
+        message_router.register("ruleta_rusa", self.on_game_message, self.bot.games_by_channel)
+
+    async def cog_unload(self):
+        message_router.unregister("ruleta_rusa")
+
     # --- COMANDO DE BARRA ---
     @app_commands.command(name="ruleta-rusa", description="Inicia una partida de ruleta rusa.")
     async def ruleta_rusa(self, interaction: discord.Interaction):
@@ -182,19 +241,13 @@ class RussianRoulette(commands.Cog):
         game.view_message = msg
         
         self.bot.games_by_channel[channel.id] = game
+        message_router.watch("ruleta_rusa", channel.id)
         await interaction.response.send_message("Se ha creado la ruleta. ¡Únete con los botones en el mensaje!", ephemeral=True)
 
-    # --- EVENT LISTENER (La forma correcta de manejar eventos en un Cog) ---
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        # Ignorar mensajes de bots y DMs
-        if message.author.bot or not message.guild:
-            return
-
-        # Comprobar si hay un juego en el canal actual
+    async def on_game_message(self, message: discord.Message):
         game = self.bot.games_by_channel.get(message.channel.id)
-        if game and not game.started:
-            game.reset_countdown()
+        if game:
+            await game.on_message(message)
 
 # --- FUNCIÓN DE CONFIGURACIÓN ---
 async def setup(bot: commands.Bot):
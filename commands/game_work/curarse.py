@@ -7,7 +7,9 @@ import datetime
 from datetime import timezone, timedelta
 
 # --- IMPORTA TUS UTILIDADES ---
-from utils.data import load_data, save_data, PATH_USERS, PATH_TRABAJOS
+from utils.users import user_store
+from utils.leaderboard import leaderboard
+from utils.diseases import settle_health, clear_disease
 
 class Curarse(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -22,17 +24,16 @@ class Curarse(commands.Cog):
     async def curarse(self, interaction: discord.Interaction, cantidad: int = 0):
         """Cura tu salud pagando una cantidad de dinero que aumenta con la cantidad curada."""
         user_id = str(interaction.user.id)
-        data_users = await load_data(PATH_USERS)
+        user = await user_store.get(user_id)
 
-        if user_id not in data_users:
+        if user is None:
             await interaction.response.send_message("❌ No tienes perfil. Usa /jugar para registrarte primero.", ephemeral=True)
             return
 
-        user = data_users[user_id]
-
-        # Normalizar dinero y salud
-        dinero_actual = int(user.get("dinero", user.get("money", 0) or 0))
-        salud_actual = int(user.get("salud", 100))
+        # Dinero y salud (la salud incluye el daño acumulado de la enfermedad)
+        dinero_actual = user.dinero
+        health = settle_health(user)
+        salud_actual = health.health
 
         if salud_actual >= 100:
             await interaction.response.send_message("✅ Ya tienes la salud completa (100). No necesitas curarte.", ephemeral=True)
@@ -53,6 +54,13 @@ class Curarse(commands.Cog):
         cost = int(heal_amount * base_cost_per_hp + (heal_amount ** 2) * scaling_quadratic)
         cost = max(1, cost)
 
+        # Curarse por encima de 80 elimina la enfermedad: se cobra su tratamiento (diseases.json)
+        treatment_cost = 0
+        cures_disease = bool(health.disease_name) and not health.cured and salud_actual + heal_amount >= 80
+        if cures_disease and health.disease:
+            treatment_cost = health.disease.treatment_cost
+            cost += treatment_cost
+
         if dinero_actual < cost:
             await interaction.response.send_message(
                 f"❌ No tienes suficiente dinero. Necesitas **${cost}**, tienes **${dinero_actual}**.",
@@ -61,21 +69,21 @@ class Curarse(commands.Cog):
             return
 
         # --- Aplicar curación y gasto ---
-        user["salud"] = min(100, salud_actual + heal_amount)
-        user["dinero"] = dinero_actual - cost
+        user.salud = min(100, salud_actual + heal_amount)
+        await user_store.add_money(user, -cost, "curarse")
 
         # Si tenía una enfermedad y ahora tiene buena salud, limpiar la enfermedad
-        if user.get("disease") and user.get("date_disease"):
-            # criterio: si salud >= 80, consideramos que se recuperó de la enfermedad
-            if user["salud"] >= 80:
-                user.pop("disease", None)
-                user.pop("date_disease", None)
+        # criterio: si salud >= 80, consideramos que se recuperó de la enfermedad
+        if cures_disease:
+            clear_disease(user)
 
-        await save_data(data_users, PATH_USERS)
+        await user_store.save()
+        leaderboard.update(user_id, user)
 
         await interaction.response.send_message(
             f"💊 {interaction.user.mention}, te curaste **{heal_amount}** de vida por **${cost}**.\n"
-            f"🩺 Salud: **{salud_actual} → {user['salud']}** — Dinero restante: **${user['dinero']}**.",
+            f"🩺 Salud: **{salud_actual} → {user.salud}** — Dinero restante: **${user.dinero}**."
+            + (f"\n💉 Te curaste de **{health.disease_name}** (tratamiento: ${treatment_cost})." if cures_disease else ""),
             ephemeral=False
         )
 
@@ -0,0 +1,36 @@
+# cogs/inactividad.py
+from discord.ext import commands, tasks
+
+# --- IMPORTA TUS UTILIDADES ---
+from utils.inactivity import inactivity
+
+SWEEP_MINUTES = 10
+
+class Inactividad(commands.Cog):
+    """Aplica las sanciones por no hacer /work durante 3 días (ver Chambas.txt)."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.sweeper.start()
+
+    def cog_unload(self):
+        self.sweeper.cancel()
+
+    @tasks.loop(minutes=SWEEP_MINUTES)
+    async def sweeper(self):
+        try:
+            results = await inactivity.sweep()
+        except Exception as e:
+            print(f"❌ Error al revisar inactividad: {e}")
+            return
+        if results:
+            despedidos = sum(1 for _, r in results if r == "despedido")
+            print(f"⏰ Inactividad: {len(results) - despedidos} sueldos reducidos, {despedidos} despidos.")
+
+    @sweeper.before_loop
+    async def before_sweeper(self):
+        await self.bot.wait_until_ready()
+
+# --- FUNCIÓN DE CONFIGURACIÓN ---
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Inactividad(bot))
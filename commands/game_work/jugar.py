@@ -1,7 +1,8 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.data import load_data, PATH_USERS, save_data
+from utils.users import user_store
+from utils.leaderboard import leaderboard
 
 class Jugar(commands.Cog):
     def __init__(self, bot):
@@ -12,18 +13,10 @@ class Jugar(commands.Cog):
     async def jugar(self,interaction: discord.Interaction):
         # Responder a la interacción
         user_id = str(interaction.user.id)
-        data_users = await load_data(PATH_USERS)
-        if user_id not in data_users:
-            data_users[user_id] = {
-                "dinero": 0,
-                "experiencia": 0,
-                "date_job": None,
-                "job": None,
-                "salud": 100,
-                "date_disease": None,
-                "disease": None,
-            }
-            await save_data(data_users, PATH_USERS)
+        if not await user_store.exists(user_id):
+            user = await user_store.create(user_id)
+            await user_store.save()
+            leaderboard.update(user_id, user)
             await interaction.response.send_message("¡Te has registrado en el juego! Usa /trabajos")
         else:
             await interaction.response.send_message("Ya estás registrado en el juego.")
@@ -0,0 +1,42 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.users import user_store, TransferError
+from utils.leaderboard import leaderboard
+
+
+class Pay(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="pay", description="Transfiere dinero a otro jugador.")
+    @app_commands.describe(
+        usuario="Jugador que recibe el dinero.",
+        cantidad="Cantidad a transferir."
+    )
+    async def pay(self, interaction: discord.Interaction, usuario: discord.User, cantidad: int):
+        if usuario.bot:
+            await interaction.response.send_message("❌ No puedes transferir dinero a un bot.", ephemeral=True)
+            return
+
+        try:
+            # Locks por usuario en orden canónico + un solo guardado (ver UserStore.transfer)
+            sender, receiver = await user_store.transfer(
+                interaction.user.id, usuario.id, cantidad, reason=f"pay:{interaction.user.id}->{usuario.id}"
+            )
+        except TransferError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+
+        leaderboard.update(sender.user_id, sender)
+        leaderboard.update(receiver.user_id, receiver)
+        await interaction.response.send_message(
+            f"💸 {interaction.user.mention} le transfirió **${cantidad:,}** a {usuario.mention}.\n"
+            f"Tu saldo: **${sender.dinero:,}**."
+        )
+
+
+# --- FUNCIÓN DE CONFIGURACIÓN ---
+async def setup(bot):
+    await bot.add_cog(Pay(bot))
@@ -3,10 +3,15 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import random
+import datetime
+from datetime import timezone
 
 # --- IMPORTA TUS UTILIDADES ---
 # Asegúrate de que esta ruta sea correcta según tu estructura de proyecto
-from utils.data import load_data, save_data, PATH_USERS, PATH_TRABAJOS
+from utils.users import user_store
+from utils.jobs import get_job_catalog
+from utils.leaderboard import leaderboard
+from utils.inactivity import inactivity
 
 class PostularseTrabajo(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -19,25 +24,21 @@ class PostularseTrabajo(commands.Cog):
     async def postularse_trabajo(self, interaction: discord.Interaction, trabajo: str):
         """Intenta conseguir un trabajo basado en tu experiencia."""
         # --- 1. Cargar datos ---
-        data_users = await load_data(PATH_USERS)
-        data_jobs = await load_data(PATH_TRABAJOS)
+        catalog = get_job_catalog()
         user_id = str(interaction.user.id)
+        user = await user_store.get(user_id)
 
         # --- 2. Verificar perfil ---
-        if user_id not in data_users:
+        if user is None:
             await interaction.response.send_message("❌ No tienes perfil creado. Usa el comando para crear tu perfil primero.", ephemeral=True)
             return
 
         # --- 3. Buscar el trabajo ---
-        jobs_list = data_jobs.get("jobs", [])
-        job = next(
-            (j for j in jobs_list if j.get("slug") == trabajo or j.get("name", "").lower() == trabajo.lower()),
-            None
-        )
+        job = catalog.get(trabajo)
 
         if not job:
             # Mostrar ejemplos de slugs (los primeros 20 para no saturar)
-            ejemplos = ", ".join(j.get("slug", "") for j in jobs_list[:20])
+            ejemplos = ", ".join(j.slug for j in catalog.jobs[:20])
             await interaction.response.send_message(
                 f"❌ El trabajo '{trabajo}' no existe. Asegúrate de usar el **slug** o el nombre completo.\n"
                 f"Ejemplos de slugs: `{ejemplos}`",
@@ -46,23 +47,42 @@ class PostularseTrabajo(commands.Cog):
             return
 
         # --- 4. Verificar si ya tiene el trabajo ---
-        current_job_slug = data_users[user_id].get("job")
-        if current_job_slug == job.get("slug"):
-            await interaction.response.send_message(f"ℹ️ {interaction.user.mention}, ya trabajas como **{job.get('name')}**.", ephemeral=True)
+        current_job_slug = user.job
+        if current_job_slug == job.slug:
+            await interaction.response.send_message(f"ℹ️ {interaction.user.mention}, ya trabajas como **{job.name}**.", ephemeral=True)
             return
 
         # --- 5. Calcular la probabilidad y postular ---
-        required_exp = int(job.get("required_experience", 0))
-        user_exp = int(data_users[user_id].get("exp", 0))
+        required_exp = job.required_experience
+        user_exp = user.experiencia
 
         # Método simple de randomización
         if random.randint(0, required_exp) <= user_exp:
             # MEJORA: Guardamos el slug del trabajo para mantener consistencia
-            data_users[user_id]["job"] = job.get("slug")
-            await save_data(data_users, PATH_USERS)
-            await interaction.response.send_message(f"✅ ¡Felicidades {interaction.user.mention}! Ahora trabajas como **{job.get('name')}**.")
+            user.job = job.slug
+            # Trabajo nuevo: sueldo completo y el contador de inactividad empieza hoy
+            user.date_hired = datetime.datetime.now(tz=timezone.utc).isoformat()
+            user.sueldo_factor = 1.0
+            user.strikes_inactividad = 0
+            await user_store.save()
+            inactivity.schedule(user_id, user)
+            await interaction.response.send_message(f"✅ ¡Felicidades {interaction.user.mention}! Ahora trabajas como **{job.name}**.")
         else:
-            await interaction.response.send_message(f"❌ Lo siento {interaction.user.mention}, no fuiste aceptado para **{job.get('name')}**.")
+            await interaction.response.send_message(f"❌ Lo siento {interaction.user.mention}, no fuiste aceptado para **{job.name}**.")
+
+    @postularse_trabajo.autocomplete("trabajo")
+    async def trabajo_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        """Sugerencias por prefijo/aproximadas; primero los trabajos que el usuario puede conseguir."""
+        await leaderboard.ensure_loaded()  # XP del usuario sin releer data.json en cada tecla
+        user_exp = leaderboard.value("experiencia", interaction.user.id) or 0
+        jobs = get_job_catalog().search(current, user_exp, limit=25)
+        return [
+            app_commands.Choice(
+                name=f"{'✅' if job.required_experience <= user_exp else '🔒'} {job.name} — Req XP: {job.required_experience}"[:100],
+                value=job.slug
+            )
+            for job in jobs
+        ]
 
 # --- FUNCIÓN DE CONFIGURACIÓN ---
 async def setup(bot: commands.Bot):
@@ -0,0 +1,54 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.cooldowns import cooldowns, DEFAULT_COOLDOWNS
+
+
+class SetCooldown(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Cambiar la duración de un cooldown en este servidor
+    @app_commands.command(name="setcooldown", description="Configura la duración de un cooldown en este servidor")
+    @app_commands.describe(
+        accion="Acción con cooldown (ej: work)",
+        horas="Duración en horas. Usa -1 para volver al valor por defecto."
+    )
+    @app_commands.choices(accion=[
+        app_commands.Choice(name=action, value=action) for action in DEFAULT_COOLDOWNS
+    ])
+    @app_commands.default_permissions(administrator=True)
+    async def setcooldown(
+        self,
+        interaction: discord.Interaction,
+        accion: app_commands.Choice[str],
+        horas: float
+    ):
+        if interaction.guild is None:
+            await interaction.response.send_message(
+                "❌ Este comando solo funciona en servidores.",
+                ephemeral=True
+            )
+            return
+
+        try:
+            if horas < 0:
+                cooldowns.set_override(interaction.guild.id, accion.value, None)
+            else:
+                cooldowns.set_override(interaction.guild.id, accion.value, int(horas * 3600))
+        except Exception as e:
+            print(f"❌ Error al configurar el cooldown: {e}")
+            await interaction.response.send_message(
+                "❌ Ocurrió un error al configurar el cooldown. Por favor, inténtalo de nuevo.",
+                ephemeral=True
+            )
+            return
+
+        segundos = cooldowns.duration(accion.value, interaction.guild.id)
+        await interaction.response.send_message(
+            f"✅ Cooldown de `/{accion.value}` en este servidor: **{segundos / 3600:g} horas**",
+            ephemeral=True  # solo lo ve el admin
+        )
+async def setup(bot):
+    await bot.add_cog(SetCooldown(bot))
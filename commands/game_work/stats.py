@@ -5,7 +5,8 @@ from discord import app_commands
 
 # --- IMPORTA TUS UTILIDADES ---
 # Asegúrate de que esta ruta sea correcta según tu estructura de proyecto
-from utils.data import load_data, PATH_USERS
+from utils.users import user_store
+from utils.diseases import current_health
 
 class Profile(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -14,43 +15,27 @@ class Profile(commands.Cog):
     @app_commands.command(name="stats", description="Muestra tus estadísticas: dinero, trabajo, experiencia y salud.")
     async def stats(self, interaction: discord.Interaction):
         """Muestra un embed con todas tus estadísticas personales."""
-        # --- 1. Cargar solo los datos de usuarios ---
-        data_users = await load_data(PATH_USERS)
+        # --- 1. Cargar el perfil del usuario ---
         user_id = str(interaction.user.id)
+        user = await user_store.get(user_id)
 
         # --- 2. Verificar si existe el perfil ---
-        if user_id not in data_users:
+        if user is None:
             await interaction.response.send_message(
                 "❌ No tienes perfil creado. Usa el comando para crear tu perfil primero.",
                 ephemeral=True
             )
             return
 
-        user = data_users[user_id]
+        # --- 3. Campos del perfil (UserRecord ya migra las claves antiguas) ---
+        dinero = user.dinero
+        trabajo_slug = user.job  # puede ser None
+        experiencia = user.experiencia
 
-        # --- 3. Normalizar claves (soporta distintas estructuras) ---
-        # CORRECCIÓN: Eliminé un paréntesis extra que había en el código original.
-        try:
-            dinero = int(user.get("dinero", user.get("money", 0)))
-        except (ValueError, TypeError):
-            dinero = 0
-
-        trabajo_slug = user.get("trabajo") or user.get("job")  # puede ser None
-
-        try:
-            experiencia = int(user.get("experiencia", user.get("exp", 0)))
-        except (ValueError, TypeError):
-            experiencia = 0
-
-        # Salud (soporta 'salud' o 'health')
-        salud_raw = user.get("salud", user.get("health", 100))
-        try:
-            salud = int(salud_raw)
-        except (ValueError, TypeError):
-            salud = 100
-
-        enfermedad = user.get("disease")  # nombre de la enfermedad si existe
-        # date_disease = user.get("date_disease") # Esta variable no se usaba, la comento
+        # Salud con el daño de la enfermedad calculado al leer
+        health = current_health(user)
+        salud = health.health
+        enfermedad = None if health.cured else health.disease_name
 
         # --- 4. Preparar texto del trabajo (sin consultar jobs.json) ---
         if trabajo_slug:
@@ -71,6 +56,8 @@ class Profile(commands.Cog):
         salud_value = f"{salud} / 100"
         if enfermedad:
             salud_value += f" — 🤒 **{enfermedad}**"
+            if health.disease:
+                salud_value += f" (-{health.disease.daily_health_loss}/día, {health.days_left} días restantes)"
         embed.add_field(name="❤️ Salud", value=salud_value, inline=False)
 
         # Mini-avatar y footer con ID
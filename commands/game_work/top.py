@@ -0,0 +1,121 @@
+# cogs/top.py
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+# --- IMPORTA TUS UTILIDADES ---
+from utils.leaderboard import leaderboard
+
+TOP_PAGE_SIZE = 10
+VIEW_TIMEOUT = 300  # segundos
+
+METRIC_LABELS = {
+    "dinero": ("💰 Top dinero", "${value:,}"),
+    "experiencia": ("🧾 Top experiencia", "{value:,} XP"),
+}
+
+# --- VISTA DE PAGINACIÓN ---
+class TopView(discord.ui.View):
+    def __init__(self, metric: str, author_id: int, page: int = 0, page_size: int = TOP_PAGE_SIZE, timeout: int = VIEW_TIMEOUT):
+        super().__init__(timeout=timeout)
+        self.metric = metric
+        self.author_id = author_id
+        self.page_size = page_size
+        self.max_page = max(0, (leaderboard.count(metric) - 1) // page_size)
+        self.page = max(0, min(page, self.max_page))
+        self.message = None
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.prev_button.disabled = (self.page == 0)
+        self.next_button.disabled = (self.page >= self.max_page)
+
+    def build_embed(self):
+        # El índice puede haber crecido desde que se abrió la vista
+        self.max_page = max(0, (leaderboard.count(self.metric) - 1) // self.page_size)
+        title, value_fmt = METRIC_LABELS[self.metric]
+        rows = leaderboard.page(self.metric, self.page, self.page_size)
+
+        lines = []
+        for i, (user_id, value) in enumerate(rows, start=self.page * self.page_size + 1):
+            if i == 1:
+                medal = "🥇"
+            elif i == 2:
+                medal = "🥈"
+            elif i == 3:
+                medal = "🥉"
+            else:
+                medal = f"{i}."
+            lines.append(f"{medal} <@{user_id}> — **{value_fmt.format(value=value)}**")
+
+        embed = discord.Embed(
+            title=title,
+            description="\n".join(lines) or "Aún no hay jugadores registrados.",
+            color=discord.Color.gold()
+        )
+        footer = f"Página {self.page + 1}/{self.max_page + 1}"
+        rank = leaderboard.rank(self.metric, str(self.author_id))
+        if rank:
+            footer += f" — Tu posición: #{rank}"
+        embed.set_footer(text=footer)
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("Solo quien abrió el ranking puede usar estos botones.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(emoji="⬅️", style=discord.ButtonStyle.secondary, custom_id="top_prev")
+    async def prev_button(self, interaction_btn: discord.Interaction, button: discord.ui.Button):
+        if self.page > 0:
+            self.page -= 1
+        embed = self.build_embed()
+        self._update_buttons()
+        await interaction_btn.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(emoji="➡️", style=discord.ButtonStyle.secondary, custom_id="top_next")
+    async def next_button(self, interaction_btn: discord.Interaction, button: discord.ui.Button):
+        if self.page < self.max_page:
+            self.page += 1
+        embed = self.build_embed()
+        self._update_buttons()
+        await interaction_btn.response.edit_message(embed=embed, view=self)
+
+    async def on_timeout(self):
+        for child in self.children:
+            child.disabled = True
+        try:
+            if getattr(self, "message", None):
+                await self.message.edit(view=self)
+        except Exception:
+            pass
+
+####################################################################################
+# --- EL COG PRINCIPAL ---
+
+class Top(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="top", description="Ranking de los jugadores con más dinero o experiencia.")
+    @app_commands.describe(
+        categoria="Qué ranking quieres ver.",
+        pagina="Página del ranking (empieza en 1)."
+    )
+    @app_commands.choices(categoria=[
+        app_commands.Choice(name="dinero", value="dinero"),
+        app_commands.Choice(name="experiencia", value="experiencia"),
+    ])
+    async def top(self, interaction: discord.Interaction, categoria: app_commands.Choice[str], pagina: int = 1):
+        """Muestra el ranking paginado desde el índice en memoria (sin releer data.json)."""
+        await leaderboard.ensure_loaded()
+
+        view = TopView(categoria.value, interaction.user.id, page=pagina - 1)
+        embed = view.build_embed()
+        await interaction.response.send_message(embed=embed, view=view)
+        view.message = await interaction.original_response()
+
+# --- FUNCIÓN DE CONFIGURACIÓN ---
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Top(bot))
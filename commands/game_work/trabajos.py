@@ -2,27 +2,110 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
-import os
-import asyncio
+from bisect import bisect_right
 
 # --- IMPORTA TUS UTILIDADES ---
 # Asegúrate de que esta ruta sea correcta según tu estructura de proyecto
-from utils.data import file_lock, PATH_TRABAJOS
+from utils.jobs import get_job_catalog
+from utils.leaderboard import leaderboard
 
 # --- CONSTANTES (Pueden estar aquí o en tu Cog) ---
 JOBS_PAGE_SIZE = 8
 VIEW_TIMEOUT = 300  # segundos
 
+ORDENES = {
+    "xp": "Req XP ⬆️",
+    "sueldo": "Sueldo ⬇️",
+}
+
+# --- PÁGINAS PRE-RENDERIZADAS (compartidas por todas las vistas) ---
+class JobPageCache:
+    """
+    Embeds de cada página para cada combinación de filtro y orden, construidos una sola vez
+    por versión del catálogo y compartidos (solo lectura) entre todas las JobsView.
+    Los filtros salen de listas pre-ordenadas: por nivel, por requisito de XP y por sueldo.
+    """
+
+    def __init__(self, catalog, page_size: int = JOBS_PAGE_SIZE):
+        self.catalog = catalog
+        self.page_size = page_size
+        by_xp = sorted(catalog.jobs, key=lambda j: (j.required_experience, j.name))
+        by_salary = sorted(catalog.jobs, key=lambda j: (-(j.salary or 0), j.required_experience, j.name))
+        # (nivel, orden) -> lista ordenada; nivel None = todos
+        self._slices: dict[tuple, list] = {(None, "xp"): by_xp, (None, "sueldo"): by_salary}
+        for level in catalog.by_level:
+            self._slices[(level, "xp")] = [j for j in by_xp if j.level == level]
+            self._slices[(level, "sueldo")] = [j for j in by_salary if j.level == level]
+        self._req_sorted = {key: [j.required_experience for j in jobs] for key, jobs in self._slices.items() if key[1] == "xp"}
+        self._pages: dict[tuple, tuple[discord.Embed, ...]] = {}
+        for level, orden in self._slices:
+            self.pages(level, orden)
+
+    def _cutoff(self, level: str | None, max_xp: int) -> int:
+        """Cuántos trabajos (ordenados por XP) puede conseguir alguien con `max_xp`."""
+        return bisect_right(self._req_sorted[(level, "xp")], max_xp)
+
+    def pages(self, level: str | None = None, orden: str = "xp", max_xp: int | None = None) -> tuple[discord.Embed, ...]:
+        level = level if level in self.catalog.by_level else None
+        orden = orden if orden in ORDENES else "xp"
+        cutoff = None if max_xp is None else self._cutoff(level, max_xp)
+        key = (level, orden, cutoff)
+        cached = self._pages.get(key)
+        if cached is not None:
+            return cached
+
+        jobs = self._slices[(level, orden)]
+        if cutoff is not None:
+            if orden == "xp":
+                jobs = jobs[:cutoff]  # prefijo de la lista ordenada por XP
+            else:
+                limit = self._req_sorted[(level, "xp")][cutoff - 1] if cutoff else -1
+                jobs = [j for j in jobs if j.required_experience <= limit]
+
+        title = "💼 Trabajos disponibles"
+        if level:
+            title += f" — {level}"
+        if cutoff is not None:
+            title += " — que puedes conseguir"
+
+        total_pages = max(1, (len(jobs) + self.page_size - 1) // self.page_size)
+        rendered = []
+        for page in range(total_pages):
+            chunk = jobs[page * self.page_size:(page + 1) * self.page_size]
+            embed = discord.Embed(
+                title=title,
+                description=f"Página {page + 1}/{total_pages} — mostrando {len(chunk)} de {len(jobs)} trabajos — orden: {ORDENES[orden]}",
+                color=0x2F3136
+            )
+            for job in chunk:
+                value = f"Nivel: **{job.level}** — Req XP: **{job.required_experience}**"
+                if job.salary is not None:
+                    value += f" — Sueldo: **${job.salary:,}**"
+                embed.add_field(name=job.title, value=value, inline=False)
+            rendered.append(embed)
+
+        self._pages[key] = tuple(rendered)
+        return self._pages[key]
+
+
+_page_cache: JobPageCache | None = None
+
+def get_page_cache() -> JobPageCache:
+    """Reconstruye las páginas solo si el catálogo de trabajos cambió."""
+    global _page_cache
+    catalog = get_job_catalog()
+    if _page_cache is None or _page_cache.catalog is not catalog:
+        _page_cache = JobPageCache(catalog)
+    return _page_cache
+
 # --- VISTA DE PAGINACIÓN (Ahora fuera del comando, para mayor limpieza) ---
 class JobsView(discord.ui.View):
-    def __init__(self, jobs_list, author_id: int, page_size: int = JOBS_PAGE_SIZE, timeout: int = VIEW_TIMEOUT):
+    def __init__(self, pages: tuple[discord.Embed, ...], author_id: int, timeout: int = VIEW_TIMEOUT):
         super().__init__(timeout=timeout)
-        self.jobs = jobs_list
+        self.pages = pages
         self.author_id = author_id
-        self.page_size = page_size
         self.page = 0
-        self.max_page = max(0, (len(self.jobs) - 1) // self.page_size)
+        self.max_page = max(0, len(self.pages) - 1)
         self.message = None
         self._update_buttons()
 
@@ -31,22 +114,7 @@ class JobsView(discord.ui.View):
         self.next_button.disabled = (self.page == self.max_page)
 
     def build_embed(self):
-        start = self.page * self.page_size
-        end = start + self.page_size
-        chunk = self.jobs[start:end]
-        embed = discord.Embed(
-            title="💼 Trabajos disponibles",
-            description=f"Página {self.page + 1}/{self.max_page + 1} — mostrando {len(chunk)} de {len(self.jobs)} trabajos",
-            color=0x2F3136
-        )
-        for job in chunk:
-            name = job.get("name", "Desconocido")
-            emoji = job.get("emoji", "")
-            level = job.get("level", "")
-            req = job.get("required_experience", "N/A")
-            title = f"{emoji} {name}" if emoji else name
-            embed.add_field(name=title, value=f"Nivel: **{level}** — Req XP: **{req}**", inline=False)
-        return embed
+        return self.pages[self.page]
 
     @discord.ui.button(emoji="⬅️", style=discord.ButtonStyle.secondary, custom_id="jobs_prev")
     async def prev_button(self, interaction_btn: discord.Interaction, button: discord.ui.Button):
@@ -95,60 +163,55 @@ class Trabajos(commands.Cog):
         self.bot = bot
 
     @app_commands.command(name="trabajos", description="Ver los trabajos disponibles.")
-    async def trabajos(self, interaction: discord.Interaction):
+    @app_commands.describe(
+        nivel="Mostrar solo un nivel (mediocre, bajo, medio, alto...).",
+        orden="Ordenar por requisito de XP o por sueldo.",
+        solo_disponibles="Mostrar solo los trabajos que puedes conseguir con tu XP."
+    )
+    @app_commands.choices(orden=[
+        app_commands.Choice(name=label, value=value) for value, label in ORDENES.items()
+    ])
+    async def trabajos(self, interaction: discord.Interaction, nivel: str = None,
+                       orden: app_commands.Choice[str] = None, solo_disponibles: bool = False):
         """Muestra una lista paginada de los trabajos disponibles."""
+        # Un nivel que no existe es un error, no "todos los niveles" (antes del defer, para que sea efímero)
+        level = nivel.strip().lower() if nivel else None
+        levels = get_job_catalog().by_level
+        if level and level not in levels:
+            validos = ", ".join(f"`{l}`" for l in sorted(levels)) or "(ninguno)"
+            await interaction.response.send_message(
+                f"❌ El nivel **{nivel}** no existe. Niveles válidos: {validos}.", ephemeral=True
+            )
+            return
+
         await interaction.response.defer()
 
-        # --- Leer archivo de trabajos (dentro de file_lock para seguridad) ---
-        async with file_lock:
-            def _read_sync():
-                if not os.path.exists(PATH_TRABAJOS):
-                    return None
-                with open(PATH_TRABAJOS, "r", encoding="utf-8") as f:
-                    try:
-                        return json.load(f)
-                    except json.JSONDecodeError:
-                        return None
-            raw = await asyncio.to_thread(_read_sync)
-
-        if not raw:
+        # --- Páginas pre-renderizadas (solo se rehacen si cambió trabajos.json) ---
+        cache = get_page_cache()
+        if not cache.catalog.jobs:
             await interaction.followup.send("No hay trabajos disponibles o el archivo está mal formado.", ephemeral=True)
             return
 
-        # --- Normalizar a lista de trabajos (lógica idéntica a la original) ---
-        jobs_list = []
-        if isinstance(raw, dict):
-            maybe = raw.get("jobs")
-            if isinstance(maybe, list):
-                jobs_list = maybe
-            elif all(isinstance(v, dict) for v in raw.values()):
-                jobs_list = list(raw.values())
-        elif isinstance(raw, list):
-            jobs_list = raw
-
-        norm_jobs = []
-        for j in jobs_list:
-            if not isinstance(j, dict):
-                continue
-            norm = {
-                "slug": j.get("slug") or (j.get("name","")).strip().lower().replace(" ", "-"),
-                "name": j.get("name") or j.get("display_name") or "Sin nombre",
-                "emoji": j.get("emoji",""),
-                "level": j.get("level") or j.get("category",""),
-                "required_experience": j.get("required_experience", j.get("required", 0))
-            }
-            norm_jobs.append(norm)
-
-        if not norm_jobs:
-            await interaction.followup.send("No hay trabajos válidos en el archivo.", ephemeral=True)
-            return
+        max_xp = None
+        if solo_disponibles:
+            await leaderboard.ensure_loaded()
+            max_xp = leaderboard.value("experiencia", interaction.user.id) or 0
+        pages = cache.pages(level, orden.value if orden else "xp", max_xp)
 
         # --- Crear y enviar la vista ---
-        view = JobsView(norm_jobs, interaction.user.id, page_size=JOBS_PAGE_SIZE, timeout=VIEW_TIMEOUT)
+        view = JobsView(pages, interaction.user.id, timeout=VIEW_TIMEOUT)
         embed = view.build_embed()
         message = await interaction.followup.send(embed=embed, view=view)
         view.message = message
 
+    @trabajos.autocomplete("nivel")
+    async def nivel_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        levels = get_job_catalog().by_level
+        return [
+            app_commands.Choice(name=f"{level} ({len(jobs)})", value=level)
+            for level, jobs in levels.items() if level.startswith(current.lower())
+        ][:25]
+
 # --- FUNCIÓN DE CONFIGURACIÓN ---
 async def setup(bot: commands.Bot):
     await bot.add_cog(Trabajos(bot))
\ No newline at end of file
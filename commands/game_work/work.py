@@ -4,10 +4,15 @@ from discord.ext import commands
 from discord import app_commands
 import random
 import datetime
-from datetime import timezone, timedelta
+from datetime import timezone
 
 # --- IMPORTA TUS UTILIDADES ---
-from utils.data import load_data, save_data, PATH_USERS, PATH_TRABAJOS
+from utils.users import user_store
+from utils.leaderboard import leaderboard
+from utils.cooldowns import cooldowns, format_seconds
+from utils.inactivity import inactivity
+from utils.diseases import get_disease_catalog, settle_health
+from utils.jobs import get_job_catalog
 
 class Work(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -18,148 +23,124 @@ class Work(commands.Cog):
     @app_commands.command(name="work", description="Trabaja para ganar dinero y experiencia (requiere tener un trabajo).")
     async def work(self, interaction: discord.Interaction):
         """
-        Trabaja para ganar dinero y experiencia. Depende de `date_job`:
-        - Si no han pasado 24h, hay riesgo de enfermedad.
-        - Si han pasado 24h, ganas dinero y XP normales.
+        Trabaja para ganar dinero y experiencia. Depende del cooldown "work":
+        - Si el cooldown (24h por defecto, configurable por servidor) no terminó, hay riesgo de enfermedad.
+        - Si ya terminó, ganas dinero y XP normales.
         """
         # --- 1. Verificaciones iniciales ---
         user_id = str(interaction.user.id)
-        data_users = await load_data(PATH_USERS)
+        user = await user_store.get(user_id)
 
-        if user_id not in data_users:
+        if user is None:
             await interaction.response.send_message("❌ No tienes perfil. Usa /jugar para registrarte primero.", ephemeral=True)
             return
 
-        user = data_users[user_id]
-        trabajo_slug = user.get("trabajo") or user.get("job")
+        trabajo_slug = user.job
         if not trabajo_slug:
             await interaction.response.send_message("❌ No tienes un trabajo asignado. Usa /postularse-trabajo para conseguir uno.", ephemeral=True)
             return
 
-        # --- 2. Cargar información del trabajo ---
-        data_jobs = await load_data(PATH_TRABAJOS)
-        raw_jobs = data_jobs.get("jobs") if isinstance(data_jobs, dict) else data_jobs
-        jobs_list = raw_jobs or []
-
-        job = None
-        if isinstance(jobs_list, dict):
-            job = jobs_list.get(trabajo_slug)
-        if not job and isinstance(jobs_list, list):
-            job = next((j for j in jobs_list if (j.get("slug") == trabajo_slug or j.get("name", "").lower() == str(trabajo_slug).lower())), None)
+        # --- 2. Información del trabajo (catálogo en memoria, ver utils/jobs.py) ---
+        job = get_job_catalog().get(trabajo_slug)
 
         required_exp = 0
         base_pay = None
         if job:
-            try:
-                required_exp = int(job.get("required_experience", job.get("required", 0) or 0))
-            except (ValueError, TypeError):
-                required_exp = 0
-            for key in ("salary", "pay", "income", "wage", "salary_per_day", "pago", "sueldo"):
-                if job.get(key) is not None:
-                    try:
-                        base_pay = int(job.get(key))
-                        break
-                    except (ValueError, TypeError):
-                        pass
+            required_exp = job.required_experience
+            base_pay = job.salary
 
         if base_pay is None:
             base_pay = 50 + (required_exp * 10) + random.randint(0, 100)
+        # Sanción por inactividad (utils/inactivity.py): -15% por cada aviso
+        base_pay = max(1, int(base_pay * user.sueldo_factor))
         xp_gain = random.randint(5, 20) + (required_exp // 2)
 
-        # --- 3. Lógica del cooldown de 24 horas ---
+        # --- 3. Cooldown de /work (ver utils/cooldowns.py) ---
         now = datetime.datetime.now(tz=timezone.utc)
-        last_work_iso = user.get("date_job")
-        last_work_dt = None
-        if last_work_iso:
-            try:
-                last_work_dt = datetime.datetime.fromisoformat(last_work_iso)
-                if last_work_dt.tzinfo is None:
-                    last_work_dt = last_work_dt.replace(tzinfo=timezone.utc)
-            except (ValueError, TypeError):
-                last_work_dt = None
-
-        allow_normal = True
-        hours_since = None
-        if last_work_dt:
-            delta = now - last_work_dt
-            hours_since = delta.total_seconds() / 3600.0
-            if hours_since < 24:
-                allow_normal = False
-
-        # --- 4. Rama: No han pasado 24h (riesgo de enfermedad) ---
+        guild_id = interaction.guild.id if interaction.guild else None
+        # Duración y tiempo transcurrido según el cooldown tal como empezó (otro servidor u
+        # otra configuración pueden tener otra duración); el aviso usa la de este servidor
+        started, deadline = cooldowns.window(user_id, "work", user)
+        cooldown_total = max(1, deadline - started)
+        cooldown_hours = max(1, cooldowns.duration("work", guild_id)) / 3600.0
+        seconds_left = cooldowns.remaining(user_id, "work", user)
+
+        allow_normal = seconds_left == 0
+        hours_since = max(0.0, (now.timestamp() - started) / 3600.0)
+
+        # Aplicar el daño acumulado de la enfermedad actual (ver utils/diseases.py)
+        health = settle_health(user)
+
+        # --- 4. Rama: El cooldown no terminó (riesgo de enfermedad) ---
         if not allow_normal:
-            hazard = max(5, min(45, int((24 - hours_since) * (45 / 24)))) # CORRECCIÓN: Paréntesis extra eliminado
+            hazard = max(5, min(45, int(seconds_left * 45 / cooldown_total)))
             roll = random.randint(1, 100)
-            if roll <= hazard:
-                diseases = [
-                    {"name": "resfriado", "damage": random.randint(5, 12)},
-                    {"name": "gripe", "damage": random.randint(8, 20)},
-                    {"name": "intoxicación alimentaria", "damage": random.randint(6, 18)},
-                    {"name": "fiebre", "damage": random.randint(7, 15)},
-                    {"name": "fatiga severa", "damage": random.randint(5, 14)}
-                ]
-                chosen = random.choice(diseases)
-                current_health = int(user.get("salud", 100))
-                new_health = max(0, current_health - chosen["damage"])
-                user["salud"] = new_health
-                user["disease"] = chosen["name"]
-                user["date_disease"] = now.isoformat()
+            catalog = get_disease_catalog()
+            if roll <= hazard and catalog.diseases:
+                chosen = random.choice(catalog.diseases)
+                new_health = max(0, health.health - chosen.health_loss)
+                user.salud = new_health
+                user.disease = chosen.slug
+                user.date_disease = now.isoformat()
+                user.disease_days_applied = 0
                 
-                dinero_actual = int(user.get("dinero", user.get("money", 0) or 0))
-                # CORRECCIÓN: Paréntesis extra eliminado
+                dinero_actual = user.dinero
                 gasto_med = min(dinero_actual, random.randint(0, max(0, int(dinero_actual * 0.1))))
-                user["dinero"] = dinero_actual - gasto_med
-                user["date_job"] = now.isoformat()
+                await user_store.add_money(user, -gasto_med, "work:atencion_medica")
+                user.date_job = now.isoformat()
+                cooldowns.start(user_id, "work", user, guild_id)
+                user.strikes_inactividad = 0
                 xp_earned = max(1, xp_gain // 4)
-                user["experiencia"] = int(user.get("experiencia", user.get("exp", 0) or 0)) + xp_earned
+                user.experiencia += xp_earned
 
-                await save_data(data_users, PATH_USERS)
+                await user_store.save()
+                leaderboard.update(user_id, user)
+                inactivity.schedule(user_id, user)
                 await interaction.response.send_message(
                     f"🤒 Oh no — trabajaste demasiado pronto ({hours_since:.1f}h desde el último /work). "
-                    f"Te contagiaste de **{chosen['name']}** y perdiste **{chosen['damage']}** de salud.\n"
+                    f"Te contagiaste de **{chosen.name}** y perdiste **{chosen.health_loss}** de salud "
+                    f"(y perderás {chosen.daily_health_loss} por día durante {chosen.duration_days} días si no te curas).\n"
                     f"Gastaste ${gasto_med} en atención y obtuviste solo {xp_earned} XP.\n"
                     f"Salud actual: **{new_health}**.\n"
-                    f"🔸 Consejo: espera 24 horas entre trabajos para evitar este riesgo.",
+                    f"🔸 Consejo: espera {cooldown_hours:g} horas entre trabajos para evitar este riesgo.",
                     ephemeral=False
                 )
                 return
             else:
                 pay = max(1, base_pay // 2)
-                user["dinero"] = int(user.get("dinero", user.get("money", 0) or 0)) + pay
+                await user_store.add_money(user, pay, "work:cansado")
                 gained_xp = max(1, xp_gain // 2)
-                user["experiencia"] = int(user.get("experiencia", user.get("exp", 0) or 0)) + gained_xp
-                user["date_job"] = now.isoformat()
-                await save_data(data_users, PATH_USERS)
+                user.experiencia += gained_xp
+                user.date_job = now.isoformat()
+                cooldowns.start(user_id, "work", user, guild_id)
+                user.strikes_inactividad = 0
+                await user_store.save()
+                leaderboard.update(user_id, user)
+                inactivity.schedule(user_id, user)
                 await interaction.response.send_message(
-                    f"💼 Trabajaste pero aún no pasaron 24 horas desde tu último /work ({hours_since:.1f}h). "
+                    f"💼 Trabajaste pero aún no pasaron {cooldown_total / 3600.0:g} horas desde tu último /work ({hours_since:.1f}h). "
                     f"Tu pago se vio reducido por cansancio: **${pay}** y ganaste **{gained_xp} XP**.\n"
-                    f"🔸 Riesgo de enfermedad en este intento: **{hazard}%**. ¡Ten cuidado!",
+                    f"🔸 Riesgo de enfermedad en este intento: **{hazard}%** (faltaban {format_seconds(seconds_left)}). ¡Ten cuidado!",
                     ephemeral=False
                 )
                 return
 
-        # --- 5. Rama: Han pasado 24h o es el primer trabajo ---
+        # --- 5. Rama: El cooldown terminó o es el primer trabajo ---
         variability = random.uniform(0.9, 1.3)
         pay = max(1, int(base_pay * variability))
-        user["dinero"] = int(user.get("dinero", user.get("money", 0) or 0)) + pay
-        user["experiencia"] = int(user.get("experiencia", user.get("exp", 0) or 0)) + xp_gain
-        user["date_job"] = now.isoformat()
-
-        # Limpiar enfermedad anterior si ya pasó tiempo
-        if user.get("disease") and user.get("date_disease"):
-            try:
-                dd = datetime.datetime.fromisoformat(user["date_disease"])
-                if (now - dd) > timedelta(days=3):
-                    user.pop("disease", None)
-                    user.pop("date_disease", None)
-            except (ValueError, TypeError):
-                pass
-
-        await save_data(data_users, PATH_USERS)
+        await user_store.add_money(user, pay, "work")
+        user.experiencia += xp_gain
+        user.date_job = now.isoformat()
+        cooldowns.start(user_id, "work", user, guild_id)
+        user.strikes_inactividad = 0
+
+        await user_store.save()
+        leaderboard.update(user_id, user)
+        inactivity.schedule(user_id, user)
         await interaction.response.send_message(
             f"✅ Trabajaste como **{trabajo_slug}** y ganaste **${pay}** y **{xp_gain} XP**.\n"
-            f"Dinero actual: **${user['dinero']}** — Experiencia total: **{user['experiencia']}**.\n"
-            f"🔸 Vuelve en ~24 horas para el siguiente /work.",
+            f"Dinero actual: **${user.dinero}** — Experiencia total: **{user.experiencia}**.\n"
+            f"🔸 Vuelve en ~{cooldown_hours:g} horas para el siguiente /work.",
             ephemeral=False
         )
 
@@ -2,12 +2,11 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-import yt_dlp
 from collections import deque
 import os
 
-from utils.ffmpeg_path import FFMPEG_PATH
-from utils.cookies_path import COOKIES_PATH
+from utils.ffmpeg_path import get_ffmpeg_path
+from utils.cookies_path import get_cookies_path
 
 # ─── yt-dlp config ────────────────────────────────────────────────────────────
 YTDL_OPTIONS = {
@@ -17,7 +16,7 @@ YTDL_OPTIONS = {
     "noplaylist": True,
     "extractaudio": True,
     "default_search": "scsearch",
-    "cookiefile": COOKIES_PATH,
+    # "cookiefile" se añade en _ytdl_options(): la ruta se resuelve al primer uso
     "socket_timeout": 15,
     "retries": 3,
     "http_headers": {
@@ -35,6 +34,16 @@ FFMPEG_OPTIONS = {
 }
 
 
+def _ytdl(opts: dict):
+    """yt_dlp es lento de importar: se importa con la primera búsqueda (en el hilo del executor)."""
+    import yt_dlp
+    return yt_dlp.YoutubeDL(opts)
+
+
+def _ytdl_options(**overrides) -> dict:
+    return {**YTDL_OPTIONS, "cookiefile": get_cookies_path(), **overrides}
+
+
 # ─── Track ────────────────────────────────────────────────────────────────────
 class Track:
     def __init__(self, title: str, page_url: str, duration: int, requester: discord.Member):
@@ -54,7 +63,7 @@ async def resolve_track(query: str, requester: discord.Member) -> Track:
     loop = asyncio.get_event_loop()
 
     def _extract():
-        with yt_dlp.YoutubeDL(YTDL_OPTIONS) as ydl:
+        with _ytdl(_ytdl_options()) as ydl:
             q = query if query.startswith("http") else f"scsearch:{query}"
             info = ydl.extract_info(q, download=False)
             if "entries" in info:
@@ -75,9 +84,9 @@ async def get_audio_url(track: Track) -> str:
 
     def _extract():
         # Dejar que yt-dlp elija el mejor formato disponible
-        opts = {**YTDL_OPTIONS, "format": "bestaudio/best"}
+        opts = _ytdl_options(format="bestaudio/best")
 
-        with yt_dlp.YoutubeDL(opts) as ydl:
+        with _ytdl(opts) as ydl:
             info = ydl.extract_info(track.page_url, download=False)
             if "entries" in info:
                 info = info["entries"][0]
@@ -217,11 +226,11 @@ class Play(commands.Cog):
                 try:
                     source = discord.FFmpegPCMAudio(
                         audio_url,
-                        executable=FFMPEG_PATH,
+                        executable=get_ffmpeg_path(),
                         **FFMPEG_OPTIONS,
                     )
-                    print(f"[DEBUG] FFmpeg path: {FFMPEG_PATH}")
-                    print(f"[DEBUG] FFmpeg existe: {os.path.isfile(FFMPEG_PATH)}")
+                    print(f"[DEBUG] FFmpeg path: {get_ffmpeg_path()}")
+                    print(f"[DEBUG] FFmpeg existe: {os.path.isfile(get_ffmpeg_path())}")
                     source = discord.PCMVolumeTransformer(source, volume=0.8)
                     vc.play(source, after=after)
                 except Exception as e:
@@ -3,9 +3,6 @@ from discord.ext import commands
 from discord import app_commands
 import asyncio
 
-# Logs
-discord.utils.setup_logging(level=discord.utils.logging.INFO)
-
 # ─── Estaciones predefinidas (solo para /stations) ───────────────────────────
 # Agrega o quita entradas aquí libremente, sin tocar nada más.
 STATIONS: dict[str, dict] = {
@@ -48,7 +45,7 @@ STATIONS: dict[str, dict] = {
 }
 
 # Ajusta si ffmpeg no está en el PATH
-from utils.ffmpeg_path import FFMPEG_PATH
+from utils.ffmpeg_path import get_ffmpeg_path
 
 
 def _make_now_playing_embed(name: str, url: str, requester: discord.Member) -> discord.Embed:
@@ -105,7 +102,7 @@ class PlayRadio(commands.Cog):
 
         source = discord.FFmpegPCMAudio(
             url,
-            executable=FFMPEG_PATH,
+            executable=get_ffmpeg_path(),
             before_options="-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
             options="-vn",
         )
@@ -56,6 +56,19 @@ def get_alianza_channel(guild_id: int):
         row = cursor.fetchone()
         return row[0] if row else None
     
+# Obtener todos los canales de alianzas configurados (para el router de mensajes)
+def get_alianza_channels():
+    with connect() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT alliance_channel_id
+            FROM guild_config
+            WHERE alliance_channel_id IS NOT NULL
+        """)
+
+        return [row[0] for row in cursor.fetchall()]
+
 # Obtener rol de alianza
 def get_alianza_role(guild_id: int):
     with connect() as conn:
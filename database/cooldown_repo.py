@@ -0,0 +1,40 @@
+from database.database import connect
+
+# Establecer duración de un cooldown para un servidor
+def set_cooldown_override(guild_id: int, action: str, seconds: int):
+    with connect() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO cooldown_overrides (guild_id, action, seconds)
+            VALUES (?, ?, ?)
+            ON CONFLICT(guild_id, action)
+            DO UPDATE SET seconds = excluded.seconds
+        """, (guild_id, action, seconds))
+
+        conn.commit()
+
+# Quitar la duración personalizada (vuelve al valor por defecto)
+def delete_cooldown_override(guild_id: int, action: str):
+    with connect() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            DELETE FROM cooldown_overrides
+            WHERE guild_id = ? AND action = ?
+        """, (guild_id, action))
+
+        conn.commit()
+
+# Obtener todas las duraciones personalizadas de un servidor
+def get_cooldown_overrides(guild_id: int):
+    with connect() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT action, seconds
+            FROM cooldown_overrides
+            WHERE guild_id = ?
+        """, (guild_id,))
+
+        return dict(cursor.fetchall())
@@ -30,4 +30,21 @@ def _setup():
         )
         """)
 
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cooldown_overrides (
+            guild_id INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            seconds INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, action)
+        )
+        """)
+
+        # Valores sueltos del bot (p. ej. el hash de los comandos sincronizados)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bot_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        """)
+
         conn.commit()
\ No newline at end of file
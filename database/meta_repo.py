@@ -0,0 +1,29 @@
+from database.database import connect
+
+# Guardar un valor del bot
+def set_meta(key: str, value: str):
+    with connect() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO bot_meta (key, value)
+            VALUES (?, ?)
+            ON CONFLICT(key)
+            DO UPDATE SET value = excluded.value
+        """, (key, value))
+
+        conn.commit()
+
+# Obtener un valor del bot (None si no existe)
+def get_meta(key: str):
+    with connect() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT value
+            FROM bot_meta
+            WHERE key = ?
+        """, (key,))
+
+        row = cursor.fetchone()
+        return row[0] if row else None
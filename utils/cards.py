@@ -0,0 +1,79 @@
+import random
+from array import array
+
+# Cartas como enteros 0..51: rango = carta // 4 (0 = A ... 12 = K), palo = carta % 4
+RANKS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+SUITS = ("♠", "♥", "♦", "♣")
+# Valor de blackjack por rango (el As cuenta 11 y se ajusta en hand_total)
+RANK_VALUES = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+CARD_VALUES = bytes(RANK_VALUES[c // 4] for c in range(52))
+
+# Lo que se devuelve al jugador por unidad apostada según el resultado de la mano
+BLACKJACK_PAYOUTS = {
+    "dealer_bust": 2,
+    "win": 2,
+    "tie": 1,
+    "lose": 0,
+    "bust": 0,
+}
+
+SHOE_DECKS = 6
+PENETRATION = 0.75  # la carta de corte queda al 75% del zapato
+
+
+def card_str(card: int) -> str:
+    return f"{RANKS[card // 4]}{SUITS[card % 4]}"
+
+
+def card_value(card: int) -> int:
+    return CARD_VALUES[card]
+
+
+def hand_total(cards) -> tuple[int, bool]:
+    """(total, es_blanda) de una mano de cartas enteras."""
+    total = 0
+    aces = 0
+    for card in cards:
+        total += CARD_VALUES[card]
+        if card < 4:  # rango 0 = As
+            aces += 1
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total, aces > 0
+
+
+class Shoe:
+    """
+    Zapato de varias barajas con carta de corte: al pasar el corte se rebaraja
+    antes de la siguiente ronda (no en medio de una mano).
+    """
+
+    def __init__(self, decks: int = SHOE_DECKS, penetration: float = PENETRATION, rng: random.Random | None = None):
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = rng or random.Random()
+        self.cards = array("B")
+        self.pos = 0
+        self.cut = 0
+        self.shuffle()
+
+    def shuffle(self):
+        self.cards = array("B", range(52)) * self.decks
+        self.rng.shuffle(self.cards)
+        self.pos = 0
+        self.cut = int(len(self.cards) * self.penetration)
+
+    @property
+    def needs_shuffle(self) -> bool:
+        return self.pos >= self.cut
+
+    def draw(self) -> int:
+        if self.pos >= len(self.cards):
+            self.shuffle()
+        card = self.cards[self.pos]
+        self.pos += 1
+        return card
+
+    def remaining(self) -> int:
+        return len(self.cards) - self.pos
@@ -0,0 +1,268 @@
+"""
+Simulador Monte Carlo de la ventaja de la casa para /blackjack y /ruleta.
+
+Usa las mismas reglas que los comandos (utils/cards.py y utils/roulette.py), así que
+un cambio de pagos se puede medir antes de subirlo:
+
+    python -m utils.casino_sim blackjack --rondas 2000000
+    python -m utils.casino_sim ruleta --apuesta rojo --apuestas 10,50,100 --banca 1000
+
+Con NumPy las barajadas y los giros se hacen por bloques vectorizados (`--bloque` rondas
+por bloque, para acotar la memoria). Sin NumPy se simula en Python puro, bastante más lento.
+"""
+import argparse
+import math
+import random
+import time
+
+from utils.cards import CARD_VALUES, BLACKJACK_PAYOUTS, SHOE_DECKS, hand_total
+from utils.roulette import POCKETS, parse_bet, payout_table
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional (no está en requirements.txt)
+    np = None
+
+DEFAULT_CHUNK = 20_000
+MAX_CARDS = 20  # cartas que se miran de cada zapato barajado (sobra para jugador + dealer)
+DEALER_STANDS_ON = 17
+
+
+class Stats:
+    """Media y varianza del resultado neto por unidad apostada, acumuladas por bloques."""
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.counts: dict[int, int] = {}  # multiplicador -> veces
+
+    def add(self, multipliers):
+        if np is not None and isinstance(multipliers, np.ndarray):
+            net = multipliers.astype(np.float64) - 1
+            self.n += net.size
+            self.total += float(net.sum())
+            self.total_sq += float((net * net).sum())
+            values, counts = np.unique(multipliers, return_counts=True)
+            for value, count in zip(values.tolist(), counts.tolist()):
+                self.counts[value] = self.counts.get(value, 0) + count
+            return
+        for m in multipliers:
+            net = m - 1
+            self.n += 1
+            self.total += net
+            self.total_sq += net * net
+            self.counts[m] = self.counts.get(m, 0) + 1
+
+    @property
+    def ev(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+    @property
+    def variance(self) -> float:
+        if self.n < 2:
+            return 0.0
+        return (self.total_sq - self.n * self.ev ** 2) / (self.n - 1)
+
+    def distribution(self) -> tuple[list[int], list[float]]:
+        """(resultados netos, probabilidades) observados, para simular la ruina."""
+        nets = sorted(self.counts)
+        return [m - 1 for m in nets], [self.counts[m] / self.n for m in nets]
+
+
+# --- Blackjack ---
+def _blackjack_chunk_np(rng, n: int, decks: int, stand_on: int):
+    values = np.frombuffer(CARD_VALUES, dtype=np.uint8).astype(np.int16)
+    # Fisher-Yates parcial: solo se barajan las MAX_CARDS primeras posiciones de cada zapato
+    shoe = np.tile(np.arange(52, dtype=np.uint8), (n, decks))
+    rows = np.arange(n)
+    for i in range(MAX_CARDS):
+        j = rng.integers(i, shoe.shape[1], size=n)
+        shoe[rows, i], shoe[rows, j] = shoe[rows, j], shoe[rows, i].copy()
+    vals = values[shoe[:, :MAX_CARDS]]
+
+    def deal(first: int, second: int):
+        total = vals[:, first] + vals[:, second]
+        aces = (vals[:, first] == 11).astype(np.int16) + (vals[:, second] == 11)
+        return total, aces
+
+    def soften(total, aces):
+        # Igual que hand_total: cada As pasa de 11 a 1 mientras haga falta
+        while True:
+            fix = (total > 21) & (aces > 0)
+            if not fix.any():
+                return
+            total[fix] -= 10
+            aces[fix] -= 1
+
+    def play(total, aces, ptr, threshold, active):
+        soften(total, aces)
+        while True:
+            hit = active & (total < threshold) & (ptr < MAX_CARDS)
+            if not hit.any():
+                return
+            card = vals[rows, np.minimum(ptr, MAX_CARDS - 1)]
+            total += np.where(hit, card, 0)
+            aces += hit & (card == 11)
+            ptr += hit
+            soften(total, aces)
+
+    player, player_aces = deal(0, 2)
+    dealer, dealer_aces = deal(1, 3)
+    ptr = np.full(n, 4, dtype=np.int16)
+    play(player, player_aces, ptr, stand_on, np.ones(n, dtype=bool))
+    busted = player > 21
+    play(dealer, dealer_aces, ptr, DEALER_STANDS_ON, ~busted)
+
+    result = np.full(n, BLACKJACK_PAYOUTS["lose"], dtype=np.int16)
+    result[player == dealer] = BLACKJACK_PAYOUTS["tie"]
+    result[player > dealer] = BLACKJACK_PAYOUTS["win"]
+    result[dealer > 21] = BLACKJACK_PAYOUTS["dealer_bust"]
+    result[busted] = BLACKJACK_PAYOUTS["bust"]
+    return result
+
+
+def _blackjack_chunk_py(rng: random.Random, n: int, decks: int, stand_on: int) -> list[int]:
+    shoe = list(range(52)) * decks
+    out = []
+    for _ in range(n):
+        cards = rng.sample(shoe, MAX_CARDS)
+        player, dealer = [cards[0], cards[2]], [cards[1], cards[3]]
+        ptr = 4
+        while hand_total(player)[0] < stand_on:
+            player.append(cards[ptr])
+            ptr += 1
+        player_val = hand_total(player)[0]
+        if player_val > 21:
+            out.append(BLACKJACK_PAYOUTS["bust"])
+            continue
+        while hand_total(dealer)[0] < DEALER_STANDS_ON:
+            dealer.append(cards[ptr])
+            ptr += 1
+        dealer_val = hand_total(dealer)[0]
+        if dealer_val > 21:
+            out.append(BLACKJACK_PAYOUTS["dealer_bust"])
+        elif player_val > dealer_val:
+            out.append(BLACKJACK_PAYOUTS["win"])
+        elif player_val == dealer_val:
+            out.append(BLACKJACK_PAYOUTS["tie"])
+        else:
+            out.append(BLACKJACK_PAYOUTS["lose"])
+    return out
+
+
+def simulate_blackjack(rounds: int, decks: int = SHOE_DECKS, stand_on: int = 17,
+                       seed: int | None = None, chunk: int = DEFAULT_CHUNK) -> Stats:
+    """Jugador que pide carta hasta `stand_on` (sin doblar), zapato recién barajado por ronda."""
+    stats = Stats()
+    rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+    done = 0
+    while done < rounds:
+        n = min(chunk, rounds - done)
+        if np is not None:
+            stats.add(_blackjack_chunk_np(rng, n, decks, stand_on))
+        else:
+            stats.add(_blackjack_chunk_py(rng, n, decks, stand_on))
+        done += n
+    return stats
+
+
+# --- Ruleta ---
+def simulate_roulette(rounds: int, choice: str = "rojo", seed: int | None = None,
+                      chunk: int = DEFAULT_CHUNK) -> Stats:
+    stats = Stats()
+    table = payout_table(parse_bet(choice) or choice)
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        lookup = np.array(table, dtype=np.int16)
+        done = 0
+        while done < rounds:
+            n = min(chunk, rounds - done)
+            stats.add(lookup[rng.integers(0, POCKETS, size=n)])
+            done += n
+    else:
+        rng = random.Random(seed)
+        stats.add(table[rng.randrange(POCKETS)] for _ in range(rounds))
+    return stats
+
+
+# --- Ruina ---
+def time_to_ruin(stats: Stats, bankroll: int, bet: int, horizon: int = 1000, players: int = 2000,
+                 seed: int | None = None, chunk: int = DEFAULT_CHUNK) -> tuple[float, float | None]:
+    """
+    Juega `players` jugadores con `bankroll` apostando siempre `bet`, como mucho `horizon` rondas.
+    Devuelve (probabilidad de arruinarse, mediana de rondas hasta la ruina entre los arruinados).
+    La ruina es no poder pagar la siguiente apuesta.
+    """
+    nets, probs = stats.distribution()
+    ruined_at: list[int] = []
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        per_chunk = max(1, chunk * 50 // horizon)
+        done = 0
+        while done < players:
+            n = min(per_chunk, players - done)
+            outcomes = rng.choice(np.array(nets, dtype=np.int32), size=(n, horizon), p=probs)
+            bank = bankroll + bet * np.cumsum(outcomes, axis=1, dtype=np.int64)
+            broke = bank < bet
+            hit = broke.any(axis=1)
+            ruined_at.extend((broke[hit].argmax(axis=1) + 1).tolist())
+            done += n
+    else:
+        rng = random.Random(seed)
+        for _ in range(players):
+            bank = bankroll
+            for r in range(1, horizon + 1):
+                bank += bet * rng.choices(nets, probs)[0]
+                if bank < bet:
+                    ruined_at.append(r)
+                    break
+    if not ruined_at:
+        return 0.0, None
+    ruined_at.sort()
+    return len(ruined_at) / players, float(ruined_at[len(ruined_at) // 2])
+
+
+def _report(name: str, stats: Stats, elapsed: float, args):
+    print(f"== {name} — {stats.n:,} rondas en {elapsed:.2f}s ({'NumPy' if np is not None else 'Python puro'}) ==")
+    std = math.sqrt(stats.variance)
+    margin = 1.96 * std / math.sqrt(stats.n) if stats.n else 0.0
+    print(f"Valor esperado por unidad: {stats.ev:+.4f} (±{margin:.4f}, 95%) -> ventaja de la casa {-stats.ev * 100:.2f}%")
+    print(f"Varianza por unidad: {stats.variance:.4f} (desv. {std:.4f})")
+    print("Resultados (multiplicador devuelto: frecuencia): "
+          + ", ".join(f"x{m}: {c / stats.n:.4f}" for m, c in sorted(stats.counts.items())))
+    print(f"Ruina con banca ${args.banca:,} en {args.horizonte} rondas ({args.jugadores} jugadores):")
+    for bet in args.apuestas:
+        prob, median = time_to_ruin(stats, args.banca, bet, args.horizonte, args.jugadores, args.semilla, args.bloque)
+        median_txt = f"mediana {median:.0f} rondas" if median is not None else "nadie se arruinó"
+        print(f"  apuesta ${bet:,}: {prob * 100:.1f}% se arruina — {median_txt}")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Simulador de ventaja de la casa (blackjack / ruleta).")
+    parser.add_argument("juego", choices=("blackjack", "ruleta"))
+    parser.add_argument("--rondas", type=int, default=1_000_000)
+    parser.add_argument("--bloque", type=int, default=DEFAULT_CHUNK, help="rondas por bloque vectorizado")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--barajas", type=int, default=SHOE_DECKS)
+    parser.add_argument("--plantarse", type=int, default=17, help="el jugador pide carta por debajo de este total")
+    parser.add_argument("--apuesta", type=lambda s: parse_bet(s) or parser.error(f"apuesta inválida: {s}"),
+                        default="rojo", help="apuesta de ruleta (rojo, par, docena1, columna2, 17...)")
+    parser.add_argument("--banca", type=int, default=1000)
+    parser.add_argument("--apuestas", type=lambda s: [int(x) for x in s.split(",")], default=[10, 50, 100, 250])
+    parser.add_argument("--horizonte", type=int, default=1000)
+    parser.add_argument("--jugadores", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.juego == "blackjack":
+        stats = simulate_blackjack(args.rondas, args.barajas, args.plantarse, args.semilla, args.bloque)
+        name = f"Blackjack (se planta en {args.plantarse}, {args.barajas} barajas)"
+    else:
+        stats = simulate_roulette(args.rondas, args.apuesta, args.semilla, args.bloque)
+        name = f"Ruleta ({args.apuesta})"
+    _report(name, stats, time.perf_counter() - start, args)
+
+
+if __name__ == "__main__":
+    main()
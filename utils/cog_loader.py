@@ -0,0 +1,160 @@
+"""
+Carga de cogs con cascada de tiempos de arranque.
+
+1. Precalentamiento: las dependencias de nivel superior de cada cog (yt_dlp, aiohttp, utils.*...)
+   se importan en unos pocos hilos. Se leen del código sin ejecutar el cog.
+2. Setup: `bot.load_extension` de cada cog, uno detrás de otro. load_extension vuelve a ejecutar
+   el módulo del cog (no reutiliza sys.modules), así que los cogs en sí no se pueden adelantar,
+   y ningún `setup`/`cog_load` espera I/O que valga la pena solapar.
+
+Ojo con lo que se espera del paso 1: el GIL no deja solapar imports de Python puro, y medido
+aquí la diferencia con la carga secuencial es ruido (unos 40 ms en ambos casos). Lo que sí
+ahorra algo en bot.py es hacer el login a la vez que esta carga. El valor de este módulo es
+sobre todo la cascada: ver qué cog o dependencia se come el arranque.
+
+Los tiempos quedan en `bot.startup_timings` (el comando !startup los muestra). Para medir el
+arranque sin conectar a Discord (y comparar con la carga secuencial de antes):
+
+    python -m utils.cog_loader
+    python -m utils.cog_loader --secuencial
+"""
+import argparse
+import asyncio
+import importlib
+import re
+import sys
+import time
+from pathlib import Path
+
+from discord.ext import commands
+
+BAR_WIDTH = 40
+PREWARM_WORKERS = 4
+
+
+class CogTiming:
+    __slots__ = ("module", "prewarm_start", "prewarm", "setup_start", "setup", "error")
+
+    def __init__(self, module: str):
+        self.module = module
+        self.prewarm_start = 0.0  # segundos desde el inicio de la carga
+        self.prewarm = 0.0
+        self.setup_start = 0.0
+        self.setup = 0.0
+        self.error: str | None = None
+
+
+def discover(root: str = "commands") -> list[tuple[str, Path]]:
+    """(módulo importable, ruta) de cada cog. Ej: commands/utils/ping.py -> commands.utils.ping"""
+    found = []
+    for filepath in sorted(Path(root).rglob("*.py")):
+        if filepath.name == "__init__.py":
+            continue
+        found.append((".".join(filepath.parts[:-1] + (filepath.stem,)), filepath))
+    return found
+
+
+# Imports en la columna 0 (nivel superior). Más barato que ast.parse, que costaba más que
+# los propios imports que queríamos adelantar
+_IMPORT = re.compile(r"^(?:from\s+([A-Za-z_][\w.]*)\s+import\b|import\s+([\w.]+(?:\s*,\s*[\w.]+)*))", re.M)
+
+
+def _imports(path: Path) -> list[str]:
+    """Módulos importados en el nivel superior del fichero (sin ejecutarlo)."""
+    try:
+        source = path.read_text(encoding="utf-8")
+    except OSError:
+        return []  # el error de verdad lo dará load_extension
+    names = []
+    for m in _IMPORT.finditer(source):
+        if m.group(1):
+            names.append(m.group(1))
+        else:
+            names.extend(name.strip() for name in m.group(2).split(","))
+    return names
+
+
+def _prewarm(name: str) -> float:
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except Exception:
+        pass  # igual que arriba: que falle (y se informe) en load_extension
+    return time.perf_counter() - start
+
+
+async def load_cogs(bot: commands.Bot, root: str = "commands", parallel: bool = True) -> list[CogTiming]:
+    """Carga todos los cogs de `root` y devuelve sus tiempos (también en bot.startup_timings)."""
+    origin = time.perf_counter()
+    cogs = discover(root)
+    timings = [CogTiming(module) for module, _ in cogs]
+
+    if parallel:
+        # Cada dependencia se importa una sola vez (en el primer cog que la pide) y con pocos
+        # hilos: con uno por cog se pelean por los locks de importación y por el GIL
+        owners: dict[str, CogTiming] = {}
+        for timing, (_, path) in zip(timings, cogs):
+            for name in _imports(path):
+                if name not in sys.modules:
+                    owners.setdefault(name, timing)
+        limit = asyncio.Semaphore(PREWARM_WORKERS)
+
+        async def prewarm(name: str, timing: CogTiming):
+            async with limit:
+                start = time.perf_counter() - origin
+                if not timing.prewarm:
+                    timing.prewarm_start = start
+                timing.prewarm += await asyncio.to_thread(_prewarm, name)
+
+        await asyncio.gather(*(prewarm(name, timing) for name, timing in owners.items()))
+
+    for timing in timings:
+        timing.setup_start = time.perf_counter() - origin
+        try:
+            await bot.load_extension(timing.module)
+            print(f'📦 Cargado: {timing.module}')
+        except Exception as e:
+            timing.error = str(e)
+            print(f'❌ No se pudo cargar el cog {timing.module} debido a: {e}')
+        timing.setup = time.perf_counter() - origin - timing.setup_start
+        await asyncio.sleep(0)  # deja avanzar lo que vaya en paralelo (p. ej. el login en bot.py)
+
+    bot.startup_timings = timings
+    bot.startup_total = time.perf_counter() - origin
+    return timings
+
+
+def waterfall(timings: list[CogTiming], total: float) -> str:
+    """Cascada de texto: `-` precalentamiento, `#` setup, ordenada por lo que más tarda."""
+    scale = BAR_WIDTH / total if total else 0.0
+    width = max((len(t.module) for t in timings), default=0)
+    lines = [f"Arranque de cogs: {total * 1000:.0f} ms ({len(timings)} módulos)"]
+    for t in sorted(timings, key=lambda t: t.prewarm + t.setup, reverse=True):
+        bar = [" "] * BAR_WIDTH
+        for start, length, char in ((t.prewarm_start, t.prewarm, "-"), (t.setup_start, t.setup, "#")):
+            first = min(BAR_WIDTH - 1, int(start * scale))
+            for i in range(first, min(BAR_WIDTH, first + max(1, round(length * scale)))):
+                bar[i] = char
+        status = " ❌" if t.error else ""
+        lines.append(f"{t.module:<{width}} |{''.join(bar)}| "
+                     f"import {t.prewarm * 1000:6.1f} ms  setup {t.setup * 1000:6.1f} ms{status}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Mide la carga de cogs sin conectar a Discord.")
+    parser.add_argument("--secuencial", action="store_true", help="sin precalentar en paralelo (como antes)")
+    args = parser.parse_args(argv)
+
+    async def run():
+        import discord
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.default())
+        async with bot:  # sin login: solo para que los tasks.loop de los cogs puedan arrancar
+            timings = await load_cogs(bot, parallel=not args.secuencial)
+        print(waterfall(timings, bot.startup_total))
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,20 @@
 import os
 import base64
+from functools import cache
 
+# La ruta se resuelve (y el fichero se valida) la primera vez que alguien la pide, no al
+# importar: así cargar los cogs no toca disco ni revienta si faltan las cookies.
+@cache
 def get_cookies_path():
     # Opción 1: Ruta local (desarrollo)
     local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../cookies.txt"))
     if os.path.exists(local_path):
-        return local_path
+        return _check(local_path)
     
     # Opción 2: Secret Files de Render
     render_secret_path = "/etc/secrets/cookies.txt"
     if os.path.exists(render_secret_path):
-        return render_secret_path
+        return _check(render_secret_path)
     
     # Opción 3: Variable de entorno en Base64
     cookies_b64 = os.environ.get("COOKIES_B64")
@@ -18,14 +22,23 @@ def get_cookies_path():
         temp_path = "/tmp/cookies.txt"
         with open(temp_path, "wb") as f:
             f.write(base64.b64decode(cookies_b64))
-        return temp_path
+        return _check(temp_path)
     
     raise FileNotFoundError("No se encontró cookies.txt en ninguna ruta")
 
 
-COOKIES_PATH = get_cookies_path()
+def _check(path):
+    # Verificación
+    with open(path) as f:
+        first_line = f.readline()
+    if "Netscape HTTP Cookie File" not in first_line:
+        raise ValueError(f"Archivo inválido: {first_line}")
+    print(f"✅ Cookies cargadas desde: {path}")
+    return path
 
-# Verificación
-first_line = open(COOKIES_PATH).readline()
-assert "Netscape HTTP Cookie File" in first_line, f"Archivo inválido: {first_line}"
-print(f"✅ Cookies cargadas desde: {COOKIES_PATH}")
\ No newline at end of file
+
+# Compatibilidad con `from utils.cookies_path import COOKIES_PATH` (eso sí la resuelve al importar)
+def __getattr__(name):
+    if name == "COOKIES_PATH":
+        return get_cookies_path()
+    raise AttributeError(name)
@@ -0,0 +1,132 @@
+import datetime
+import time
+from datetime import timezone
+
+from database.cooldown_repo import get_cooldown_overrides, set_cooldown_override, delete_cooldown_override
+from utils.users import UserRecord
+
+# Duración por defecto (segundos) de cada acción con cooldown
+DEFAULT_COOLDOWNS: dict[str, int] = {
+    "work": 24 * 3600,
+}
+
+# Para datos antiguos: acción -> campo ISO con la fecha del último uso
+_LEGACY_DATE_FIELDS = {
+    "work": "date_job",
+}
+
+
+def iso_to_epoch(value) -> int | None:
+    """Convierte un ISO de data.json (con o sin zona horaria) a segundos epoch UTC."""
+    if not value:
+        return None
+    try:
+        dt = datetime.datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+class CooldownManager:
+    """
+    Cooldowns por (usuario, acción) guardados como (inicio, deadline) en segundos epoch.
+    - Consulta en O(1) desde un dict en memoria.
+    - Respaldado en el perfil del usuario (`user.cooldowns[acción]`); los perfiles
+      antiguos se derivan una sola vez de `date_job`.
+    - Duraciones personalizables por servidor (tabla `cooldown_overrides`).
+    """
+
+    def __init__(self, defaults: dict[str, int] | None = None):
+        self.defaults = dict(defaults or DEFAULT_COOLDOWNS)
+        self._windows: dict[tuple[str, str], tuple[int, int]] = {}
+        self._overrides: dict[int, dict[str, int]] = {}  # guild_id -> {acción: segundos}
+
+    # --- Duraciones ---
+    def duration(self, action: str, guild_id: int | None = None) -> int:
+        if guild_id is not None:
+            overrides = self._overrides.get(guild_id)
+            if overrides is None:
+                overrides = self._overrides[guild_id] = get_cooldown_overrides(guild_id)
+            if action in overrides:
+                return overrides[action]
+        return self.defaults.get(action, 0)
+
+    def set_override(self, guild_id: int, action: str, seconds: int | None):
+        """Cambia la duración de `action` en un servidor. `None` vuelve al valor por defecto."""
+        if seconds is None:
+            delete_cooldown_override(guild_id, action)
+        else:
+            set_cooldown_override(guild_id, action, int(seconds))
+        self._overrides.pop(guild_id, None)
+
+    # --- Deadlines ---
+    # En `user.cooldowns[acción]` se guarda [inicio, deadline] (epoch). Los perfiles con solo el
+    # deadline (un entero) o solo `date_job` se interpretan con la duración por defecto.
+    def _window(self, user_id: str, action: str, user: UserRecord | None) -> tuple[int, int]:
+        key = (str(user_id), action)
+        window = self._windows.get(key)
+        if window is not None:
+            return window
+
+        start, deadline = 0, 0
+        if user is not None:
+            stored = (user.cooldowns or {}).get(action)
+            if isinstance(stored, (list, tuple)):
+                start, deadline = int(stored[0]), int(stored[1])
+            elif stored is not None:
+                deadline = int(stored)
+                start = deadline - self.defaults.get(action, 0)
+            elif action in _LEGACY_DATE_FIELDS:
+                last = iso_to_epoch(getattr(user, _LEGACY_DATE_FIELDS[action]))
+                if last is not None:
+                    start, deadline = last, last + self.defaults.get(action, 0)
+        self._windows[key] = (start, deadline)
+        return start, deadline
+
+    def _deadline(self, user_id: str, action: str, user: UserRecord | None) -> int:
+        return self._window(user_id, action, user)[1]
+
+    def window(self, user_id: str, action: str, user: UserRecord | None = None) -> tuple[int, int]:
+        """(inicio, deadline) del último cooldown; la duración es la que tenía al empezar."""
+        return self._window(user_id, action, user)
+
+    def remaining(self, user_id: str, action: str, user: UserRecord | None = None, now: int | None = None) -> int:
+        """Segundos que faltan para poder usar `action` (0 = listo)."""
+        now = int(time.time()) if now is None else now
+        return max(0, self._deadline(user_id, action, user) - now)
+
+    def ready(self, user_id: str, action: str, user: UserRecord | None = None, now: int | None = None) -> bool:
+        return self.remaining(user_id, action, user, now) == 0
+
+    def start(self, user_id: str, action: str, user: UserRecord, guild_id: int | None = None, now: int | None = None) -> int:
+        """
+        Inicia el cooldown y lo escribe en `user` (el llamador guarda con user_store.save()).
+        Devuelve el deadline en segundos epoch.
+        """
+        now = int(time.time()) if now is None else now
+        deadline = now + self.duration(action, guild_id)
+        self._windows[(str(user_id), action)] = (now, deadline)
+        if user.cooldowns is None:
+            user.cooldowns = {}
+        user.cooldowns[action] = [now, deadline]
+        return deadline
+
+    def clear(self, user_id: str, action: str, user: UserRecord | None = None):
+        self._windows[(str(user_id), action)] = (0, 0)
+        if user is not None and user.cooldowns:
+            user.cooldowns.pop(action, None)
+
+
+# Instancia compartida por todos los cogs
+cooldowns = CooldownManager()
+
+
+def format_seconds(seconds: int) -> str:
+    """12345 -> '3h 25m'."""
+    hours, rest = divmod(int(seconds), 3600)
+    minutes = rest // 60
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
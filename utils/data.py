@@ -3,7 +3,11 @@ import os
 import json
 import tempfile
 PATH_USERS = "data.json"
+PATH_USERS_BIN = "data.bin"
 PATH_TRABAJOS = "trabajos.json"
+PATH_ENFERMEDADES = "diseases.json"
+PATH_LEDGER = "ledger.log"
+PATH_LEDGER_SNAPSHOT = "ledger_snapshot.json"
 
 
 file_lock = asyncio.Lock()
@@ -14,13 +18,14 @@ async def load_data(path: str) -> dict:
     Si el archivo no existe, crea uno con la estructura por defecto {"xp": {}, "jobs": {}}.
     Esta función es asíncrona y usa file_lock para evitar condiciones de carrera.
     """
-    async with file_lock:
-        # Si no existe, inicializamos con estructura base
-        if not os.path.exists(path):
-            default = {"xp": {}, "jobs": {}}
-            await save_data(default, path)
-            return default
+    # Si no existe, inicializamos con estructura base
+    # (fuera del lock: save_data también lo toma y asyncio.Lock no es reentrante)
+    if not os.path.exists(path):
+        default = {"xp": {}, "jobs": {}}
+        await save_data(default, path)
+        return default
 
+    async with file_lock:
         def _read_sync():
             with open(path, "r", encoding="utf-8") as f:
                 return json.load(f)
@@ -59,4 +64,113 @@ async def save_data(data, path: str) -> None:
 
         await asyncio.to_thread(_write_sync)
 
-    
\ No newline at end of file
+async def save_bytes(data: bytes, path: str) -> None:
+    """Igual que save_data pero para contenido binario ya serializado (p. ej. data.bin)."""
+    async with file_lock:
+        dirn = os.path.dirname(path) or "."
+        os.makedirs(dirn, exist_ok=True)
+
+        def _write_sync():
+            fd, tmp_path = tempfile.mkstemp(dir=dirn, prefix=".tmp-", suffix=".bin")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    try:
+                        os.remove(tmp_path)
+                    except Exception:
+                        pass
+
+        await asyncio.to_thread(_write_sync)
+
+
+# --- Group commit ---
+# Modo de durabilidad para guardados frecuentes (se elige por despliegue con DATA_DURABILITY):
+#   strict  -> cada guardado escribe y hace fsync antes de volver (comportamiento original)
+#   grouped -> los guardados que llegan dentro de la ventana se escriben juntos con un solo fsync;
+#              cada comando espera a que su escritura esté en disco
+#   async   -> el comando no espera; el lote se escribe en segundo plano
+DURABILITY_MODES = ("strict", "grouped", "async")
+DURABILITY = os.environ.get("DATA_DURABILITY", "grouped").strip().lower()
+if DURABILITY not in DURABILITY_MODES:
+    DURABILITY = "grouped"
+GROUP_COMMIT_WINDOW = float(os.environ.get("DATA_GROUP_COMMIT_MS", "10")) / 1000
+GROUP_COMMIT_MAX = 64
+
+
+class GroupCommitter:
+    """
+    Junta los guardados de un mismo archivo en una sola escritura (un solo fsync).
+    `snapshot` es una función que devuelve los datos a guardar; se llama al momento de escribir,
+    así el lote refleja todos los cambios hechos en memoria por los comandos que esperan.
+    `writer` es save_data (JSON) o save_bytes (contenido ya serializado).
+    """
+
+    def __init__(self, path: str, mode: str = DURABILITY,
+                 window: float = GROUP_COMMIT_WINDOW, max_batch: int = GROUP_COMMIT_MAX,
+                 writer=save_data):
+        self.path = path
+        self.writer = writer
+        self.mode = mode
+        self.window = window
+        self.max_batch = max_batch
+        self._snapshot = None
+        self._waiters: list[asyncio.Future] = []
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.flushes = 0
+        self.commits = 0
+
+    async def commit(self, snapshot, wait: bool = True):
+        """`wait=False` no espera al disco aunque el modo sea grouped (el llamador ya es durable por otro lado)."""
+        self.commits += 1
+        if self.mode == "strict" and wait:
+            self.flushes += 1
+            await self.writer(snapshot(), self.path)
+            return
+
+        self._snapshot = snapshot
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        if len(self._waiters) >= self.max_batch:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_later())
+
+        if self.mode == "async" or not wait:
+            # Nadie espera el resultado: evitar "Future exception was never retrieved"
+            waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+            return
+        await waiter
+
+    async def _flush_later(self):
+        while self._waiters:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.window)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+
+            waiters, self._waiters = self._waiters, []
+            snapshot = self._snapshot
+            try:
+                self.flushes += 1
+                await self.writer(snapshot(), self.path)
+            except Exception as e:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+            else:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+
+    async def flush(self):
+        """Espera a que se escriba todo lo pendiente (p. ej. antes de apagar el bot)."""
+        while self._task is not None and not self._task.done():
+            self._full.set()
+            await asyncio.shield(self._task)
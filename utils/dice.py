@@ -0,0 +1,428 @@
+"""
+Motor de expresiones de dados para /roll.
+
+Gramática (sin distinguir mayúsculas, espacios ignorados):
+    expr  := term (("+" | "-") term)*
+    term  := dados | número
+    dados := [N] "d" (CARAS | "%") mods*
+    mods  := "kh" N | "kl" N | "dh" N | "dl" N | "!" | "adv" | "dis"
+
+Ejemplos: 4d6kh3+2 (4d6 quedándose con los 3 más altos), 10d10! (explotan al sacar el máximo),
+2d20adv (el más alto de dos d20), d% (1-100).
+
+Todo tiene límites (cantidad de dados, caras, explosiones) para que nadie tumbe el bot.
+Las tiradas grandes se vectorizan con NumPy si está instalado; es opcional (no está en
+requirements.txt) y sin él todo funciona igual, solo más lento y con menos presupuesto de muestreo.
+
+Las probabilidades se cachean: exactas por convolución cuando la expresión es pequeña; si no,
+la parte sin kh/kl se aproxima con una normal y solo los dados con kh/kl se muestrean, sin pasar
+nunca de SAMPLE_BUDGET dados tirados.
+"""
+import bisect
+import math
+import random
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from typing import Callable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se tira en Python puro
+    np = None
+
+MAX_LENGTH = 100
+MAX_TERMS = 20
+MAX_DICE = 100_000       # dados por expresión
+MAX_SIDES = 10_000
+MAX_EXPLOSIONS = 100     # re-tiradas encadenadas por dado
+SHOW_DICE = 30           # más dados que esto no se listan uno por uno
+VECTORIZE_FROM = 200     # a partir de aquí se usa NumPy (si está)
+
+EXACT_MAX_SUPPORT = 20_000     # valores distintos de una distribución exacta
+EXACT_MAX_WORK = 2_000_000     # multiplicaciones por convolución
+EXACT_MAX_MULTISETS = 200_000  # combinaciones a enumerar para kh/kl/dh/dl
+EXACT_EXPLODE_DEPTH = 8
+# Tope duro de dados tirados para estimar los términos con kh/kl (menos sin NumPy). Si con ese
+# tope no salen MIN_SAMPLES muestras, no se estima: la expresión se rechaza
+SAMPLE_BUDGET = 5_000_000 if np is not None else 300_000
+MIN_SAMPLES, MAX_SAMPLES = 100, 50_000
+
+
+class DiceError(ValueError):
+    """Expresión inválida o fuera de los límites (el mensaje se muestra al usuario)."""
+
+
+# --- AST ---
+class Const:
+    __slots__ = ("value",)
+
+    def __init__(self, value: int):
+        self.value = value
+
+    def __str__(self):
+        return str(self.value)
+
+
+class Dice:
+    __slots__ = ("count", "sides", "keep", "explode")
+
+    def __init__(self, count: int, sides: int, keep: tuple[str, int] | None = None, explode: bool = False):
+        self.count = count
+        self.sides = sides
+        self.keep = keep          # ("kh" | "kl", n): cuántos dados se conservan
+        self.explode = explode
+
+    def __str__(self):
+        text = f"{self.count}d{self.sides}"
+        if self.explode:
+            text += "!"
+        if self.keep:
+            text += f"{self.keep[0]}{self.keep[1]}"
+        return text
+
+
+class Expr:
+    __slots__ = ("terms",)
+
+    def __init__(self, terms: list[tuple[int, Const | Dice]]):
+        self.terms = terms  # [(signo, nodo), ...]
+
+    def __str__(self):
+        text = ""
+        for i, (sign, node) in enumerate(self.terms):
+            if i == 0:
+                text += ("-" if sign < 0 else "") + str(node)
+            else:
+                text += (" - " if sign < 0 else " + ") + str(node)
+        return text
+
+
+# --- Parser ---
+_TOKEN = re.compile(r"\s*(?:(?P<dice>(?P<count>\d*)d(?P<sides>\d+|%)(?P<mods>(?:kh\d+|kl\d+|dh\d+|dl\d+|!|adv|dis)*))"
+                    r"|(?P<num>\d+)|(?P<op>[+-]))")
+_MOD = re.compile(r"(kh|kl|dh|dl)(\d+)|(!)|(adv|dis)")
+
+
+def _parse_dice(count_txt: str, sides_txt: str, mods: str) -> Dice:
+    count = int(count_txt) if count_txt else 1
+    sides = 100 if sides_txt == "%" else int(sides_txt)
+    if count < 1 or sides < 1:
+        raise DiceError("Los dados necesitan al menos 1 dado y 1 cara.")
+    if sides > MAX_SIDES:
+        raise DiceError(f"Máximo {MAX_SIDES} caras por dado.")
+
+    keep = None
+    explode = False
+    for m in _MOD.finditer(mods):
+        if m.group(1):
+            kind, n = m.group(1), int(m.group(2))
+            # Descartar los n más bajos = conservar los (count - n) más altos
+            if kind == "dh":
+                kind, n = "kl", count - n
+            elif kind == "dl":
+                kind, n = "kh", count - n
+            keep = (kind, n)
+        elif m.group(3):
+            explode = True
+        else:
+            count = max(count, 2)
+            keep = ("kh" if m.group(4) == "adv" else "kl", 1)
+    if keep is not None:
+        n = keep[1]
+        if n < 1 or n > count:
+            raise DiceError("No puedes conservar más dados de los que tiras (ni ninguno).")
+        if n == count:
+            keep = None
+    if explode and sides == 1:
+        raise DiceError("Un d1 no puede explotar.")
+    return Dice(count, sides, keep, explode)
+
+
+@lru_cache(maxsize=512)
+def parse(text: str) -> Expr:
+    """Convierte el texto en un Expr. Lanza DiceError si no es válido."""
+    text = text.strip().lower()
+    if not text:
+        raise DiceError("Escribe una expresión, por ejemplo `4d6kh3+2`.")
+    if len(text) > MAX_LENGTH:
+        raise DiceError(f"La expresión es demasiado larga (máx. {MAX_LENGTH} caracteres).")
+
+    terms = []
+    sign = 1
+    expect_term = True
+    pos = 0
+    total_dice = 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise DiceError(f"No entiendo `{text[pos:pos + 10]}`.")
+        pos = m.end()
+        if m.group("op"):
+            if expect_term:
+                if m.group("op") == "-" and not terms:
+                    sign = -sign
+                    continue
+                raise DiceError("Falta un término entre dos operadores.")
+            sign = 1 if m.group("op") == "+" else -1
+            expect_term = True
+            continue
+        if not expect_term:
+            raise DiceError("Falta un `+` o `-` entre dos términos.")
+        if m.group("dice"):
+            node = _parse_dice(m.group("count"), m.group("sides"), m.group("mods"))
+            total_dice += node.count
+        else:
+            node = Const(int(m.group("num")))
+        terms.append((sign, node))
+        sign = 1
+        expect_term = False
+        if len(terms) > MAX_TERMS:
+            raise DiceError(f"Máximo {MAX_TERMS} términos.")
+    if expect_term:
+        raise DiceError("La expresión termina en un operador.")
+    if total_dice > MAX_DICE:
+        raise DiceError(f"Máximo {MAX_DICE:,} dados por tirada.")
+    return Expr(terms)
+
+
+# --- Tirar ---
+class RollResult:
+    __slots__ = ("total", "details")
+
+    def __init__(self, total: int, details: list[str]):
+        self.total = total
+        self.details = details
+
+
+def _roll_dice_py(node: Dice, rng: random.Random) -> list[int]:
+    values = rng.choices(range(1, node.sides + 1), k=node.count)
+    if node.explode:
+        for i, value in enumerate(values):
+            extra = value
+            chain = 0
+            while extra == node.sides and chain < MAX_EXPLOSIONS:
+                extra = rng.randint(1, node.sides)
+                values[i] += extra
+                chain += 1
+    return values
+
+
+def _roll_dice_np(node: Dice, rng) -> "np.ndarray":
+    values = rng.integers(1, node.sides + 1, size=node.count, dtype=np.int64)
+    if node.explode:
+        active = values == node.sides
+        for _ in range(MAX_EXPLOSIONS):
+            n = int(active.sum())
+            if not n:
+                break
+            extra = rng.integers(1, node.sides + 1, size=n, dtype=np.int64)
+            values[active] += extra
+            still = np.zeros_like(active)
+            still[np.flatnonzero(active)[extra == node.sides]] = True
+            active = still
+    return values
+
+
+def _kept(values: list[int], keep) -> tuple[list[int], list[int]]:
+    """Índices conservados y descartados (para tachar los descartados al mostrar)."""
+    if keep is None:
+        return list(range(len(values))), []
+    order = sorted(range(len(values)), key=values.__getitem__, reverse=keep[0] == "kh")
+    return order[:keep[1]], order[keep[1]:]
+
+
+def roll(expr: Expr, rng: random.Random | None = None) -> RollResult:
+    rng = rng or random.Random()
+    total = 0
+    details = []
+    for sign, node in expr.terms:
+        if isinstance(node, Const):
+            total += sign * node.value
+            continue
+
+        if np is not None and node.count >= VECTORIZE_FROM:
+            values = _roll_dice_np(node, np.random.default_rng(rng.getrandbits(64)))
+            if node.keep:
+                k = node.keep[1]
+                part = np.partition(values, -k)[-k:] if node.keep[0] == "kh" else np.partition(values, k - 1)[:k]
+                subtotal = int(part.sum())
+            else:
+                subtotal = int(values.sum())
+            details.append(f"{node}: {subtotal:,}")
+        else:
+            values = _roll_dice_py(node, rng)
+            kept, dropped = _kept(values, node.keep)
+            subtotal = sum(values[i] for i in kept)
+            if node.count <= SHOW_DICE:
+                dropped = set(dropped)
+                shown = ", ".join(f"~~{v}~~" if i in dropped else str(v) for i, v in enumerate(values))
+                details.append(f"{node}: [{shown}] = {subtotal}")
+            else:
+                details.append(f"{node}: {subtotal:,}")
+        total += sign * subtotal
+    return RollResult(total, details)
+
+
+# --- Distribuciones ---
+def _convolve(a: dict[int, float], b: dict[int, float]) -> dict[int, float]:
+    if len(a) * len(b) > EXACT_MAX_WORK:
+        raise OverflowError
+    out: dict[int, float] = {}
+    for va, pa in a.items():
+        for vb, pb in b.items():
+            out[va + vb] = out.get(va + vb, 0.0) + pa * pb
+    return out
+
+
+def _die_pmf(sides: int, explode: bool) -> dict[int, float]:
+    if not explode:
+        return {v: 1 / sides for v in range(1, sides + 1)}
+    pmf: dict[int, float] = {}
+    p = 1 / sides
+    for depth in range(EXACT_EXPLODE_DEPTH):
+        base = depth * sides
+        for v in range(1, sides):
+            pmf[base + v] = p ** (depth + 1)
+    # Lo que queda (explotó EXACT_EXPLODE_DEPTH veces) se asigna al máximo; es despreciable
+    pmf[EXACT_EXPLODE_DEPTH * sides] = p ** EXACT_EXPLODE_DEPTH
+    return pmf
+
+
+def _sum_pmf(pmf: dict[int, float], count: int) -> dict[int, float]:
+    """Suma de `count` dados iguales por potencias (convoluciones en O(log count))."""
+    # El soporte final se sabe de antemano: si no cabe, ni se empieza a convolucionar
+    if count * (max(pmf) - min(pmf)) + 1 > EXACT_MAX_SUPPORT:
+        raise OverflowError
+    result = {0: 1.0}
+    power = pmf
+    while count:
+        if count & 1:
+            result = _convolve(result, power)
+            if len(result) > EXACT_MAX_SUPPORT:
+                raise OverflowError
+        count >>= 1
+        if count:
+            power = _convolve(power, power)
+            if len(power) > EXACT_MAX_SUPPORT:
+                raise OverflowError
+    return result
+
+
+def _keep_pmf(node: Dice) -> dict[int, float]:
+    """kh/kl exacto enumerando multiconjuntos de caras con su peso multinomial."""
+    sides, count, (kind, k) = node.sides, node.count, node.keep
+    # Cada multiconjunto cuesta O(count): se acota el trabajo real, no solo cuántos hay. Con dos
+    # o más caras hay al menos count + 1 multiconjuntos, así que esto descarta antes de calcular comb
+    if count * count > EXACT_MAX_WORK:
+        raise OverflowError
+    multisets = math.comb(sides + count - 1, count)
+    if multisets > EXACT_MAX_MULTISETS or multisets * count > EXACT_MAX_WORK:
+        raise OverflowError
+    pmf: dict[int, float] = {}
+    total = sides ** count
+    fact = math.factorial(count)
+    for combo in combinations_with_replacement(range(1, sides + 1), count):
+        ways = fact
+        run = 1
+        for i in range(1, count + 1):
+            if i < count and combo[i] == combo[i - 1]:
+                run += 1
+            else:
+                ways //= math.factorial(run)
+                run = 1
+        value = sum(combo[-k:]) if kind == "kh" else sum(combo[:k])
+        pmf[value] = pmf.get(value, 0.0) + ways / total
+    return pmf
+
+
+def _exact(expr: Expr) -> dict[int, float]:
+    dist = {0: 1.0}
+    for sign, node in expr.terms:
+        if isinstance(node, Const):
+            term = {sign * node.value: 1.0}
+        else:
+            if node.keep and node.explode:
+                raise OverflowError
+            term = _keep_pmf(node) if node.keep else _sum_pmf(_die_pmf(node.sides, node.explode), node.count)
+            if sign < 0:
+                term = {-v: p for v, p in term.items()}
+        dist = _convolve(dist, term)
+        if len(dist) > EXACT_MAX_SUPPORT:
+            raise OverflowError
+    return dist
+
+
+def _survival(terms: list) -> Callable[[int], float]:
+    """P(suma de `terms` >= x) para términos sin kh/kl: exacta si cabe, si no por una normal."""
+    try:
+        dist = _exact(Expr(terms))
+    except OverflowError:
+        pass
+    else:
+        values = sorted(dist)
+        tail = [0.0] * (len(values) + 1)
+        for i in range(len(values) - 1, -1, -1):
+            tail[i] = tail[i + 1] + dist[values[i]]
+        return lambda x: tail[bisect.bisect_left(values, x)]
+
+    mean = var = 0.0
+    for sign, node in terms:
+        if isinstance(node, Const):
+            mean += sign * node.value
+            continue
+        pmf = _die_pmf(node.sides, node.explode)
+        die_mean = sum(v * p for v, p in pmf.items())
+        die_var = sum((v - die_mean) ** 2 * p for v, p in pmf.items())
+        mean += sign * node.count * die_mean
+        var += node.count * die_var
+    if var == 0:
+        return lambda x: 1.0 if mean >= x else 0.0
+    scale = math.sqrt(2 * var)
+    # Corrección de continuidad: la suma es entera
+    return lambda x: 0.5 * math.erfc((x - 0.5 - mean) / scale)
+
+
+def _kept_weights(terms: list) -> list[tuple[int, float]]:
+    """(valor, probabilidad) de la suma de los términos con kh/kl: exacta o por muestreo acotado."""
+    try:
+        return list(_exact(Expr(terms)).items())
+    except OverflowError:
+        pass
+    dice = sum(node.count for _, node in terms)
+    samples = min(MAX_SAMPLES, SAMPLE_BUDGET // dice)
+    if samples < MIN_SAMPLES:
+        raise DiceError(f"Demasiados dados con kh/kl para estimar la probabilidad "
+                        f"(máx. {SAMPLE_BUDGET // MIN_SAMPLES:,}).")
+    rng = random.Random(0)
+    expr = Expr(terms)
+    counts = Counter(roll(expr, rng).total for _ in range(samples))
+    return [(v, c / samples) for v, c in counts.items()]
+
+
+@lru_cache(maxsize=256)
+def distribution(canonical: str) -> dict[int, float] | None:
+    """Distribución exacta de una expresión ya normalizada con str(parse(...)), o None si es grande."""
+    try:
+        return _exact(parse(canonical.replace(" ", "")))
+    except OverflowError:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _estimator(canonical: str):
+    expr = parse(canonical.replace(" ", ""))
+    plain = [(sign, node) for sign, node in expr.terms if isinstance(node, Const) or not node.keep]
+    kept = [(sign, node) for sign, node in expr.terms if isinstance(node, Dice) and node.keep]
+    return _survival(plain), _kept_weights(kept)
+
+
+def probability_at_least(expr: Expr, target: int) -> tuple[float, bool]:
+    """(P(total >= target), es_exacta). Lanza DiceError si no se puede estimar dentro del presupuesto."""
+    canonical = str(expr)
+    dist = distribution(canonical)
+    if dist is not None:
+        return sum(p for v, p in dist.items() if v >= target), True
+    survival, weights = _estimator(canonical)
+    return min(1.0, sum(p * survival(target - v) for v, p in weights)), False
@@ -0,0 +1,122 @@
+import json
+import os
+import time
+
+from utils.data import PATH_ENFERMEDADES
+from utils.cooldowns import iso_to_epoch
+from utils.users import UserRecord
+
+DAY_SECONDS = 24 * 3600
+# Enfermedades antiguas de data.json que no están en diseases.json ("fiebre", "fatiga severa"...):
+# no bajan salud con el tiempo y se curan solas a los 3 días, como antes.
+LEGACY_DURATION_DAYS = 3
+
+
+class Disease:
+    __slots__ = ("slug", "name", "severity", "health_loss", "daily_health_loss", "duration_days", "treatment_cost", "description")
+
+    def __init__(self, raw: dict):
+        self.slug = raw.get("slug") or raw.get("name", "").strip().lower().replace(" ", "_")
+        self.name = raw.get("name") or self.slug
+        self.severity = raw.get("severity", "")
+        self.health_loss = int(raw.get("health_loss", 0) or 0)
+        self.daily_health_loss = int(raw.get("daily_health_loss", 0) or 0)
+        self.duration_days = int(raw.get("duration_days", LEGACY_DURATION_DAYS) or 0)
+        self.treatment_cost = int(raw.get("treatment_cost", 0) or 0)
+        self.description = raw.get("description", "")
+
+
+class DiseaseCatalog:
+    """diseases.json indexado por slug, por nombre (minúsculas) y por severidad."""
+
+    def __init__(self, diseases: list[Disease]):
+        self.diseases = diseases
+        self.by_slug = {d.slug: d for d in diseases}
+        self.by_name = {d.name.lower(): d for d in diseases}
+        self.by_severity: dict[str, list[Disease]] = {}
+        for d in diseases:
+            self.by_severity.setdefault(d.severity, []).append(d)
+
+    @classmethod
+    def from_file(cls, path: str = PATH_ENFERMEDADES) -> "DiseaseCatalog":
+        raw = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                try:
+                    raw = json.load(f)
+                except json.JSONDecodeError:
+                    raw = {}
+        items = raw.get("diseases", []) if isinstance(raw, dict) else raw
+        return cls([Disease(d) for d in items if isinstance(d, dict)])
+
+    def get(self, key) -> Disease | None:
+        """Busca por slug o nombre. None si no existe (enfermedad antigua)."""
+        if not key:
+            return None
+        key = str(key)
+        return self.by_slug.get(key) or self.by_name.get(key.lower())
+
+
+_catalog: DiseaseCatalog | None = None
+
+def get_disease_catalog() -> DiseaseCatalog:
+    """Carga diseases.json una sola vez."""
+    global _catalog
+    if _catalog is None:
+        _catalog = DiseaseCatalog.from_file()
+    return _catalog
+
+
+class HealthState:
+    """Salud calculada en el momento de la lectura (no se guarda hasta `settle`)."""
+    __slots__ = ("health", "disease", "disease_name", "days_left", "cured", "days_elapsed")
+
+    def __init__(self, health, disease, disease_name, days_left, cured, days_elapsed):
+        self.health = health
+        self.disease = disease
+        self.disease_name = disease_name
+        self.days_left = days_left
+        self.cured = cured
+        self.days_elapsed = days_elapsed
+
+
+def current_health(user: UserRecord, now: int | None = None) -> HealthState:
+    """
+    Calcula la salud actual a partir de `salud`, `date_disease` y el catálogo:
+    se pierde `daily_health_loss` por cada día completo de enfermedad, hasta `duration_days`.
+    `disease_days_applied` indica cuántos días ya están descontados en `salud`.
+    """
+    now = int(time.time()) if now is None else now
+    stored = user.salud
+    disease_key = user.disease
+    started = iso_to_epoch(user.date_disease)
+    if not disease_key or started is None:
+        return HealthState(stored, None, disease_key, 0, False, 0)
+
+    disease = get_disease_catalog().get(disease_key)
+    duration = disease.duration_days if disease else LEGACY_DURATION_DAYS
+    daily = disease.daily_health_loss if disease else 0
+
+    days_elapsed = min(duration, max(0, (now - started) // DAY_SECONDS))
+    applied = user.disease_days_applied
+    health = max(0, stored - max(0, days_elapsed - applied) * daily)
+    cured = (now - started) >= duration * DAY_SECONDS
+    name = disease.name if disease else disease_key
+    return HealthState(health, disease, name, max(0, duration - days_elapsed), cured, days_elapsed)
+
+
+def settle_health(user: UserRecord, now: int | None = None) -> HealthState:
+    """Escribe en `user` el daño acumulado (solo en comandos que ya van a guardar)."""
+    state = current_health(user, now)
+    user.salud = state.health
+    if state.cured:
+        clear_disease(user)
+    elif state.disease_name:
+        user.disease_days_applied = state.days_elapsed
+    return state
+
+
+def clear_disease(user: UserRecord):
+    user.disease = None
+    user.date_disease = None
+    user.disease_days_applied = 0
@@ -0,0 +1,68 @@
+from utils.users import user_store, UserStore, UserRecord, TransferError
+
+
+class Escrow:
+    """
+    Apuesta retenida durante una partida (blackjack, ruleta...).
+    - `open` descuenta la apuesta una sola vez.
+    - `top_up` suma más apuesta (doblar) comprobando el saldo bajo el lock del usuario.
+    - `settle` paga una sola vez lo que corresponda (0 = pierde todo).
+    Cada paso es un único movimiento del ledger para ese usuario; el store se guarda
+    en segundo plano (el movimiento ya quedó escrito en el ledger).
+    """
+
+    __slots__ = ("store", "user_id", "reason", "amount", "settled")
+
+    def __init__(self, store: UserStore, user_id: str, reason: str):
+        self.store = store
+        self.user_id = str(user_id)
+        self.reason = reason
+        self.amount = 0
+        self.settled = False
+
+    @classmethod
+    async def open(cls, user_id, amount: int, reason: str, store: UserStore = user_store) -> "Escrow":
+        """Retiene `amount` del saldo. Lanza TransferError si no alcanza o no hay perfil."""
+        escrow = cls(store, user_id, reason)
+        await escrow.top_up(amount)
+        return escrow
+
+    async def _move(self, delta: int, tag: str) -> UserRecord:
+        user = await self.store.get(self.user_id)
+        if user is None:
+            raise TransferError("No tienes perfil. Usa /jugar para registrarte primero.")
+        await self.store.add_money(user, delta, f"{self.reason}:{tag}")
+        await self.store.save(wait=False)
+        return user
+
+    async def top_up(self, amount: int) -> UserRecord:
+        amount = int(amount)
+        if amount <= 0:
+            raise TransferError("La apuesta debe ser mayor que 0.")
+        if self.settled:
+            raise TransferError("La partida ya terminó.")
+        async with self.store.locked(self.user_id):
+            user = await self.store.get(self.user_id)
+            if user is None:
+                raise TransferError("No tienes perfil. Usa /jugar para registrarte primero.")
+            if user.dinero < amount:
+                raise TransferError(f"No tienes suficiente dinero (tienes ${user.dinero:,}).")
+            user = await self._move(-amount, "apuesta")
+            self.amount += amount
+            return user
+
+    async def settle(self, payout: int) -> UserRecord | None:
+        """Cierra la apuesta pagando `payout` (incluye la devolución de la apuesta si gana o empata)."""
+        if self.settled:
+            return None
+        self.settled = True
+        async with self.store.locked(self.user_id):
+            if payout > 0:
+                return await self._move(int(payout), "pago")
+            return await self.store.get(self.user_id)
+
+    async def refund(self) -> UserRecord | None:
+        return await self.settle(self.amount)
+
+    async def forfeit(self) -> UserRecord | None:
+        return await self.settle(0)
@@ -1,9 +1,21 @@
 # utils/ffmpeg_path.py
 import os
 import shutil
+from functools import cache
 
-_local = os.path.abspath(os.path.join(os.path.dirname(__file__), "../commands/music/ffmpeg/ffmpeg.exe"))
-FFMPEG_PATH = _local if os.path.isfile(_local) else shutil.which("ffmpeg") or "ffmpeg"
+# Se busca la primera vez que hace falta (al reproducir), no al cargar los cogs
+@cache
+def get_ffmpeg_path():
+    _local = os.path.abspath(os.path.join(os.path.dirname(__file__), "../commands/music/ffmpeg/ffmpeg.exe"))
+    path = _local if os.path.isfile(_local) else shutil.which("ffmpeg") or "ffmpeg"
 
-print(f"[ffmpeg] Path: {FFMPEG_PATH}")
-print(f"[ffmpeg] Existe: {os.path.isfile(FFMPEG_PATH)}")
\ No newline at end of file
+    print(f"[ffmpeg] Path: {path}")
+    print(f"[ffmpeg] Existe: {os.path.isfile(path)}")
+    return path
+
+
+# Compatibilidad con `from utils.ffmpeg_path import FFMPEG_PATH` (eso sí lo resuelve al importar)
+def __getattr__(name):
+    if name == "FFMPEG_PATH":
+        return get_ffmpeg_path()
+    raise AttributeError(name)
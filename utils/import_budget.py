@@ -0,0 +1,97 @@
+"""
+Presupuesto de tiempo de importación de los cogs, medido con `python -X importtime`.
+
+Importa todos los cogs en un proceso limpio, suma el tiempo acumulado de cada uno (lo que
+costaría cargarlo el primero) y falla si el total pasa del presupuesto. Pensado para correrlo
+antes de subir un cambio o en CI:
+
+    python -m utils.import_budget
+    python -m utils.import_budget --presupuesto 400 --top 15
+
+Sale con código 1 si se pasa del presupuesto o si algún cog no se puede importar (un cog roto
+no cuenta como "barato").
+"""
+import argparse
+import subprocess
+import sys
+
+from utils.cog_loader import discover
+
+# discord.py (y aiohttp) se importan antes y se informan aparte: los paga cualquier arranque.
+# El presupuesto es lo que añaden los cogs encima. Medido en torno a 50 ms ahora que yt_dlp y
+# la configuración de cookies/ffmpeg no se cargan al importar; el margen absorbe máquinas lentas.
+FRAMEWORK = ("discord", "discord.ext.commands")
+DEFAULT_BUDGET_MS = 150
+
+
+_FAILED = "import fallido:"
+
+
+def measure(modules: list[str]) -> tuple[dict[str, tuple[float, float]], dict[str, str]]:
+    """
+    (módulo -> (propio ms, acumulado ms) según -X importtime, módulo -> error).
+    Un módulo que lanza, o que no aparece en el informe, sale en los errores.
+    """
+    # `import x` literal: con importlib.import_module el propio cog no sale en el informe.
+    # Cada import va en su try para que un cog roto no tape el resto, pero el error se apunta
+    code = "import sys\n" + "\n".join(
+        f"try:\n    import {m}\n"
+        f"except BaseException as e:\n    print({_FAILED!r}, {m!r}, f'{{type(e).__name__}}: {{e}}', file=sys.stderr)"
+        for m in (*FRAMEWORK, *modules)
+    )
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=False)
+    times = {}
+    errors = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith(_FAILED):
+            name, _, error = line[len(_FAILED):].strip().partition(" ")
+            errors[name] = error
+            continue
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    if proc.returncode != 0:
+        errors.setdefault("(proceso)", f"salió con código {proc.returncode}")
+    for m in (*FRAMEWORK, *modules):
+        if m not in times and m not in errors:
+            errors[m] = "no aparece en el informe de -X importtime"
+    return times, errors
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Comprueba el presupuesto de importación de los cogs.")
+    parser.add_argument("--presupuesto", type=float, default=DEFAULT_BUDGET_MS, help="ms para todos los cogs")
+    parser.add_argument("--top", type=int, default=10, help="módulos más pesados a mostrar")
+    args = parser.parse_args(argv)
+
+    cogs = [module for module, _ in discover()]
+    times, errors = measure(cogs)
+    # Cada cog arrastra su acumulado, pero lo ya importado por otro cog antes no cuenta dos veces
+    total = sum(times.get(cog, (0.0, 0.0))[1] for cog in cogs)
+    framework = sum(times.get(name, (0.0, 0.0))[1] for name in FRAMEWORK)
+
+    print(f"discord.py: {framework:.0f} ms (fuera del presupuesto)")
+    print(f"Importar {len(cogs)} cogs: {total:.0f} ms (presupuesto {args.presupuesto:.0f} ms)")
+    print("Cogs más caros (acumulado):")
+    for cog in sorted(cogs, key=lambda c: times.get(c, (0, 0))[1], reverse=True)[:args.top]:
+        print(f"  {times.get(cog, (0, 0))[1]:8.1f} ms  {cog}")
+    print("Módulos más caros (propio):")
+    for name, (own, _) in sorted(times.items(), key=lambda kv: kv[1][0], reverse=True)[:args.top]:
+        print(f"  {own:8.1f} ms  {name}")
+
+    if errors:
+        print(f"❌ {len(errors)} módulo(s) no se pudieron importar:")
+        for name, error in errors.items():
+            print(f"  {name}: {error}")
+    if total > args.presupuesto:
+        print(f"❌ Se pasa del presupuesto por {total - args.presupuesto:.0f} ms")
+    if errors or total > args.presupuesto:
+        sys.exit(1)
+    print("✅ Dentro del presupuesto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import asyncio
+import datetime
+import heapq
+import time
+from datetime import timezone
+
+from utils.users import user_store, UserRecord
+from utils.cooldowns import iso_to_epoch
+
+# Reglas de Chambas.txt / info.txt: si no se hace /work por 3 días,
+# primero se baja el sueldo un 15% y, si sigue sin trabajar, lo despiden.
+INACTIVITY_SECONDS = 3 * 24 * 3600
+SALARY_PENALTY = 0.85
+STRIKES_TO_FIRE = 2
+BATCH_SIZE = 100
+
+
+def last_activity(user: UserRecord) -> int | None:
+    """Última fecha (epoch) que reinicia el contador: /work, contratación o la última sanción."""
+    stamps = [iso_to_epoch(v) for v in (user.date_job, user.date_hired, user.date_penalty)]
+    stamps = [s for s in stamps if s is not None]
+    return max(stamps) if stamps else None
+
+
+def next_deadline(user: UserRecord) -> int | None:
+    """Momento en que toca la siguiente sanción, o None si el usuario no tiene trabajo."""
+    if not user.job:
+        return None
+    last = last_activity(user)
+    if last is None:
+        return None
+    return last + INACTIVITY_SECONDS
+
+
+def apply_penalty(user: UserRecord, now: int) -> str:
+    """Aplica una sanción por inactividad sobre `user`. Devuelve 'despedido' o 'sueldo'."""
+    strikes = user.strikes_inactividad + 1
+    user.date_penalty = datetime.datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
+    if strikes >= STRIKES_TO_FIRE:
+        user.job = None
+        user.sueldo_factor = 1.0
+        user.strikes_inactividad = 0
+        return "despedido"
+    user.sueldo_factor = round(user.sueldo_factor * SALARY_PENALTY, 4)
+    user.strikes_inactividad = strikes
+    return "sueldo"
+
+
+class InactivityScheduler:
+    """
+    Min-heap de (deadline, user_id) con la próxima sanción de cada usuario con trabajo.
+    Solo se miran los usuarios vencidos; las entradas viejas del heap se descartan
+    comparándolas con `_deadlines` (borrado perezoso).
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[int, str]] = []
+        self._deadlines: dict[str, int] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def schedule(self, user_id: str, user: UserRecord):
+        """Recalcula el deadline del usuario (llamar después de /work o al cambiar de trabajo)."""
+        user_id = str(user_id)
+        deadline = next_deadline(user)
+        if deadline is None:
+            self._deadlines.pop(user_id, None)
+            return
+        if self._deadlines.get(user_id) == deadline:
+            return
+        self._deadlines[user_id] = deadline
+        if self._loaded:
+            heapq.heappush(self._heap, (deadline, user_id))
+
+    async def ensure_loaded(self):
+        if self._loaded:
+            return
+        for user in await user_store.records():
+            deadline = next_deadline(user)
+            if deadline is not None:
+                self._deadlines.setdefault(user.user_id, deadline)
+        self._heap = [(deadline, uid) for uid, deadline in self._deadlines.items()]
+        heapq.heapify(self._heap)
+        self._loaded = True
+
+    def _pop_due(self, now: int, limit: int) -> list[str]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < limit:
+            deadline, user_id = heapq.heappop(self._heap)
+            if self._deadlines.get(user_id) != deadline:
+                continue  # entrada obsoleta
+            del self._deadlines[user_id]
+            due.append(user_id)
+        return due
+
+    async def sweep(self, now: int | None = None, batch_size: int = BATCH_SIZE) -> list[tuple[str, str]]:
+        """
+        Procesa los usuarios vencidos en lotes: un save del store por lote.
+        Devuelve [(user_id, 'sueldo' | 'despedido'), ...].
+        """
+        now = int(time.time()) if now is None else now
+        results = []
+        async with self._lock:
+            await self.ensure_loaded()
+            while True:
+                due = self._pop_due(now, batch_size)
+                if not due:
+                    break
+
+                changed = False
+                for user_id in due:
+                    user = await user_store.get(user_id)
+                    if user is None:
+                        continue
+                    # Revalidar contra el perfil: pudo haber hecho /work mientras tanto
+                    deadline = next_deadline(user)
+                    if deadline is not None and deadline <= now:
+                        results.append((user_id, apply_penalty(user, now)))
+                        changed = True
+                    self.schedule(user_id, user)
+
+                if changed:
+                    await user_store.save()
+        return results
+
+
+# Instancia compartida por todos los cogs
+inactivity = InactivityScheduler()
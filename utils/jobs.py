@@ -0,0 +1,199 @@
+import json
+import os
+import unicodedata
+
+from utils.data import PATH_TRABAJOS
+
+# Claves de sueldo que aparecen en distintas versiones de trabajos.json
+SALARY_KEYS = ("salary", "pay", "income", "wage", "salary_per_day", "pago", "sueldo")
+
+
+class Job:
+    __slots__ = ("slug", "name", "emoji", "level", "required_experience", "salary")
+
+    def __init__(self, raw: dict):
+        self.slug = raw.get("slug") or (raw.get("name", "")).strip().lower().replace(" ", "-")
+        self.name = raw.get("name") or raw.get("display_name") or "Sin nombre"
+        self.emoji = raw.get("emoji", "")
+        self.level = raw.get("level") or raw.get("category", "")
+        try:
+            self.required_experience = int(raw.get("required_experience", raw.get("required", 0)) or 0)
+        except (ValueError, TypeError):
+            self.required_experience = 0
+        self.salary = None
+        for key in SALARY_KEYS:
+            if raw.get(key) is not None:
+                try:
+                    self.salary = int(raw.get(key))
+                    break
+                except (ValueError, TypeError):
+                    pass
+
+    @property
+    def title(self) -> str:
+        return f"{self.emoji} {self.name}" if self.emoji else self.name
+
+
+class JobCatalog:
+    """trabajos.json indexado por slug, por nombre (minúsculas) y por nivel."""
+
+    def __init__(self, jobs: list[Job], mtime: float = 0.0):
+        self.jobs = jobs
+        self.mtime = mtime
+        self._search_index: "JobSearchIndex | None" = None
+        self.by_slug = {j.slug: j for j in jobs}
+        self.by_name = {j.name.lower(): j for j in jobs}
+        self.by_level: dict[str, list[Job]] = {}
+        for j in jobs:
+            self.by_level.setdefault(j.level, []).append(j)
+
+    @classmethod
+    def from_file(cls, path: str = PATH_TRABAJOS) -> "JobCatalog":
+        if not os.path.exists(path):
+            return cls([])
+        mtime = os.path.getmtime(path)
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                raw = json.load(f)
+            except json.JSONDecodeError:
+                return cls([], mtime)
+
+        # Normalizar a lista de trabajos ({"jobs": [...]}, {slug: {...}} o [...])
+        jobs_list = []
+        if isinstance(raw, dict):
+            maybe = raw.get("jobs")
+            if isinstance(maybe, list):
+                jobs_list = maybe
+            elif isinstance(maybe, dict):
+                jobs_list = [dict(v, slug=v.get("slug") or k) for k, v in maybe.items() if isinstance(v, dict)]
+            elif all(isinstance(v, dict) for v in raw.values()):
+                jobs_list = list(raw.values())
+        elif isinstance(raw, list):
+            jobs_list = raw
+
+        return cls([Job(j) for j in jobs_list if isinstance(j, dict)], mtime)
+
+    def get(self, key) -> Job | None:
+        """Busca por slug o por nombre completo (sin importar mayúsculas)."""
+        if not key:
+            return None
+        key = str(key)
+        return self.by_slug.get(key) or self.by_name.get(key.lower()) or self.by_slug.get(key.lower())
+
+    def search(self, query: str, user_exp: int = 0, limit: int = 25) -> list[Job]:
+        """Autocompletado: ver JobSearchIndex. El índice se construye una vez por versión del catálogo."""
+        if self._search_index is None:
+            self._search_index = JobSearchIndex(self.jobs)
+        return self._search_index.search(query, user_exp, limit)
+
+
+def normalize_text(text: str) -> str:
+    """'Velador de Panteón' -> 'velador de panteon'; los '-' y '_' de los slugs cuentan como espacios."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = "".join(c if c.isalnum() else " " for c in text)
+    return " ".join(text.split())
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+_IDS = ""  # clave de cada nodo del trie con los trabajos que pasan por él (ningún carácter es "")
+
+
+class JobSearchIndex:
+    """
+    Trie de prefijos (nombre completo, slug y cada palabra) + índice de trigramas para
+    tolerar errores de escritura. Todo en memoria: responde muy por debajo de los 3s
+    que da Discord para el autocompletado.
+    """
+
+    FUZZY_MIN_SCORE = 0.3
+
+    def __init__(self, jobs: list[Job]):
+        self.jobs = jobs
+        self._trie: dict = {}
+        self._ngrams: dict[str, set[int]] = {}
+        for i, job in enumerate(jobs):
+            name = normalize_text(job.name)
+            slug = normalize_text(job.slug)
+            for text in {name, slug}:
+                self._insert(text, i)
+                for token in text.split():
+                    self._insert(token, i)
+            for gram in _trigrams(name) | _trigrams(slug):
+                self._ngrams.setdefault(gram, set()).add(i)
+
+    def _insert(self, word: str, job_id: int):
+        node = self._trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+            node.setdefault(_IDS, set()).add(job_id)
+
+    def _prefix(self, word: str) -> set[int]:
+        node = self._trie
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                return set()
+        return node.get(_IDS, set())
+
+    def _scores(self, query: str) -> dict[int, float]:
+        if not query:
+            return {i: 0.0 for i in range(len(self.jobs))}
+
+        scores: dict[int, float] = {}
+        # 1) Prefijo del nombre/slug completo o de una palabra
+        for i in self._prefix(query):
+            scores[i] = 3.0
+        # 2) Todas las palabras de la búsqueda son prefijos de alguna palabra del trabajo
+        tokens = query.split()
+        if len(tokens) > 1:
+            matched = set.intersection(*(self._prefix(t) for t in tokens))
+            for i in matched:
+                scores.setdefault(i, 2.0)
+        # 3) Coincidencia aproximada por trigramas
+        grams = _trigrams(query)
+        overlap: dict[int, int] = {}
+        for gram in grams:
+            for i in self._ngrams.get(gram, ()):
+                overlap[i] = overlap.get(i, 0) + 1
+        for i, count in overlap.items():
+            fuzzy = count / len(grams)
+            if fuzzy >= self.FUZZY_MIN_SCORE:
+                scores.setdefault(i, fuzzy)
+        return scores
+
+    def search(self, query: str, user_exp: int = 0, limit: int = 25) -> list[Job]:
+        """
+        Devuelve hasta `limit` trabajos. Primero los que el usuario puede conseguir con su XP
+        (los mejores primero), después el resto (los más cercanos primero).
+        """
+        scores = self._scores(normalize_text(query))
+
+        def rank(i: int):
+            job = self.jobs[i]
+            qualifies = job.required_experience <= user_exp
+            req_order = -job.required_experience if qualifies else job.required_experience
+            return (not qualifies, -scores[i], req_order, job.name)
+
+        return [self.jobs[i] for i in sorted(scores, key=rank)[:limit]]
+
+
+_catalog: JobCatalog | None = None
+
+def get_job_catalog(path: str = PATH_TRABAJOS) -> JobCatalog:
+    """
+    Devuelve el catálogo en memoria. Solo vuelve a leer trabajos.json
+    si cambió su fecha de modificación (un os.stat por llamada).
+    """
+    global _catalog
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = 0.0
+    if _catalog is None or _catalog.mtime != mtime:
+        _catalog = JobCatalog.from_file(path)
+    return _catalog
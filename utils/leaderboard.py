@@ -0,0 +1,95 @@
+import asyncio
+from bisect import bisect_left, insort
+
+from utils.users import user_store, UserRecord
+
+# Atributos de UserRecord que tienen ranking
+METRICS = ("dinero", "experiencia")
+
+
+class Leaderboard:
+    """
+    Índice ordenado de jugadores por dinero y experiencia.
+    Se construye una sola vez desde el store de usuarios y luego se mantiene con `update()`
+    cada vez que un comando cambia el saldo o la XP, así /top solo corta una página.
+    """
+
+    def __init__(self):
+        self._values: dict[str, dict[str, int]] = {m: {} for m in METRICS}
+        # Listas ordenadas de (-valor, user_id): el primero es el más alto
+        self._sorted: dict[str, list[tuple[int, str]]] = {m: [] for m in METRICS}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._pending: dict[str, UserRecord] = {}  # cambios recibidos mientras se carga
+
+    async def ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            records = await user_store.records()
+            for metric in METRICS:
+                values = {rec.user_id: getattr(rec, metric) for rec in records}
+                self._values[metric] = values
+                self._sorted[metric] = sorted((-v, uid) for uid, v in values.items())
+            self._loaded = True
+            pending, self._pending = self._pending, {}
+            for user_id, user in pending.items():
+                self.update(user_id, user)
+
+    def update(self, user_id: str, user: UserRecord):
+        """Actualiza la posición del usuario en O(log n) + desplazamiento de la lista."""
+        user_id = str(user_id)
+        if not self._loaded:
+            # Si el índice aún no existe, se reaplica al terminar de construirlo
+            if self._load_lock.locked():
+                self._pending[user_id] = user
+            return
+
+        for metric in METRICS:
+            new_value = getattr(user, metric)
+            values = self._values[metric]
+            ordered = self._sorted[metric]
+            old_value = values.get(user_id)
+            if old_value == new_value:
+                continue
+            if old_value is not None:
+                idx = bisect_left(ordered, (-old_value, user_id))
+                if idx < len(ordered) and ordered[idx] == (-old_value, user_id):
+                    ordered.pop(idx)
+            values[user_id] = new_value
+            insort(ordered, (-new_value, user_id))
+
+    def remove(self, user_id: str):
+        user_id = str(user_id)
+        for metric in METRICS:
+            old_value = self._values[metric].pop(user_id, None)
+            if old_value is None:
+                continue
+            ordered = self._sorted[metric]
+            idx = bisect_left(ordered, (-old_value, user_id))
+            if idx < len(ordered) and ordered[idx] == (-old_value, user_id):
+                ordered.pop(idx)
+
+    def page(self, metric: str, page: int, page_size: int) -> list[tuple[str, int]]:
+        """Devuelve [(user_id, valor), ...] de la página `page` (empezando en 0)."""
+        start = page * page_size
+        return [(uid, -neg) for neg, uid in self._sorted[metric][start:start + page_size]]
+
+    def rank(self, metric: str, user_id: str) -> int | None:
+        user_id = str(user_id)
+        value = self._values[metric].get(user_id)
+        if value is None:
+            return None
+        return bisect_left(self._sorted[metric], (-value, user_id)) + 1
+
+    def value(self, metric: str, user_id: str) -> int | None:
+        return self._values[metric].get(str(user_id))
+
+    def count(self, metric: str) -> int:
+        return len(self._sorted[metric])
+
+
+# Instancia compartida por todos los cogs
+leaderboard = Leaderboard()
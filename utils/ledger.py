@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import time
+
+from utils.data import load_data, save_data, PATH_LEDGER, PATH_LEDGER_SNAPSHOT
+
+# Cada cuántos movimientos se compacta el log en una nueva foto de saldos
+COMPACT_EVERY = 500
+
+
+class MoneyLedger:
+    """
+    Registro append-only de los movimientos de dinero: una línea JSON por movimiento
+    {"seq", "ts", "user", "delta", "reason"} en `ledger.log`.
+    Los movimientos de una misma operación (p. ej. una transferencia) llevan además
+    {"tx", "n"} y se escriben juntos; al reaplicar, una operación incompleta se descarta.
+
+    - Escribir es solo un append secuencial al final del archivo, con fsync antes de volver:
+      los appends concurrentes se juntan en un lote con un único fsync.
+    - Cada COMPACT_EVERY movimientos se guarda una foto {"seq", "balances"} y el log se vacía.
+    - Al arrancar se lee la foto y se reaplican solo los movimientos con seq mayor (la cola).
+    Los saldos del ledger mandan sobre `dinero` de data.json: si el bot se cae entre
+    un movimiento y el guardado del store, el dinero se recupera del log.
+    """
+
+    def __init__(self, path: str = PATH_LEDGER, snapshot_path: str = PATH_LEDGER_SNAPSHOT):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self._balances: dict[str, int] = {}
+        self._seq = 0
+        self._tail = 0  # movimientos escritos desde la última foto
+        self._file = None
+        self._pending: list[str] = []  # líneas esperando el próximo fsync
+        self._batch: asyncio.Future | None = None
+        self._writer: asyncio.Task | None = None
+        self._recovered = False
+        self._lock = asyncio.Lock()
+
+    # --- Arranque ---
+    def _read_tail(self, since: int) -> list[dict]:
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        groups: dict[int, list[dict]] = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # última línea a medio escribir tras una caída
+                if int(entry.get("seq", 0)) <= since:
+                    continue
+                if "tx" in entry:
+                    groups.setdefault(int(entry["tx"]), []).append(entry)
+                else:
+                    entries.append(entry)
+        for group in groups.values():
+            if len(group) == int(group[0].get("n", 1)):
+                entries.extend(group)
+        entries.sort(key=lambda e: int(e["seq"]))
+        return entries
+
+    async def recover(self, current: dict[str, int]) -> dict[str, int]:
+        """
+        Reconstruye los saldos: foto + cola del log. `current` son los saldos de data.json,
+        usados solo la primera vez (cuando todavía no existe ninguna foto).
+        Devuelve {user_id: saldo} para que el store los aplique.
+        """
+        async with self._lock:
+            if self._recovered:
+                return dict(self._balances)
+
+            if os.path.exists(self.snapshot_path):
+                snapshot = await load_data(self.snapshot_path)
+                self._seq = int(snapshot.get("seq", 0))
+                self._balances = {str(k): int(v) for k, v in snapshot.get("balances", {}).items()}
+            else:
+                self._balances = {str(k): int(v) for k, v in current.items()}
+
+            tail = await asyncio.to_thread(self._read_tail, self._seq)
+            for entry in tail:
+                user_id = str(entry["user"])
+                self._balances[user_id] = self._balances.get(user_id, 0) + int(entry["delta"])
+                self._seq = max(self._seq, int(entry["seq"]))
+            self._tail = len(tail)
+            self._recovered = True
+
+            if not os.path.exists(self.snapshot_path):
+                await self._compact()
+            return dict(self._balances)
+
+    # --- Escritura ---
+    def _append_sync(self, data: str):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    async def append(self, user_id: str, delta: int, reason: str, balance: int):
+        """Registra un movimiento ya aplicado (`balance` es el saldo resultante)."""
+        await self.append_many([(user_id, delta, reason, balance)])
+
+    async def append_many(self, moves: list[tuple[str, int, str, int]]):
+        """
+        Registra varios movimientos (user_id, delta, reason, saldo) de una sola operación
+        con una única escritura; al reaplicar se aplican todos o ninguno.
+        """
+        async with self._lock:
+            now = int(time.time())
+            tx = self._seq + 1
+            lines = []
+            for user_id, delta, reason, _ in moves:
+                self._seq += 1
+                entry = {"seq": self._seq, "ts": now, "user": str(user_id), "delta": int(delta), "reason": reason}
+                if len(moves) > 1:
+                    entry["tx"] = tx
+                    entry["n"] = len(moves)
+                lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._pending.append("".join(lines))
+            for user_id, _, _, balance in moves:
+                self._balances[str(user_id)] = int(balance)
+            self._tail += len(moves)
+            if self._batch is None:
+                self._batch = asyncio.get_running_loop().create_future()
+                self._writer = asyncio.create_task(self._write_batch())
+            batch = self._batch
+        # Se vuelve cuando el lote con estas líneas está en disco (fsync)
+        await batch
+
+    async def _write_batch(self):
+        """
+        Escribe de una vez (un solo fsync) todo lo que se apuntó mientras tanto: los appends
+        que esperaban el lock durante el fsync anterior entran juntos en el siguiente lote.
+        """
+        await asyncio.sleep(0)
+        async with self._lock:
+            data, self._pending = "".join(self._pending), []
+            batch, self._batch = self._batch, None
+            try:
+                await asyncio.to_thread(self._append_sync, data)
+                if self._tail >= COMPACT_EVERY:
+                    await self._compact()
+            except Exception as e:
+                batch.set_exception(e)
+                return
+        batch.set_result(None)
+
+    async def _compact(self):
+        """Guarda la foto de saldos y vacía el log (llamar con `_lock` tomado)."""
+        await save_data({"seq": self._seq, "balances": self._balances}, self.snapshot_path)
+
+        def _truncate():
+            if self._file is not None:
+                self._file.close()
+            # Si se cae justo antes de esto, la cola se descarta al arrancar por `seq`
+            self._file = open(self.path, "w", encoding="utf-8")
+
+        await asyncio.to_thread(_truncate)
+        self._tail = 0
+
+    async def compact(self):
+        async with self._lock:
+            await self._compact()
+
+    def balance(self, user_id: str) -> int | None:
+        return self._balances.get(str(user_id))
+
+
+# Instancia compartida por todos los cogs
+money_ledger = MoneyLedger()
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import discord
+
+
+class LiveMessage:
+    """
+    Un mensaje de juego que se edita como mucho una vez cada `interval` segundos.
+
+    - `request()` marca que algo cambió; varios cambios seguidos se juntan en una sola edición.
+    - `flush()` edita ya (fin de ronda, resultados).
+    - `build()` devuelve los argumentos del mensaje ({"embed": ..., "content": ..., "view": ...}).
+    - El bucle de ediciones se para cuando `active()` devuelve False.
+    - Sin `send` solo se edita: el mensaje lo pone quien lo creó (p. ej. original_response()).
+    """
+
+    def __init__(self, build: Callable[[], dict[str, Any]], interval: float,
+                 active: Callable[[], bool] = lambda: True,
+                 send: Callable[..., Awaitable[discord.Message]] | None = None):
+        self.build = build
+        self.interval = interval
+        self.active = active
+        self.send = send
+        self.message: discord.Message | None = None
+        self.edits = 0
+        self._dirty = False
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def request(self):
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self):
+        while self._dirty and self.active():
+            async with self._lock:
+                if self._dirty:
+                    await self._render()
+            await asyncio.sleep(self.interval)
+
+    async def flush(self):
+        async with self._lock:
+            await self._render()
+
+    async def _render(self):
+        self._dirty = False
+        try:
+            if self.message is None:
+                if self.send is not None:
+                    self.message = await self.send(**self.build())
+                return
+            await self.message.edit(**self.build())
+            self.edits += 1
+        except discord.HTTPException:
+            pass
@@ -0,0 +1,102 @@
+import asyncio
+import time
+import traceback
+from typing import Awaitable, Callable
+
+import discord
+
+# Un solo listener de on_message (registrado en bot.py) que reparte cada mensaje solo a los
+# handlers que han pedido su canal. Así un mensaje normal cuesta un lookup en un dict en vez de
+# despertar a cada cog (y alguno consultando SQLite) para descartarlo.
+Handler = Callable[[discord.Message], Awaitable[None]]
+
+
+class HandlerStats:
+    __slots__ = ("dispatched", "errors", "total", "max")
+
+    def __init__(self):
+        self.dispatched = 0
+        self.errors = 0
+        self.total = 0.0  # segundos acumulados
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.dispatched if self.dispatched else 0.0
+
+
+class MessageRouter:
+    def __init__(self):
+        self._handlers: dict[str, Handler] = {}
+        self._channels: dict[int, set[str]] = {}  # channel_id -> nombres de handlers
+        self.stats: dict[str, HandlerStats] = {}
+        self.seen = 0
+        self.routed = 0
+
+    def register(self, name: str, handler: Handler, channels=()):
+        """Registra (o reemplaza) un handler con nombre y, opcionalmente, sus canales iniciales."""
+        self._handlers[name] = handler
+        self.stats.setdefault(name, HandlerStats())
+        for channel_id in channels:
+            self.watch(name, channel_id)
+
+    def unregister(self, name: str):
+        self._handlers.pop(name, None)
+        for channel_id in list(self._channels):
+            self.unwatch(name, channel_id)
+
+    def watch(self, name: str, channel_id: int):
+        self._channels.setdefault(channel_id, set()).add(name)
+
+    def unwatch(self, name: str, channel_id: int):
+        names = self._channels.get(channel_id)
+        if names is None:
+            return
+        names.discard(name)
+        if not names:
+            del self._channels[channel_id]
+
+    def channels(self, name: str) -> set[int]:
+        return {channel_id for channel_id, names in self._channels.items() if name in names}
+
+    async def dispatch(self, message: discord.Message):
+        self.seen += 1
+        if message.author.bot:
+            return
+        names = self._channels.get(message.channel.id)
+        if not names:
+            return
+        self.routed += 1
+        # Cada handler en su propia tarea, como hace discord.py con los listeners: uno lento
+        # (p. ej. alianzas esperando para borrar) no retrasa a los demás
+        for name in tuple(names):
+            handler = self._handlers.get(name)
+            if handler is not None:
+                asyncio.create_task(self._run(name, handler, message))
+
+    async def _run(self, name: str, handler: Handler, message: discord.Message):
+        stats = self.stats.setdefault(name, HandlerStats())
+        start = time.perf_counter()
+        try:
+            await handler(message)
+        except Exception:
+            stats.errors += 1
+            print(f"❌ Error en el handler de mensajes '{name}':")
+            traceback.print_exc()
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.dispatched += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+
+    def report(self) -> list[str]:
+        lines = [f"Mensajes vistos: {self.seen:,} — enrutados: {self.routed:,}"]
+        for name, stats in sorted(self.stats.items()):
+            lines.append(f"{name}: {stats.dispatched:,} llamadas, {stats.errors} errores, "
+                         f"{len(self.channels(name))} canales, media {stats.mean * 1000:.1f} ms, "
+                         f"máx {stats.max * 1000:.1f} ms")
+        return lines
+
+
+# Instancia compartida por todos los cogs
+message_router = MessageRouter()
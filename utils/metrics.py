@@ -0,0 +1,173 @@
+"""
+Métricas de los comandos de barra, en formato de texto de Prometheus (GET /metrics del webserver).
+
+El árbol de comandos del bot es un InstrumentedTree (ver bot.py): por cada interacción mide
+desde que llega hasta la primera respuesta (send_message, defer, edit_message, modal...),
+si esa respuesta fue diferida o directa, y si el comando falló.
+
+discord.py no tiene un punto público para saber cuándo se respondió, así que esto se apoya en
+internos: CommandTree._call, el slot Interaction._cs_response (de donde sale
+interaction.response) y el slot InteractionResponse._response_type. Por eso discord.py está
+fijado en requirements.txt y _check_internals() para el arranque si alguno desaparece.
+"""
+import inspect
+import time
+
+import discord
+from discord import Interaction, InteractionResponse, InteractionResponseType, InteractionType, app_commands
+
+TESTED_DISCORD_VERSION = "2.6.3"  # la fijada en requirements.txt
+
+# Segundos. Discord da 3 s para la primera respuesta, así que interesa el detalle por debajo
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0)
+DEFERRED = frozenset({InteractionResponseType.deferred_channel_message, InteractionResponseType.deferred_message_update})
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)  # no acumulados; se acumulan al exportar
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class CommandMetrics:
+    __slots__ = ("latency", "errors", "responses")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.responses = {"direct": 0, "deferred": 0, "none": 0}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.commands: dict[tuple[str, str], CommandMetrics] = {}  # (comando, tipo) -> métricas
+        self.started = time.time()
+
+    def observe(self, command: str, kind: str, latency: float, response: str, failed: bool):
+        metrics = self.commands.get((command, kind))
+        if metrics is None:
+            metrics = self.commands[(command, kind)] = CommandMetrics()
+        metrics.latency.observe(latency)
+        metrics.responses[response] += 1
+        if failed:
+            metrics.errors += 1
+
+    def render(self) -> str:
+        """Texto para Prometheus (se llama desde otro hilo/tarea: se copia antes de recorrer)."""
+        items = sorted(self.commands.items())
+        lines = [
+            "# HELP bot_uptime_seconds Segundos desde que arrancó el bot.",
+            "# TYPE bot_uptime_seconds gauge",
+            f"bot_uptime_seconds {time.time() - self.started:.0f}",
+            "# HELP bot_command_first_response_seconds Desde que llega la interacción hasta la primera respuesta.",
+            "# TYPE bot_command_first_response_seconds histogram",
+        ]
+        for (command, kind), metrics in items:
+            labels = f'command="{_escape(command)}",type="{kind}"'
+            hist = metrics.latency
+            cumulative = 0
+            for bound, count in zip(BUCKETS, hist.counts):
+                cumulative += count
+                lines.append(f'bot_command_first_response_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'bot_command_first_response_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"bot_command_first_response_seconds_sum{{{labels}}} {hist.sum:.6f}")
+            lines.append(f"bot_command_first_response_seconds_count{{{labels}}} {hist.count}")
+
+        lines += ["# HELP bot_command_errors_total Interacciones que terminaron en error.",
+                  "# TYPE bot_command_errors_total counter"]
+        for (command, kind), metrics in items:
+            lines.append(f'bot_command_errors_total{{command="{_escape(command)}",type="{kind}"}} {metrics.errors}')
+
+        lines += ["# HELP bot_command_responses_total Primera respuesta por tipo (directa, diferida o ninguna).",
+                  "# TYPE bot_command_responses_total counter"]
+        for (command, kind), metrics in items:
+            for response, count in metrics.responses.items():
+                lines.append(f'bot_command_responses_total{{command="{_escape(command)}",type="{kind}",'
+                             f'response="{response}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Instancia compartida por todos los cogs
+metrics = MetricsRegistry()
+
+def _check_internals():
+    """Falla al importar (y por tanto al arrancar el bot) si discord.py cambió los internos que se usan."""
+    missing = []
+    if not inspect.iscoroutinefunction(getattr(app_commands.CommandTree, "_call", None)):
+        missing.append("CommandTree._call (corrutina)")
+    if "_cs_response" not in getattr(Interaction, "__slots__", ()):
+        missing.append("Interaction._cs_response (slot)")
+    if not inspect.ismemberdescriptor(InteractionResponse.__dict__.get("_response_type")):
+        missing.append("InteractionResponse._response_type (slot)")
+    if missing:
+        raise RuntimeError(
+            f"utils/metrics.py depende de internos de discord.py que no están en la versión "
+            f"{discord.__version__} (probada: {TESTED_DISCORD_VERSION}): {', '.join(missing)}. "
+            f"Instala discord.py=={TESTED_DISCORD_VERSION} o adapta InstrumentedTree."
+        )
+    if discord.__version__ != TESTED_DISCORD_VERSION:
+        print(f"⚠️ utils/metrics.py: discord.py {discord.__version__} no es la versión probada "
+              f"({TESTED_DISCORD_VERSION}); los internos existen, pero revisa /metrics.")
+
+
+_check_internals()
+_RESPONSE_TYPE = InteractionResponse.__dict__["_response_type"]
+
+
+class _TimedResponse(InteractionResponse):
+    """InteractionResponse que apunta cuándo se respondió por primera vez (todas las formas de
+    responder acaban asignando _response_type)."""
+    __slots__ = ("first_response",)
+
+    def __init__(self, parent: Interaction):
+        self.first_response: float | None = None
+        super().__init__(parent)
+
+    @property
+    def _response_type(self):
+        return _RESPONSE_TYPE.__get__(self)
+
+    @_response_type.setter
+    def _response_type(self, value):
+        if value is not None and self.first_response is None:
+            self.first_response = time.perf_counter()
+        _RESPONSE_TYPE.__set__(self, value)
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    """CommandTree que registra latencia, tipo de respuesta y errores de cada interacción."""
+
+    async def _call(self, interaction: Interaction):
+        start = time.perf_counter()
+        response = interaction._cs_response = _TimedResponse(interaction)
+        failed = True
+        try:
+            await super()._call(interaction)
+            failed = interaction.command_failed
+        finally:
+            end = response.first_response or time.perf_counter()
+            if response.type is None:
+                kind = "none"
+            elif response.type in DEFERRED:
+                kind = "deferred"
+            else:
+                kind = "direct"
+            command = interaction.command
+            name = command.qualified_name if command is not None else "desconocido"
+            interaction_type = "autocomplete" if interaction.type is InteractionType.autocomplete else "command"
+            metrics.observe(name, interaction_type, end - start, kind, failed)
@@ -0,0 +1,64 @@
+# Reglas de la ruleta europea (0-36) compartidas por /ruleta y el simulador (utils/casino_sim.py)
+POCKETS = 37
+REDS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+BLACKS = frozenset(range(1, POCKETS)) - REDS
+
+# Apuestas con nombre -> números que cubren
+BETS: dict[str, frozenset[int]] = {
+    "rojo": REDS,
+    "negro": BLACKS,
+    "par": frozenset(n for n in range(1, POCKETS) if n % 2 == 0),
+    "impar": frozenset(n for n in range(1, POCKETS) if n % 2 == 1),
+    "bajo": frozenset(range(1, 19)),
+    "alto": frozenset(range(19, POCKETS)),
+    "docena1": frozenset(range(1, 13)),
+    "docena2": frozenset(range(13, 25)),
+    "docena3": frozenset(range(25, POCKETS)),
+    "columna1": frozenset(range(1, POCKETS, 3)),
+    "columna2": frozenset(range(2, POCKETS, 3)),
+    "columna3": frozenset(range(3, POCKETS, 3)),
+}
+# Un número suelto ("0", "17") también es una apuesta (pleno)
+BETS.update({str(n): frozenset({n}) for n in range(POCKETS)})
+
+ALIASES = {
+    "r": "rojo", "red": "rojo",
+    "n": "negro", "black": "negro", "blk": "negro",
+    "zero": "0", "cero": "0",
+    "even": "par", "odd": "impar",
+    "1-18": "bajo", "19-36": "alto",
+    "1-12": "docena1", "13-24": "docena2", "25-36": "docena3",
+    "d1": "docena1", "d2": "docena2", "d3": "docena3",
+    "c1": "columna1", "c2": "columna2", "c3": "columna3",
+}
+
+# Lo que se devuelve por unidad apostada al ganar (incluye la apuesta): 36 / números cubiertos.
+# Pleno 35:1 -> 36, docena/columna 2:1 -> 3, colores/par/impar/alto/bajo 1:1 -> 2
+PAYOUTS = {bet: 36 // len(numbers) for bet, numbers in BETS.items()}
+
+
+def parse_bet(text: str) -> str | None:
+    """Normaliza lo que escribe el usuario ('Rojo', 'cero', '1-12', '17'...) o None si no es válido."""
+    key = str(text).strip().lower().replace(" ", "")
+    key = ALIASES.get(key, key)
+    return key if key in BETS else None
+
+
+def color(number: int) -> str:
+    if number == 0:
+        return "0"  # verde/zero
+    return "rojo" if number in REDS else "negro"
+
+
+def wins(choice: str, number: int) -> bool:
+    return number in BETS[choice]
+
+
+def payout(choice: str, number: int) -> int:
+    """Multiplicador sobre la apuesta (0 si pierde)."""
+    return PAYOUTS[choice] if wins(choice, number) else 0
+
+
+def payout_table(choice: str) -> list[int]:
+    """Multiplicador para cada número 0..36 (para simular sin ramas)."""
+    return [payout(choice, n) for n in range(POCKETS)]
@@ -0,0 +1,215 @@
+"""
+Formato binario compacto para el store de usuarios (data.bin).
+
+    cabecera   <4sHHII : magic "CHMB", versión, nº de columnas, nº de usuarios, nº de textos
+    columnas   una por campo, en el orden de COLUMNS, little-endian y alineadas a 8 bytes
+    textos     offsets uint32 (nº textos + 1) y después los textos UTF-8 seguidos
+
+Los campos de texto (user_id, job, fechas...) se guardan como índice a la tabla de textos
+(-1 = None); los repetidos como el nombre del trabajo se guardan una sola vez.
+`cooldowns` y las claves desconocidas van juntas como JSON en la columna `rest`.
+
+Conversión para inspeccionar o editar a mano:
+    python -m utils.snapshot to-json   [data.bin] [data.json]
+    python -m utils.snapshot from-json [data.json] [data.bin]
+
+El dinero NO se corrige así: al cargar, el ledger (utils/ledger.py) reaplica los saldos y
+manda sobre `dinero` del archivo. Una edición a mano del dinero se pierde (se avisa por
+consola); para cambiar un saldo hay que pasar por user_store.add_money.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"CHMB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+ALIGN = 8
+
+# (atributo de UserRecord, typecode de array); "i" en columnas de texto = índice a la tabla
+COLUMNS = (
+    ("user_id", "i"),
+    ("dinero", "q"),
+    ("experiencia", "q"),
+    ("salud", "i"),
+    ("disease_days_applied", "i"),
+    ("strikes_inactividad", "i"),
+    ("sueldo_factor", "d"),
+    ("job", "i"),
+    ("date_job", "i"),
+    ("disease", "i"),
+    ("date_disease", "i"),
+    ("date_hired", "i"),
+    ("date_penalty", "i"),
+    ("rest", "i"),
+)
+STRING_COLUMNS = {"user_id", "job", "date_job", "disease", "date_disease", "date_hired", "date_penalty", "rest"}
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _padding(size: int) -> int:
+    return -size % ALIGN
+
+
+def _to_le(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def encode_snapshot(records) -> bytes:
+    """Serializa una lista de UserRecord."""
+    records = list(records)
+    strings: dict[str, int] = {}
+
+    def text_id(value) -> int:
+        if value is None:
+            return -1
+        value = str(value)
+        idx = strings.get(value)
+        if idx is None:
+            idx = strings[value] = len(strings)
+        return idx
+
+    columns = {name: array(code) for name, code in COLUMNS}
+    for rec in records:
+        rest = dict(rec.extra or {})
+        if rec.cooldowns:
+            rest["cooldowns"] = rec.cooldowns
+        for name, _ in COLUMNS:
+            if name == "rest":
+                value = text_id(json.dumps(rest, ensure_ascii=False, separators=(",", ":")) if rest else None)
+            elif name in STRING_COLUMNS:
+                value = text_id(getattr(rec, name))
+            else:
+                value = getattr(rec, name)
+            columns[name].append(value)
+
+    parts = [HEADER.pack(MAGIC, VERSION, len(COLUMNS), len(records), len(strings))]
+    size = HEADER.size
+    for name, _ in COLUMNS:
+        chunk = _to_le(columns[name])
+        parts += [chunk, b"\0" * _padding(len(chunk))]
+        size += len(chunk) + _padding(len(chunk))
+
+    blobs = [s.encode("utf-8") for s in strings]  # dict conserva el orden de inserción
+    offsets = array("I", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    chunk = _to_le(offsets)
+    parts += [chunk, b"\0" * _padding(len(chunk))]
+    parts += blobs
+    return b"".join(parts)
+
+
+def decode_snapshot(buf, factory) -> list:
+    """
+    Lee un snapshot desde un buffer (bytes o mmap) sin copiar las columnas.
+    `factory(user_id)` crea un UserRecord vacío que se rellena con las columnas.
+    """
+    view = memoryview(buf)
+    views = []
+    try:
+        if len(view) < HEADER.size:
+            raise SnapshotError("archivo demasiado corto")
+        magic, version, ncols, count, nstrings = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise SnapshotError("no es un snapshot de usuarios")
+        if version != VERSION or ncols != len(COLUMNS):
+            raise SnapshotError(f"versión no soportada: {version} ({ncols} columnas)")
+
+        def column(offset: int, code: str, length: int):
+            size = length * struct.calcsize(code)
+            if offset + size > len(view):
+                raise SnapshotError("archivo truncado")
+            col = view[offset:offset + size].cast(code)
+            views.append(col)
+            if sys.byteorder != "little":
+                col = array(code, col)
+                col.byteswap()
+            return col, offset + size + _padding(size)
+
+        offset = HEADER.size
+        columns = {}
+        for name, code in COLUMNS:
+            columns[name], offset = column(offset, code, count)
+        offsets, offset = column(offset, "I", nstrings + 1)
+        blob = view[offset:]
+        views.append(blob)
+        strings = [str(blob[offsets[i]:offsets[i + 1]], "utf-8") for i in range(nstrings)]
+
+        records = []
+        for row in range(count):
+            rec = factory(strings[columns["user_id"][row]])
+            for name, _ in COLUMNS:
+                if name == "user_id":
+                    continue
+                value = columns[name][row]
+                if name in STRING_COLUMNS:
+                    value = strings[value] if value >= 0 else None
+                if name == "rest":
+                    rest = json.loads(value) if value else {}
+                    rec.cooldowns = rest.pop("cooldowns", None) or None
+                    rec.extra = rest or None
+                else:
+                    setattr(rec, name, value)
+            records.append(rec)
+        return records
+    finally:
+        # Liberar las vistas para poder cerrar el mmap
+        for v in reversed(views):
+            v.release()
+        view.release()
+
+
+def read_snapshot(path: str, factory) -> list:
+    """Abre `path` con mmap y decodifica todos los usuarios."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return decode_snapshot(mm, factory)
+
+
+def is_fresh(snapshot_path: str, json_path: str) -> bool:
+    """El snapshot se usa si existe y no es más viejo que el JSON (que pudo editarse a mano)."""
+    if not os.path.exists(snapshot_path):
+        return False
+    if not os.path.exists(json_path):
+        return True
+    return os.path.getmtime(snapshot_path) >= os.path.getmtime(json_path)
+
+
+def _main(argv: list[str]):
+    from utils.data import PATH_USERS, PATH_USERS_BIN
+    from utils.users import UserRecord
+
+    if not argv or argv[0] not in ("to-json", "from-json"):
+        print(__doc__)
+        return
+    if argv[0] == "to-json":
+        src = argv[1] if len(argv) > 1 else PATH_USERS_BIN
+        dst = argv[2] if len(argv) > 2 else PATH_USERS
+        records = read_snapshot(src, UserRecord)
+        with open(dst, "w", encoding="utf-8") as f:
+            json.dump({r.user_id: r.to_dict() for r in records}, f, ensure_ascii=False, indent=2)
+    else:
+        src = argv[1] if len(argv) > 1 else PATH_USERS
+        dst = argv[2] if len(argv) > 2 else PATH_USERS_BIN
+        with open(src, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        records = [UserRecord.from_dict(uid, u) for uid, u in raw.items() if isinstance(u, dict)]
+        with open(dst, "wb") as f:
+            f.write(encode_snapshot(records))
+    print(f"{src} -> {dst} ({len(records)} usuarios, {os.path.getsize(src)} -> {os.path.getsize(dst)} bytes)")
+
+
+if __name__ == "__main__":
+    _main(sys.argv[1:])
@@ -0,0 +1,37 @@
+import hashlib
+import json
+
+import discord
+from discord.ext import commands
+
+from database.meta_repo import get_meta, set_meta
+
+# on_ready se dispara también en cada reconexión al gateway: en vez de sincronizar siempre,
+# se calcula un hash estable de lo que se mandaría a Discord y solo se sincroniza si cambia.
+
+
+def _meta_key(guild: discord.abc.Snowflake | None) -> str:
+    return f"tree_hash:{guild.id if guild else 'global'}"
+
+
+def tree_hash(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake | None = None) -> str:
+    """SHA-256 del payload de comandos (el mismo que usa tree.sync), ordenado para que sea estable."""
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+                     key=lambda command: (command.get("type", 1), command["name"]))
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+async def sync_tree(bot: commands.Bot, guild: discord.abc.Snowflake | None = None):
+    """Sincroniza siempre (p. ej. !sync) y guarda el hash de lo sincronizado."""
+    synced = await bot.tree.sync(guild=guild)
+    set_meta(_meta_key(guild), tree_hash(bot.tree, guild))
+    return synced
+
+
+async def sync_if_changed(bot: commands.Bot, guild: discord.abc.Snowflake | None = None) -> bool:
+    """Sincroniza solo si los comandos cambiaron desde la última vez. Devuelve si sincronizó."""
+    if get_meta(_meta_key(guild)) == tree_hash(bot.tree, guild):
+        return False
+    await sync_tree(bot, guild)
+    return True
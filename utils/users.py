@@ -0,0 +1,399 @@
+import asyncio
+import contextlib
+
+from utils.data import load_data, save_bytes, PATH_USERS, PATH_USERS_BIN, GroupCommitter
+from utils.ledger import money_ledger
+from utils.snapshot import encode_snapshot, read_snapshot, is_fresh
+
+# Claves antiguas de data.json -> clave canónica
+LEGACY_KEYS = {
+    "money": "dinero",
+    "exp": "experiencia",
+    "health": "salud",
+    "trabajo": "job",
+    "enfermedad": "disease",
+}
+
+
+def _to_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _to_float(value, default: float) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _raw_money(raw: dict) -> int:
+    value = raw.get("dinero")
+    if value is None:
+        value = raw.get("money")
+    return _to_int(value or 0, 0)
+
+
+class UserRecord:
+    """
+    Perfil de un jugador con un único esquema.
+    Los campos base siempre se guardan (igual que /jugar); los opcionales solo si tienen valor.
+    Las claves desconocidas se conservan en `extra` para no perder datos.
+    """
+
+    __slots__ = (
+        "user_id", "dinero", "experiencia", "salud", "job", "date_job",
+        "disease", "date_disease", "disease_days_applied",
+        "date_hired", "date_penalty", "sueldo_factor", "strikes_inactividad",
+        "cooldowns", "extra",
+    )
+
+    BASE_FIELDS = ("dinero", "experiencia", "date_job", "job", "salud", "date_disease", "disease")
+
+    def __init__(self, user_id: str):
+        self.user_id = str(user_id)
+        self.dinero = 0
+        self.experiencia = 0
+        self.salud = 100
+        self.job = None
+        self.date_job = None
+        self.disease = None
+        self.date_disease = None
+        self.disease_days_applied = 0
+        self.date_hired = None
+        self.date_penalty = None
+        self.sueldo_factor = 1.0
+        self.strikes_inactividad = 0
+        self.cooldowns = None
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, user_id: str, raw: dict) -> "UserRecord":
+        """Crea el registro desde data.json, migrando las claves antiguas (la clave nueva gana si tiene valor)."""
+        record = cls(user_id)
+        values = {k: v for k, v in raw.items() if k not in LEGACY_KEYS}
+        for legacy, canonical in LEGACY_KEYS.items():
+            if values.get(canonical) is None and raw.get(legacy) is not None:
+                values[canonical] = raw[legacy]
+
+        record.dinero = _to_int(values.pop("dinero", 0) or 0, 0)
+        record.experiencia = _to_int(values.pop("experiencia", 0) or 0, 0)
+        record.salud = _to_int(values.pop("salud", 100), 100)
+        record.job = values.pop("job", None) or None
+        record.date_job = values.pop("date_job", None)
+        record.disease = values.pop("disease", None) or None
+        record.date_disease = values.pop("date_disease", None)
+        record.disease_days_applied = _to_int(values.pop("disease_days_applied", 0) or 0, 0)
+        record.date_hired = values.pop("date_hired", None)
+        record.date_penalty = values.pop("date_penalty", None)
+        record.sueldo_factor = _to_float(values.pop("sueldo_factor", 1.0) or 1.0, 1.0)
+        record.strikes_inactividad = _to_int(values.pop("strikes_inactividad", 0) or 0, 0)
+        record.cooldowns = values.pop("cooldowns", None) or None
+        record.extra = values or None
+        return record
+
+    def to_dict(self) -> dict:
+        data = {field: getattr(self, field) for field in self.BASE_FIELDS}
+        if self.disease_days_applied:
+            data["disease_days_applied"] = self.disease_days_applied
+        if self.date_hired:
+            data["date_hired"] = self.date_hired
+        if self.date_penalty:
+            data["date_penalty"] = self.date_penalty
+        if self.sueldo_factor != 1.0:
+            data["sueldo_factor"] = self.sueldo_factor
+        if self.strikes_inactividad:
+            data["strikes_inactividad"] = self.strikes_inactividad
+        if self.cooldowns:
+            data["cooldowns"] = self.cooldowns
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+class TransferError(Exception):
+    """Transferencia rechazada (saldo insuficiente, usuario sin perfil...)."""
+
+
+class UserStore:
+    """
+    data.json en memoria. Se lee una sola vez; cada usuario se convierte a UserRecord
+    (y se migra desde las claves antiguas) la primera vez que se pide.
+    Con `snapshot_path` se guarda en el formato binario de utils/snapshot.py y al arrancar
+    se lee ese archivo, salvo que data.json sea más nuevo (editado a mano o convertido).
+    Como todo corre en el mismo event loop, leer-modificar-guardar ya no pierde cambios
+    entre comandos concurrentes.
+    El dinero se modifica con `add_money`, que además lo anota en el ledger (utils/ledger.py).
+    Al cargar, el ledger manda sobre el dinero del archivo: editarlo a mano no sirve (se avisa).
+    Las operaciones que tocan a varios usuarios y esperan (await) en medio toman los locks
+    por usuario con `locked()`, siempre en el mismo orden para no bloquearse entre sí.
+    """
+
+    def __init__(self, path: str = PATH_USERS, snapshot_path: str | None = None):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self._raw: dict[str, dict] | None = None
+        self._records: dict[str, UserRecord] = {}
+        self._load_lock = asyncio.Lock()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.ledger = money_ledger if path == PATH_USERS else None
+        if snapshot_path:
+            self._committer = GroupCommitter(snapshot_path, writer=save_bytes)
+        else:
+            self._committer = GroupCommitter(path)
+
+    async def load(self):
+        if self._raw is not None:
+            return
+        async with self._load_lock:
+            if self._raw is not None:
+                return
+            raw = {}
+            records = {}
+            if self.snapshot_path and is_fresh(self.snapshot_path, self.path):
+                decoded = await asyncio.to_thread(read_snapshot, self.snapshot_path, UserRecord)
+                records = {rec.user_id: rec for rec in decoded}
+            else:
+                data = await load_data(self.path)
+                # Los dicts vacíos son la estructura por defecto de load_data ("xp", "jobs"), no usuarios
+                raw = {str(k): v for k, v in data.items() if isinstance(v, dict) and v}
+
+            if self.ledger is not None:
+                # El ledger manda sobre el dinero guardado (foto + cola del log)
+                current = {uid: _raw_money(u) for uid, u in raw.items()}
+                current.update({uid: rec.dinero for uid, rec in records.items()})
+                balances = await self.ledger.recover(current)
+                changed = [uid for uid, money in current.items() if uid in balances and balances[uid] != money]
+                if changed:
+                    # Normal tras un cierre brusco (el ledger va por delante del archivo); también
+                    # es lo que pasa si alguien editó el dinero a mano: esa edición se pierde
+                    sample = ", ".join(f"{uid}: {current[uid]} -> {balances[uid]}" for uid in changed[:5])
+                    print(f"⚠️ {len(changed)} saldo(s) guardados no coinciden con el ledger; "
+                          f"se usa el del ledger ({sample}{', ...' if len(changed) > 5 else ''}). "
+                          f"Para corregir dinero a mano usa add_money, no el archivo.")
+                for user_id, balance in balances.items():
+                    if user_id in records:
+                        records[user_id].dinero = balance
+                    elif user_id in raw:
+                        raw[user_id].pop("money", None)
+                        raw[user_id]["dinero"] = balance
+            self._records = records
+            self._raw = raw
+
+    def _record(self, user_id: str) -> UserRecord | None:
+        record = self._records.get(user_id)
+        if record is not None:
+            return record
+        raw = self._raw.get(user_id)
+        if raw is None:
+            return None
+        record = UserRecord.from_dict(user_id, raw)
+        self._records[user_id] = record
+        # El registro ya es la fuente de verdad; el dict crudo se libera
+        del self._raw[user_id]
+        return record
+
+    async def get(self, user_id) -> UserRecord | None:
+        await self.load()
+        return self._record(str(user_id))
+
+    async def create(self, user_id) -> UserRecord:
+        await self.load()
+        user_id = str(user_id)
+        record = self._record(user_id)
+        if record is None:
+            record = self._records[user_id] = UserRecord(user_id)
+        return record
+
+    async def add_money(self, user: UserRecord, delta: int, reason: str) -> int:
+        """Suma `delta` (puede ser negativo) al dinero del usuario y lo anota en el ledger."""
+        user.dinero += int(delta)
+        if self.ledger is not None and delta:
+            await self.ledger.append(user.user_id, delta, reason, user.dinero)
+        return user.dinero
+
+    @contextlib.asynccontextmanager
+    async def locked(self, *user_ids):
+        """Toma el lock de cada usuario en orden de user_id (orden canónico: sin deadlocks)."""
+        acquired = []
+        try:
+            for user_id in sorted({str(u) for u in user_ids}):
+                lock = self._locks.get(user_id)
+                if lock is None:
+                    lock = self._locks[user_id] = asyncio.Lock()
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    async def transfer(self, sender_id, receiver_id, amount: int, reason: str = "transfer") -> tuple[UserRecord, UserRecord]:
+        """
+        Pasa `amount` de un usuario a otro. Los dos saldos se anotan juntos en el ledger
+        y se guardan en una sola escritura del store.
+        """
+        amount = int(amount)
+        sender_id, receiver_id = str(sender_id), str(receiver_id)
+        if amount <= 0:
+            raise TransferError("La cantidad debe ser mayor que 0.")
+        if sender_id == receiver_id:
+            raise TransferError("No puedes transferirte dinero a ti mismo.")
+
+        async with self.locked(sender_id, receiver_id):
+            sender = await self.get(sender_id)
+            receiver = await self.get(receiver_id)
+            if sender is None or receiver is None:
+                raise TransferError("Ambos usuarios deben tener perfil (/jugar).")
+            if sender.dinero < amount:
+                raise TransferError(f"Saldo insuficiente: tienes ${sender.dinero:,}.")
+
+            sender.dinero -= amount
+            receiver.dinero += amount
+            if self.ledger is not None:
+                try:
+                    await self.ledger.append_many([
+                        (sender_id, -amount, reason, sender.dinero),
+                        (receiver_id, amount, reason, receiver.dinero),
+                    ])
+                except Exception:
+                    sender.dinero += amount
+                    receiver.dinero -= amount
+                    raise
+        # Fuera de los locks: el estado en memoria ya es consistente y el guardado
+        # (agrupado con otros) incluye ambos saldos; así el lock no dura un fsync.
+        await self.save()
+        return sender, receiver
+
+    async def add_money_many(self, moves: list[tuple[UserRecord, int, str]]):
+        """Varios movimientos (usuario, delta, motivo) en una sola escritura del ledger (p. ej. pagar una ronda)."""
+        moves = [(user, int(delta), reason) for user, delta, reason in moves if delta]
+        for user, delta, _ in moves:
+            user.dinero += delta
+        if self.ledger is not None and moves:
+            await self.ledger.append_many([(user.user_id, delta, reason, user.dinero) for user, delta, reason in moves])
+
+    async def exists(self, user_id) -> bool:
+        await self.load()
+        user_id = str(user_id)
+        return user_id in self._records or user_id in self._raw
+
+    def _materialize(self) -> list[UserRecord]:
+        for user_id in list(self._raw):
+            self._record(user_id)
+        return list(self._records.values())
+
+    async def records(self) -> list[UserRecord]:
+        """Todos los perfiles (migra los que falten). Pensado para construir índices al arrancar."""
+        await self.load()
+        return self._materialize()
+
+    def to_json(self) -> dict:
+        data = {uid: rec.to_dict() for uid, rec in self._records.items()}
+        data.update(self._raw or {})
+        return data
+
+    async def save(self, wait: bool = True):
+        """
+        Persiste todo el store en data.json (incluye las migraciones pendientes).
+        Los guardados concurrentes se agrupan en una sola escritura (ver GroupCommitter).
+        `wait=False` para cambios que ya quedaron en el ledger: se escriben en el próximo lote.
+        """
+        await self.load()
+        if self.snapshot_path:
+            await self._committer.commit(lambda: encode_snapshot(self._materialize()), wait)
+        else:
+            await self._committer.commit(self.to_json, wait)
+
+    async def flush(self):
+        await self._committer.flush()
+
+
+# Instancia compartida por todos los cogs
+user_store = UserStore(snapshot_path=PATH_USERS_BIN)
+
+
+def _measure_memory(n: int = 10_000):
+    """Compara la memoria por usuario: dict de data.json vs UserRecord (python -m utils.users)."""
+    import tracemalloc
+
+    sample = {
+        "dinero": 2234, "experiencia": 57, "date_job": "2025-09-06T19:47:27.735426+00:00",
+        "job": "lavacoches", "salud": 91, "date_disease": None, "disease": None,
+    }
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    dicts = [dict(sample, dinero=i) for i in range(n)]
+    after = tracemalloc.take_snapshot()
+    dict_bytes = sum(s.size_diff for s in after.compare_to(before, "filename"))
+
+    before = tracemalloc.take_snapshot()
+    records = [UserRecord.from_dict(str(i), d) for i, d in enumerate(dicts)]
+    after = tracemalloc.take_snapshot()
+    record_bytes = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    tracemalloc.stop()
+
+    print(f"dict:       {dict_bytes / n:.0f} bytes/usuario")
+    print(f"UserRecord: {record_bytes / n:.0f} bytes/usuario")
+    return dict_bytes / n, record_bytes / n
+
+
+async def _stress_transfers(users: int = 50, transfers: int = 5000, seed: int = 0):
+    """
+    Lanza miles de transferencias concurrentes al azar (incluye pares A->B y B->A a la vez)
+    sobre un store temporal y comprueba que el dinero total se conserva,
+    en memoria, en el archivo guardado y al reaplicar el ledger (python -m utils.users stress).
+    """
+    import os
+    import random
+    import tempfile
+    import time
+    from utils.ledger import MoneyLedger
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        def new_store():
+            store = UserStore(os.path.join(tmp, "data.json"), snapshot_path=os.path.join(tmp, "data.bin"))
+            store.ledger = MoneyLedger(os.path.join(tmp, "ledger.log"), os.path.join(tmp, "ledger_snapshot.json"))
+            return store
+
+        store = new_store()
+        ids = [str(10**17 + i) for i in range(users)]
+        for user_id in ids:
+            (await store.create(user_id)).dinero = 1000
+        await store.save()
+        expected = 1000 * users
+
+        async def one():
+            a, b = rng.sample(ids, 2)
+            try:
+                await store.transfer(a, b, rng.randint(1, 300))
+                return True
+            except TransferError:
+                return False
+
+        start = time.perf_counter()
+        done = await asyncio.gather(*(one() for _ in range(transfers)))
+        elapsed = time.perf_counter() - start
+        await store.flush()
+
+        total = sum(rec.dinero for rec in await store.records())
+        reloaded = new_store()
+        total_reloaded = sum(rec.dinero for rec in await reloaded.records())
+        print(f"{transfers} transferencias ({sum(done)} aceptadas) en {elapsed:.2f}s, "
+              f"{store._committer.flushes} escrituras")
+        print(f"total esperado {expected}, en memoria {total}, recargado {total_reloaded}")
+        assert total == expected == total_reloaded
+        assert all(rec.dinero >= 0 for rec in await reloaded.records())
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["stress"]:
+        asyncio.run(_stress_transfers())
+    else:
+        _measure_memory()
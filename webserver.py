@@ -1,15 +1,87 @@
-from flask import Flask
-from threading import Thread
-
-app = Flask('')
-
-@app.route('/')
-def index():
-    return 'Hola de Flask!'
-
-def run():
-    app.run(host='0.0.0.0', port=8000)
-
-def keep_alive():
-    server = Thread(target=run)
-    server.start()
\ No newline at end of file
+import asyncio
+import os
+import time
+
+from aiohttp import web
+from discord.ext import commands
+
+from database.database import connect
+from utils.metrics import metrics
+
+# Servidor HTTP dentro del loop del bot (antes era Flask en un hilo aparte): responde al
+# keep-alive del hosting y, como comparte proceso y loop, puede mirar el estado del bot.
+#   /          texto simple (el ping de siempre)
+#   /healthz   vivo: el proceso responde
+#   /readyz    listo: conectado al gateway y con la base de datos accesible (503 si no)
+#   /status    JSON con servidores, conexiones de voz y colas de música
+#   /metrics   métricas de comandos para Prometheus (utils/metrics.py)
+PORT = int(os.environ.get("PORT", 8000))
+
+_started = time.time()
+
+
+def _db_ok() -> bool:
+    try:
+        with connect() as conn:
+            conn.execute("SELECT 1")
+        return True
+    except Exception:
+        return False
+
+
+def _music_queues(bot: commands.Bot) -> dict[str, int]:
+    play = bot.get_cog("Play")
+    if play is None:
+        return {}
+    return {str(guild_id): len(state.queue) for guild_id, state in play._states.items() if state.queue}
+
+
+def make_app(bot: commands.Bot) -> web.Application:
+    async def index(request):
+        return web.Response(text="Hola desde el bot!")
+
+    async def healthz(request):
+        return web.json_response({"ok": True})
+
+    async def readyz(request):
+        checks = {
+            "gateway": bot.is_ready() and not bot.is_closed(),
+            "database": await asyncio.to_thread(_db_ok),
+        }
+        return web.json_response({"ready": all(checks.values()), **checks},
+                                 status=200 if all(checks.values()) else 503)
+
+    async def status(request):
+        return web.json_response({
+            "user": str(bot.user) if bot.user else None,
+            "ready": bot.is_ready(),
+            "latency_ms": round(bot.latency * 1000) if bot.is_ready() else None,
+            "uptime_s": round(time.time() - _started),
+            "guilds": len(bot.guilds),
+            "voice_connections": len(bot.voice_clients),
+            "music_queues": _music_queues(bot),
+            "cogs": len(bot.cogs),
+        })
+
+    async def prometheus_metrics(request):
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Prometheus-Format": "0.0.4"})
+
+    app = web.Application()
+    app.add_routes([
+        web.get("/", index),
+        web.get("/healthz", healthz),
+        web.get("/readyz", readyz),
+        web.get("/status", status),
+        web.get("/metrics", prometheus_metrics),
+    ])
+    return app
+
+
+async def keep_alive(bot: commands.Bot) -> web.AppRunner:
+    """Arranca el servidor en el loop actual. Devuelve el runner para cerrarlo con runner.cleanup()."""
+    runner = web.AppRunner(make_app(bot), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host="0.0.0.0", port=PORT).start()
+    print(f"🌐 Webserver escuchando en el puerto {PORT}")
+    return runner
@@ -3,10 +3,210 @@ import os
 import discord
 from discord import app_commands
 import yt_dlp
-from io import BytesIO
-import subprocess
+import asyncio
 import tempfile
 import shutil
+from collections import deque
+
+from utils.ffmpeg_path import FFMPEG_PATH
+
+# --- Configuración del servicio de conversión ---
+YTMP3_BITRATE = os.getenv("YTMP3_BITRATE", "192k")
+YTMP3_WORKERS = int(os.getenv("YTMP3_WORKERS", "2"))  # ffmpeg simultáneos como máximo
+YTMP3_CACHE_DIR = os.getenv("YTMP3_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ytmp3_cache"))
+YTMP3_CACHE_MAX_BYTES = int(os.getenv("YTMP3_CACHE_MAX_MB", "256")) * 1024 * 1024
+YTMP3_MAX_UPLOAD_MB = 8
+POSITION_POLL_SECONDS = 3
+
+
+class ConversionJob:
+    """Una conversión (video_id, bitrate). Varios usuarios pueden esperar el mismo job."""
+
+    def __init__(self, key: tuple, stream_url: str, title: str):
+        self.key = key
+        self.stream_url = stream_url
+        self.title = title
+        self.requesters: set[int] = set()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class ConversionService:
+    """
+    Cola de conversiones con un pool acotado de workers.
+    - Deduplica jobs idénticos en curso: dos usuarios que piden el mismo video comparten un solo ffmpeg.
+    - Guarda los resultados en disco (clave: video_id + bitrate) con desalojo LRU por tamaño.
+    - Los archivos que alguien está esperando o enviando están "anclados" y el desalojo no los
+      toca: `cached()` y `submit()` anclan, y quien los llamó suelta con `release()` al terminar.
+    """
+
+    def __init__(self, workers: int = YTMP3_WORKERS, cache_dir: str = YTMP3_CACHE_DIR,
+                 max_bytes: int = YTMP3_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._pending: deque[ConversionJob] = deque()
+        self._inflight: dict[tuple, ConversionJob] = {}
+        self._pins: dict[str, int] = {}  # ruta -> usuarios que la esperan o la están enviando
+        self._wakeup = asyncio.Condition()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(max(1, workers))]
+
+    # --- Caché en disco ---
+    def cache_path(self, video_id: str, bitrate: str) -> str:
+        safe_id = "".join(c for c in video_id if c.isalnum() or c in "-_")
+        return os.path.join(self.cache_dir, f"{safe_id}_{bitrate}.mp3")
+
+    def cached(self, video_id: str, bitrate: str) -> str | None:
+        """Ruta en caché (anclada: llamar a release() después de enviarla) o None."""
+        path = self.cache_path(video_id, bitrate)
+        if not os.path.isfile(path):
+            return None
+        try:
+            os.utime(path)  # marcar como usado recientemente (LRU por mtime)
+        except OSError:
+            pass
+        self._pin(path)
+        return path
+
+    def _pin(self, path: str):
+        self._pins[path] = self._pins.get(path, 0) + 1
+
+    def release(self, path: str):
+        """Suelta el ancla de `cached()` o `submit()`; el archivo vuelve a poder desalojarse."""
+        count = self._pins.get(path, 0) - 1
+        if count > 0:
+            self._pins[path] = count
+        else:
+            self._pins.pop(path, None)
+
+    def _evict(self, keep: str | None = None):
+        """Borra los archivos menos usados hasta quedar bajo `max_bytes` (nunca `keep` ni los anclados)."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".mp3"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            if path == keep:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if keep and os.path.isfile(keep):
+            total += os.path.getsize(keep)
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            # Se mira al borrar (no al listar): un ancla puede llegar mientras corre este hilo
+            if path in self._pins:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    # --- Cola ---
+    def position(self, job: ConversionJob) -> int:
+        """Posición en la cola (1 = siguiente). 0 si ya se está convirtiendo o terminó."""
+        try:
+            return self._pending.index(job) + 1
+        except ValueError:
+            return 0
+
+    async def submit(self, video_id: str, bitrate: str, stream_url: str, title: str,
+                     requester_id: int) -> tuple[ConversionJob, bool]:
+        """
+        Encola una conversión. Devuelve (job, compartido) — compartido=True si ya existía en curso.
+        El resultado queda anclado para este usuario: llamar a release(cache_path(...)) al terminar.
+        """
+        key = (video_id, bitrate)
+        self._pin(self.cache_path(video_id, bitrate))
+        job = self._inflight.get(key)
+        if job is not None:
+            job.requesters.add(requester_id)
+            return job, True
+
+        job = ConversionJob(key, stream_url, title)
+        job.requesters.add(requester_id)
+        self._inflight[key] = job
+        async with self._wakeup:
+            self._pending.append(job)
+            self._wakeup.notify()
+        return job, False
+
+    async def _worker(self):
+        while True:
+            async with self._wakeup:
+                await self._wakeup.wait_for(lambda: self._pending)
+                job = self._pending.popleft()
+            try:
+                path = await self._convert(job)
+                if not job.future.done():
+                    job.future.set_result(path)
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                self._inflight.pop(job.key, None)
+
+    async def _convert(self, job: ConversionJob) -> str:
+        video_id, bitrate = job.key
+        final_path = self.cache_path(video_id, bitrate)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=".mp3")
+        os.close(fd)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                FFMPEG_PATH,
+                "-y",
+                "-i", job.stream_url,
+                "-vn",
+                "-acodec", "libmp3lame",
+                "-ab", bitrate,
+                "-f", "mp3",
+                tmp_path,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            code = await process.wait()
+            if code != 0 or os.path.getsize(tmp_path) == 0:
+                raise RuntimeError(f"ffmpeg terminó con código {code}.")
+            os.replace(tmp_path, final_path)
+        finally:
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+        await asyncio.to_thread(self._evict, final_path)
+        return final_path
+
+
+_service: ConversionService | None = None
+
+def get_conversion_service() -> ConversionService:
+    """Crea el servicio la primera vez (necesita el loop del bot en marcha)."""
+    global _service
+    if _service is None:
+        _service = ConversionService()
+    return _service
+
+
+def _pick_audio_url(info: dict) -> str | None:
+    formats = info.get("formats") or []
+    audio_formats = [f for f in formats if f.get("acodec") and f.get("acodec") != "none"]
+    if audio_formats:
+        def score(f):
+            return f.get("abr") or f.get("tbr") or 0
+        return max(audio_formats, key=score).get("url")
+    return info.get("url")
+
 
 def ytmp3(tree: app_commands.CommandTree):
 
@@ -42,89 +242,77 @@ def ytmp3(tree: app_commands.CommandTree):
                 pass
             return
 
+        pinned = None
         # Configurar yt-dlp con cookiefile (apuntando a la copia temporal escribible)
         ydl_opts = {
             "format": "bestaudio/best",
             "quiet": True,
             "noplaylist": True,
-            # si no tienes aria2c instalado en Render, quita el downloader externo
-
             "cookiefile": tmp_cookie_path,
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "192",
-                }
-            ],
         }
 
         try:
-            buffer = BytesIO()
-
-            def progress_hook(d):
-                if d.get("status") == "finished":
-                    print("✅ Descarga completada, convirtiendo a MP3...")
-
-            ydl_opts["progress_hooks"] = [progress_hook]
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(query, download=False)
-
-                # Seleccionar mejor formato de audio
-                url = None
-                formats = info.get("formats") or []
-                audio_formats = [f for f in formats if f.get("acodec") and f.get("acodec") != "none"]
-                if audio_formats:
-                    def score(f):
-                        return f.get("abr") or f.get("tbr") or 0
-                    best = max(audio_formats, key=score)
-                    url = best.get("url")
-                else:
-                    url = info.get("url")
+            # Solo metadatos: la conversión la hace el servicio (o sale de la caché)
+            def _extract():
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    return ydl.extract_info(query, download=False)
+
+            info = await asyncio.to_thread(_extract)
+            if "entries" in info:
+                info = info["entries"][0]
 
+            video_id = info.get("id") or query
+            title = info.get("title", "audio")
+            service = get_conversion_service()
+
+            path = pinned = service.cached(video_id, YTMP3_BITRATE)
+            if path is None:
+                url = _pick_audio_url(info)
                 if not url:
                     raise RuntimeError("No pude obtener una URL de audio válida para ese vídeo.")
 
-                # Convertir stream a mp3 con ffmpeg y leer en memoria
-                process = subprocess.Popen(
-                    [
-                        "ffmpeg",
-                        "-i", url,
-                        "-vn",
-                        "-acodec", "libmp3lame",
-                        "-ab", "192k",
-                        "-f", "mp3",
-                        "pipe:1"
-                    ],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.DEVNULL
-                )
+                pinned = service.cache_path(video_id, YTMP3_BITRATE)
+                job, shared = await service.submit(video_id, YTMP3_BITRATE, url, title, interaction.user.id)
+                if shared:
+                    status_text = f"🔗 **{title}** ya se está convirtiendo para otro usuario; compartirás el resultado."
+                else:
+                    status_text = f"📥 **{title}** en cola — posición **{service.position(job)}**."
+                status_msg = await interaction.followup.send(status_text, wait=True)
 
-                audio_data = process.stdout.read()
-                buffer.write(audio_data)
-                process.stdout.close()
-                process.wait()
+                # Avisar al usuario cuando cambia su posición en la cola
+                last_position = service.position(job)
+                while not job.future.done():
+                    await asyncio.wait({job.future}, timeout=POSITION_POLL_SECONDS)
+                    position = service.position(job)
+                    if job.future.done() or position == last_position:
+                        continue
+                    last_position = position
+                    text = "🔄 Convirtiendo a MP3..." if position == 0 else f"📥 En cola — posición **{position}**."
+                    try:
+                        await status_msg.edit(content=text)
+                    except discord.HTTPException:
+                        pass
 
-            buffer.seek(0)
-            title = info.get("title", "audio")
-            filename = f"{title[:80]}.mp3"
+                path = job.future.result()
 
-            size_mb = len(buffer.getvalue()) / (1024 * 1024)
-            if size_mb > 8:
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            if size_mb > YTMP3_MAX_UPLOAD_MB:
                 await interaction.followup.send(
-                    f"⚠️ El archivo pesa {size_mb:.2f} MB (máximo 8 MB). No puedo enviarlo directamente."
+                    f"⚠️ El archivo pesa {size_mb:.2f} MB (máximo {YTMP3_MAX_UPLOAD_MB} MB). No puedo enviarlo directamente."
                 )
                 return
 
             await interaction.followup.send(
                 content=f"🎧 **{title}**",
-                file=discord.File(buffer, filename=filename)
+                file=discord.File(path, filename=f"{title[:80]}.mp3")
             )
 
         except Exception as e:
             await interaction.followup.send(f"❌ Error: `{e}`")
         finally:
+            # El archivo ya se envió (o falló): puede volver a desalojarse
+            if pinned is not None:
+                service.release(pinned)
             # borrar el archivo temporal de cookies si existe
             try:
                 if tmp_cookie_path and os.path.exists(tmp_cookie_path):